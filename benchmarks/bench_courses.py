@@ -0,0 +1,41 @@
+"""Time and memory of scraping the courses of a large account page.
+
+Usage:
+    python -m benchmarks.bench_courses [--page PAGE.html]
+
+Without arguments, a synthetic account page teaching and taking 400 courses each is used.
+"""
+
+import argparse
+import pathlib
+
+from benchmarks import pages
+from benchmarks.measure import measure, report
+from gradescopeapi.classes import parsing
+from gradescopeapi.classes._helpers._course_helpers import get_all_courses_info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", type=pathlib.Path)
+    args = parser.parse_args()
+    markup = args.page.read_text() if args.page else pages.account_page()
+
+    for html_parser in reversed(parsing.available_parsers()):
+        parsing.set_parser(html_parser)
+        soup = parsing.make_soup(markup)
+        courses = get_all_courses_info(soup)
+        results = {
+            "make_soup": measure(lambda: parsing.make_soup(markup)),
+            "get_all_courses_info": measure(lambda: get_all_courses_info(soup)),
+        }
+        report(
+            f"{len(courses['instructor'])} instructor and {len(courses['student'])} "
+            f"student courses ({html_parser})",
+            results,
+        )
+    parsing.set_parser(None)
+
+
+if __name__ == "__main__":
+    main()
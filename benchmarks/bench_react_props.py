@@ -0,0 +1,94 @@
+"""Parse time and memory of the data-react-props fast path against full page parsing.
+
+Usage:
+    python -m benchmarks.bench_react_props [--page PAGE.html --react-class NAME]
+
+Without arguments, large synthetic course and extensions pages are used. A page saved
+from Gradescope (e.g. "Save page as" on an assignment's extensions page) can be given
+instead, along with the React component to extract.
+"""
+
+import argparse
+import json
+import pathlib
+
+from benchmarks import pages
+from benchmarks.measure import measure, report
+from gradescopeapi.classes import parsing
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    get_assignments_instructor_view,
+)
+from gradescopeapi.classes.extensions import _parse_extension, parse_extensions_page
+
+
+def soup_props(markup: str, react_class: str, parser: str) -> list:
+    parsing.set_parser(parser)
+    soup = parsing.make_soup(markup)
+    return [
+        json.loads(element["data-react-props"])
+        for element in soup.find_all(attrs={"data-react-class": react_class})
+    ]
+
+
+def soup_extensions(markup: str) -> dict:
+    """The extensions of a page, read from its table of extensions with BeautifulSoup"""
+    soup = parsing.make_soup(markup)
+    table = soup.find("table", class_="table js-overridesTable")
+    extensions = {}
+    for row in table.find("tbody").find_all("tr"):
+        component = row.find("div", {"data-react-class": "EditExtension"})
+        user_id, extension = _parse_extension(json.loads(component["data-react-props"]))
+        extensions[user_id] = extension
+    return extensions
+
+
+def bench_page(title: str, markup: str, react_class: str):
+    results = {}
+    for parser in reversed(parsing.available_parsers()):
+        results[f"BeautifulSoup ({parser})"] = measure(
+            lambda: soup_props(markup, react_class, parser)
+        )
+    results["find_react_props"] = measure(
+        lambda: parsing.find_react_props(markup, react_class)
+    )
+    parsing.set_parser(None)
+    report(f"{title} ({len(markup) / 2**20:.1f} MiB)", results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", type=pathlib.Path)
+    parser.add_argument("--react-class")
+    args = parser.parse_args()
+
+    if args.page:
+        bench_page(args.page.name, args.page.read_text(), args.react_class)
+        return
+
+    course_page = pages.assignments_page()
+    extensions_page = pages.extensions_page()
+    bench_page("Course page, 1000 assignments", course_page, "AssignmentsTable")
+    bench_page("Extensions page, 1000 students", extensions_page, "EditExtension")
+
+    # the helpers, including building their objects
+    results = {}
+    for parser in reversed(parsing.available_parsers()):
+        parsing.set_parser(parser)
+        results[f"BeautifulSoup ({parser})"] = measure(
+            lambda: soup_extensions(extensions_page)
+        )
+    parsing.set_parser(None)
+    results["parse_extensions_page"] = measure(
+        lambda: parse_extensions_page(extensions_page)
+    )
+    report("Extensions, with Extension objects", results)
+    results = {
+        "get_assignments_instructor_view": measure(
+            lambda: get_assignments_instructor_view(course_page)
+        )
+    }
+    report("Assignments, with Assignment objects", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Memory held by a 5,000-member roster, as dataclass objects and as a columnar `Roster`.
+
+Usage:
+    python -m benchmarks.bench_tables [--members N]
+"""
+
+import argparse
+import dataclasses
+
+from benchmarks import pages
+from benchmarks.measure import retained
+from gradescopeapi.classes import parsing
+from gradescopeapi.classes._helpers._course_helpers import get_course_members
+from gradescopeapi.classes.member import Member
+from gradescopeapi.classes.tables import Roster
+
+# Member as it was before it got slots: every instance has a __dict__
+DictMember = dataclasses.make_dataclass(
+    "DictMember", [(field.name, field.type) for field in dataclasses.fields(Member)]
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=5000)
+    args = parser.parse_args()
+
+    page = pages.roster_page(args.members)
+
+    def scrape():
+        # the page is parsed inside the measurement, so that the strings of the members
+        # are only kept alive by them, as in a program keeping the results only
+        return get_course_members(parsing.make_soup(page), "100001")
+
+    results = {
+        "list of dataclasses": retained(
+            lambda: [
+                DictMember(*(getattr(member, name) for name in Member.__slots__))
+                for member in scrape()
+            ]
+        ),
+        "list of slotted Members": retained(scrape),
+        "Roster": retained(lambda: Roster(scrape())),
+    }
+
+    print(f"Roster of {args.members} members")
+    baseline = next(iter(results.values()))
+    for name, size in results.items():
+        print(
+            f"  {name:<28} {size / 2**20:7.2f} MiB ({size / args.members:6.0f} B/member,"
+            f" {baseline / size:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Timing and memory measurements shared by the benchmarks."""
+
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+
+
+def measure(function: Callable[[], object], repeat: int = 5) -> tuple[float, int]:
+    """
+    Run `function` several times
+
+    Returns:
+        tuple[float, int]: The fastest run in seconds, and the peak memory allocated during
+            a run in bytes (measured on a separate run, tracemalloc slowing it down).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def report(title: str, results: dict[str, tuple[float, int]]):
+    """Print measurements as a table, relative to the first one"""
+    print(title)
+    baseline_time, baseline_peak = next(iter(results.values()))
+    for name, (seconds, peak) in results.items():
+        print(
+            f"  {name:<28} {seconds * 1000:9.2f} ms ({baseline_time / seconds:5.1f}x)"
+            f" {peak / 2**20:9.2f} MiB peak ({baseline_peak / max(peak, 1):5.1f}x)"
+        )
+
+
+def retained(build: Callable[[], object]) -> int:
+    """Memory still allocated by `build` once it returned, in bytes, temporaries excluded"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
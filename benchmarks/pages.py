@@ -0,0 +1,151 @@
+"""Synthetic Gradescope pages, sized like those of large courses, for the benchmarks.
+
+The markup mirrors what the scraping helpers look at, surrounded by the kind of page
+chrome (navigation, scripts, hidden dialogs) that real pages carry and the helpers skip.
+"""
+
+import html
+import json
+
+
+def _page(body: str) -> str:
+    chrome = "".join(
+        f'<li class="sidebar--item"><a href="/courses/{i}">Course {i}</a>'
+        '<span class="sidebar--badge" aria-hidden="true">3</span></li>'
+        for i in range(200)
+    )
+    scripts = "".join(
+        f'<script src="/assets/chunk-{i}.js" defer></script>' for i in range(40)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta name="csrf-token" content="token">'
+        f"{scripts}</head><body><nav><ul>{chrome}</ul></nav>"
+        f'<main class="mainContent">{body}</main>'
+        '<div class="modal" hidden><form><input name="authenticity_token" value="t">'
+        "</form></div></body></html>"
+    )
+
+
+def assignments_page(num_assignments: int = 1000) -> str:
+    """Course page of an instructor, listing its assignments in an AssignmentsTable"""
+    table_data = []
+    for i in range(num_assignments):
+        if i % 10 == 0:
+            table_data.append({"type": "section", "title": f"Week {i // 10 + 1}"})
+        table_data.append(
+            {
+                "type": "assignment",
+                "url": f"/courses/100001/assignments/{200000 + i}",
+                "title": f"Homework {i} <draft> & notes",
+                "submission_window": {
+                    "release_date": "2024-04-15T00:00:00.000000-04:00",
+                    "due_date": "2024-04-22T23:59:00.000000-04:00",
+                    "hard_due_date": None,
+                },
+                "total_points": "10.0",
+                "num_active_submissions": i,
+            }
+        )
+    props = html.escape(json.dumps({"table_data": table_data}))
+    return _page(
+        f'<div data-react-class="AssignmentsTable" data-react-props="{props}"></div>'
+    )
+
+
+def extensions_page(num_students: int = 1000) -> str:
+    """Extensions page of an assignment, with an EditExtension component per student"""
+    rows = []
+    for i in range(num_students):
+        props = html.escape(
+            json.dumps(
+                {
+                    "override": {
+                        "user_id": 600000 + i,
+                        "settings": {
+                            "due_date": {
+                                "type": "absolute",
+                                "value": "2024-04-18T23:59:00",
+                            }
+                        },
+                    },
+                    "timezone": {"identifier": "America/New_York"},
+                    "deletePath": f"/courses/100001/extensions/{600000 + i}",
+                    "studentName": f"Student {i}",
+                }
+            )
+        )
+        rows.append(
+            f'<tr><td>Student {i}</td><td><div class="table--actions">'
+            f'<div data-react-class="EditExtension" data-react-props="{props}"></div>'
+            "</div></td></tr>"
+        )
+    return _page(
+        f'<table class="table js-overridesTable"><tbody>{"".join(rows)}</tbody></table>'
+    )
+
+
+def account_page(num_terms: int = 40, courses_per_term: int = 10) -> str:
+    """Account page of a user teaching and taking courses in every term"""
+
+    def course_list(first_course_id: int, instructor: bool) -> str:
+        terms = []
+        for term in range(num_terms):
+            boxes = []
+            for i in range(courses_per_term):
+                course_id = first_course_id + term * courses_per_term + i
+                counts = (
+                    '<div class="courseBox--noGradesPublised">0 grades published</div>'
+                    '<div class="courseBox--assignments '
+                    'courseBox--assignments-unpublished">5 assignments</div>'
+                    if instructor
+                    else '<div class="courseBox--assignments">5 assignments</div>'
+                )
+                boxes.append(
+                    f'<a class="courseBox" href="/courses/{course_id}">'
+                    f'<h3 class="courseBox--shortname">CS {course_id}</h3>'
+                    f'<div class="courseBox--name">Course {course_id}</div>'
+                    f"{counts}</a>"
+                )
+            season = ("Spring", "Fall")[term % 2]
+            terms.append(
+                f'<div class="courseList--term pageSubheading">{season} {2000 + term}</div>'
+                f'<div class="courseList--coursesForTerm">{"".join(boxes)}</div>'
+            )
+        return f'<div class="courseList">{"".join(terms)}</div>'
+
+    return _page(
+        '<h1 class="pageHeading">Instructor Courses</h1>'
+        "<button> Create a new course</button>"
+        f"{course_list(100000, instructor=True)}"
+        '<h1 class="pageHeading">Student Courses</h1>'
+        "<button>Enroll in Course</button>"
+        f"{course_list(500000, instructor=False)}"
+    )
+
+
+def roster_page(num_members: int = 5000) -> str:
+    """Memberships page of a course"""
+    rows = []
+    for i in range(num_members):
+        data_cm = html.escape(
+            json.dumps(
+                {
+                    "full_name": f"Student {i}",
+                    "first_name": "Student",
+                    "last_name": str(i),
+                    "sid": f"N{10000000 + i}",
+                }
+            )
+        )
+        rows.append(
+            '<tr class="rosterRow"><td>'
+            f'<button class="rosterCell--editIcon" data-cm="{data_cm}" '
+            f'data-email="student{i}@example.com" data-id="{600000 + i}" '
+            f'data-role="{0 if i % 50 else 2}" data-sections="[]"></button></td>'
+            f"<td>student{i}@example.com</td><td>Student</td><td>{i % 7}</td></tr>"
+        )
+    return _page(
+        '<table class="js-rosterTable"><thead><tr>'
+        "<th>Name</th><th>Email</th><th>Role</th><th>Submissions</th>"
+        f"</tr></thead><tbody>{''.join(rows)}</tbody></table>"
+    )
@@ -1,10 +1,16 @@
 import json
 
-import dateutil.parser
 import requests
+import soupsieve
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._dates import parse_datetime
 from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.parsing import find_react_props, make_soup
+from gradescopeapi.classes.result_store import stored_result
+
+_SUBMISSION_LINK_SELECTOR = soupsieve.compile("td.table--primaryLink a")
+_CELL_SELECTOR = soupsieve.compile("td")
 
 
 def check_page_auth(session, endpoint):
@@ -13,6 +19,14 @@ def check_page_auth(session, endpoint):
     Returns response if otherwise good
     """
     submissions_resp = session.get(endpoint)
+    return check_response_auth(submissions_resp)
+
+
+def check_response_auth(submissions_resp):
+    """
+    Same checks as check_page_auth, for a response that has already been fetched
+    (works for both requests and httpx responses)
+    """
     # check if page is valid, raise exception if not
     if submissions_resp.status_code == requests.codes.unauthorized:
         # check error type
@@ -22,74 +36,80 @@ def check_page_auth(session, endpoint):
             raise Exception("You are not authorized to access this page.")
         elif error_msg == "You must be logged in to access this page.":
             raise Exception("You must be logged in to access this page.")
+        raise Exception(error_msg)
     elif submissions_resp.status_code == requests.codes.not_found:
         raise Exception("Page not Found")
     elif submissions_resp.status_code == requests.codes.ok:
         return submissions_resp
+    # anything else (e.g. a 5xx still failing after retries) must not pass for a valid page
+    raise RuntimeError(
+        f"Unexpected response from Gradescope. Status code: {submissions_resp.status_code}"
+    )
 
 
-def get_assignments_instructor_view(coursepage_soup):
-    assignments_list = []
-    element_with_props = coursepage_soup.find(
-        "div", {"data-react-class": "AssignmentsTable"}
+def get_assignments_from_course_page(coursepage_html: str) -> list[Assignment]:
+    """Get the assignments of a course page, seen by an instructor or a student"""
+    # webpage html structure differs based on if user if instructor or student
+    # (the instructor view is found without parsing the whole page)
+    assignments = get_assignments_instructor_view(coursepage_html)
+    if not assignments:
+        assignments = get_assignments_student_view(make_soup(coursepage_html))
+    return assignments
+
+
+def get_assignments_instructor_view(coursepage_html: str):
+    """
+    Get the assignments of an instructor's course page. They are all in the props of its
+    AssignmentsTable component, so only that component is parsed, not the whole page
+    """
+    assignments_table_props = find_react_props(
+        coursepage_html, "AssignmentsTable", limit=1
     )
-    if element_with_props:
-        # Extract the value of the data-react-props attribute
-        props_str = element_with_props["data-react-props"]
-        # Parse the JSON data
-        assignment_json = json.loads(props_str)
-
-        # Extract information for each assignment
-        for assignment in assignment_json["table_data"]:
-            # Skip non-assignment data like sections
-            if assignment.get("type", "") != "assignment":
-                continue
-
-            assignment_obj = Assignment(
-                assignment_id=assignment["url"].split("/")[-1],
-                name=assignment["title"],
-                release_date=assignment["submission_window"]["release_date"],
-                due_date=assignment["submission_window"]["due_date"],
-                late_due_date=assignment["submission_window"].get("hard_due_date"),
-                submissions_status=None,
-                grade=None,
-                max_grade=str(float(assignment["total_points"])),
-            )
+    if assignments_table_props:
+        return get_assignments_from_props(assignments_table_props[0])
+    return []
 
-            # convert to datetime objects
-            assignment_obj.release_date = (
-                dateutil.parser.parse(assignment_obj.release_date)
-                if assignment_obj.release_date
-                else assignment_obj.release_date
-            )
 
-            assignment_obj.due_date = (
-                dateutil.parser.parse(assignment_obj.due_date)
-                if assignment_obj.due_date
-                else assignment_obj.due_date
-            )
+def get_assignments_from_props(assignment_json: dict):
+    """
+    Get the assignments listed in the props of the AssignmentsTable component of an
+    instructor's course page
+    """
+    assignments_list = []
+    # Extract information for each assignment
+    for assignment in assignment_json["table_data"]:
+        # Skip non-assignment data like sections
+        if assignment.get("type", "") != "assignment":
+            continue
 
-            assignment_obj.late_due_date = (
-                dateutil.parser.parse(assignment_obj.late_due_date)
-                if assignment_obj.late_due_date
-                else assignment_obj.late_due_date
-            )
+        submission_window = assignment["submission_window"]
+        assignment_obj = Assignment(
+            assignment_id=assignment["url"].split("/")[-1],
+            name=assignment["title"],
+            # convert to datetime objects
+            release_date=parse_datetime(submission_window["release_date"]),
+            due_date=parse_datetime(submission_window["due_date"]),
+            late_due_date=parse_datetime(submission_window.get("hard_due_date")),
+            submissions_status=None,
+            grade=None,
+            max_grade=float(assignment["total_points"]),
+        )
 
-            # Add the assignment dictionary to the list
-            assignments_list.append(assignment_obj)
+        # Add the assignment dictionary to the list
+        assignments_list.append(assignment_obj)
     return assignments_list
 
 
 def get_assignments_student_view(coursepage_soup):
     # parse into list of lists: Assignments[row_elements[]]
     assignment_table = []
-    for assignment_row in coursepage_soup.findAll("tr", role="row")[
+    for assignment_row in coursepage_soup.find_all("tr", role="row")[
         1:-1
     ]:  # Skip header row and tail row (dropzonePreview--fileNameHeader)
         row = []
-        for th in assignment_row.findAll("th"):
+        for th in assignment_row.find_all("th"):
             row.append(th)
-        for td in assignment_row.findAll("td"):
+        for td in assignment_row.find_all("td"):
             row.append(td)
         assignment_table.append(row)
     assignment_info_list = []
@@ -138,13 +158,9 @@ def get_assignments_student_view(coursepage_soup):
             pass
 
         # convert to datetime objects
-        release_date = (
-            dateutil.parser.parse(release_date) if release_date else release_date
-        )
-        due_date = dateutil.parser.parse(due_date) if due_date else due_date
-        late_due_date = (
-            dateutil.parser.parse(late_due_date) if late_due_date else late_due_date
-        )
+        release_date = parse_datetime(release_date)
+        due_date = parse_datetime(due_date)
+        late_due_date = parse_datetime(late_due_date)
 
         # Store the extracted information in a dictionary
         assignment_obj = Assignment(
@@ -164,6 +180,70 @@ def get_assignments_student_view(coursepage_soup):
     return assignment_info_list
 
 
+def get_submission_ids(submissions_soup) -> list[str]:
+    """
+    Get the ids of all submissions listed on an assignment's page
+    """
+    # select submissions (class of td.table--primaryLink a tag, submission id stored in href link)
+    submissions_a_tags = _SUBMISSION_LINK_SELECTOR.select(submissions_soup)
+    return [a_tag.attrs.get("href").split("/")[-1] for a_tag in submissions_a_tags]
+
+
+def get_submission_students(submissions_soup) -> dict[str, str]:
+    """
+    Get the name of the student of every submission listed on an assignment's page, by
+    submission id
+    """
+    return {
+        a_tag.attrs.get("href").split("/")[-1]: a_tag.get_text(strip=True)
+        for a_tag in _SUBMISSION_LINK_SELECTOR.select(submissions_soup)
+    }
+
+
+def get_submission_files_endpoint(
+    course_id,
+    assignment_id,
+    submission_id,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> str:
+    ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+    )
+    return f"{ASSIGNMENT_ENDPOINT}/submissions/{submission_id}.json?content=react&only_keys[]=text_files&only_keys[]=file_comments&only_keys[]=pages"
+
+
+def get_submission_pages_endpoint(
+    course_id,
+    assignment_id,
+    submission_id,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> str:
+    ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+    )
+    # only the pages: the rest of a scanned submission's JSON (outlines, annotations...) is large
+    return f"{ASSIGNMENT_ENDPOINT}/submissions/{submission_id}.json?content=react&only_keys[]=pages"
+
+
+def get_submission_links(file_info_json: dict) -> list[str]:
+    """
+    Get the aws links to all files of a submission from its JSON representation:
+    its uploaded files, or the images of its pages for PDF/image submissions
+    """
+    if file_info_json.get("text_files"):
+        return [file_data["file"]["url"] for file_data in file_info_json["text_files"]]
+    return get_submission_page_links(file_info_json)
+
+
+def get_submission_page_links(file_info_json: dict) -> list[str]:
+    """
+    Get the aws links to the page images of a PDF/image submission from its JSON
+    representation, in page order
+    """
+    pages = sorted(file_info_json.get("pages") or [], key=lambda page: page["number"])
+    return [page["url"] for page in pages]
+
+
 def get_submission_files(
     session,
     course_id,
@@ -171,19 +251,51 @@ def get_submission_files(
     submission_id,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
 ):
-    ASSIGNMENT_ENDPOINT = (
-        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+    file_info_link = get_submission_files_endpoint(
+        course_id, assignment_id, submission_id, gradescope_base_url
     )
 
-    file_info_link = f"{ASSIGNMENT_ENDPOINT}/submissions/{submission_id}.json?content=react&only_keys[]=text_files&only_keys[]=file_comments"
-    file_info_resp = session.get(file_info_link)
-    if file_info_resp.status_code == requests.codes.ok:
+    def fetch() -> list[str]:
+        file_info_resp = session.get(file_info_link)
+        if file_info_resp.status_code != requests.codes.ok:
+            raise RuntimeError(
+                f"Failed to get files for submission {submission_id}. Status code: {file_info_resp.status_code}"
+            )
         file_info_json = json.loads(file_info_resp.text)
-        if file_info_json.get("text_files"):
-            aws_links = []
-            for file_data in file_info_json["text_files"]:
-                aws_links.append(file_data["file"]["url"])
-        else:
-            raise NotImplementedError("Image only submissions not yet supported")
-        # TODO add support for image questions
-    return aws_links
+        return get_submission_links(file_info_json)
+
+    return stored_result(session, "submission_files", file_info_link, fetch)
+
+
+def get_submission_pages(
+    session,
+    course_id,
+    assignment_id,
+    submission_id,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> list[str]:
+    pages_link = get_submission_pages_endpoint(
+        course_id, assignment_id, submission_id, gradescope_base_url
+    )
+
+    def fetch() -> list[str]:
+        pages_resp = session.get(pages_link)
+        if pages_resp.status_code != requests.codes.ok:
+            raise RuntimeError(
+                f"Failed to get pages of submission {submission_id}. Status code: {pages_resp.status_code}"
+            )
+        return get_submission_page_links(pages_resp.json())
+
+    return stored_result(session, "submission_pages", pages_link, fetch)
+
+
+def get_graders(submissions_soup) -> set[str]:
+    """
+    Get the names of all graders listed on a question's submissions page
+    """
+    # select graders (class of td tag, grader name stored in text)
+    graders = _CELL_SELECTOR.select(submissions_soup)[2::3]
+    grader_names = set(
+        [grader.text for grader in graders if grader.text]
+    )  # get non-empty grader names
+    return grader_names
@@ -0,0 +1,169 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from gradescopeapi.classes.ratelimit import RateLimiter, TokenBucketRateLimiter
+from gradescopeapi.classes.timeouts import DeadlineExceeded
+
+
+class BulkResult(dict):
+    """
+    Results of an operation made of many independent requests.
+
+    Behaves like the plain dict the operation has always returned, containing only the
+    items that succeeded. Items that failed are collected in `errors`, mapping the same
+    keys to the exception that was raised, instead of aborting the whole operation.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors: dict = {}
+
+
+def get_rate_cap(requests_per_second: float | None) -> RateLimiter | None:
+    """Fixed rate limiter for a single bulk operation, on top of the connection's own limiter"""
+    if not requests_per_second:
+        return None
+    return TokenBucketRateLimiter(requests_per_second, burst=1)
+
+
+def imap_concurrently(
+    fn: Callable,
+    keys: Iterable,
+    max_workers: int = 1,
+    rate_cap: RateLimiter | None = None,
+) -> Iterator[tuple[Any, Any, Exception | None]]:
+    """
+    Call `fn(key)` for every key on a pool of `max_workers` threads, yielding
+    `(key, result, error)` in the order of `keys` as soon as each call is done.
+
+    At most `2 * max_workers` calls are scheduled ahead of the consumer, so memory stays
+    bounded however many keys there are. Calls that have not started yet are cancelled
+    when the generator is closed. Calls run in a copy of the caller's context, so they
+    share its deadline.
+    """
+
+    def call(key):
+        if rate_cap is not None:
+            rate_cap.acquire()
+        return fn(key)
+
+    if max_workers <= 1:
+        for key in keys:
+            try:
+                yield key, call(key), None
+            except Exception as e:
+                yield key, None, e
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = collections.deque()
+    try:
+        for key in keys:
+            context = contextvars.copy_context()
+            pending.append((key, executor.submit(context.run, call, key)))
+            if len(pending) >= 2 * max_workers:
+                yield _future_outcome(*pending.popleft())
+        while pending:
+            yield _future_outcome(*pending.popleft())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _future_outcome(key, future: Future) -> tuple[Any, Any, Exception | None]:
+    try:
+        return key, future.result(), None
+    except Exception as e:
+        return key, None, e
+
+
+def map_concurrently(
+    fn: Callable,
+    keys: Iterable,
+    max_workers: int = 1,
+    rate_cap: RateLimiter | None = None,
+) -> BulkResult:
+    """
+    Call `fn(key)` for every key on a pool of `max_workers` threads.
+
+    Returns:
+        BulkResult: results keyed by `key`, in the order of `keys`, with failures in `.errors`
+    Raises:
+        DeadlineExceeded: if the current deadline passes, after cancelling the remaining calls
+    """
+    results = BulkResult()
+    outcomes = imap_concurrently(fn, keys, max_workers, rate_cap)
+    with contextlib.closing(outcomes):
+        for key, result, error in outcomes:
+            if isinstance(error, DeadlineExceeded):
+                raise error
+            if error is None:
+                results[key] = result
+            else:
+                results.errors[key] = error
+    return results
+
+
+async def aiter_concurrently(
+    coroutine_fn: Callable[..., Awaitable],
+    keys: Iterable,
+    max_concurrency: int = 10,
+    rate_cap: RateLimiter | None = None,
+) -> AsyncIterator[tuple[Any, Any, Exception | None]]:
+    """
+    Async version of `imap_concurrently`: awaits `coroutine_fn(key)` for every key with at
+    most `max_concurrency` of them in flight at once, yielding `(key, result, error)` in
+    the order of `keys`.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(key):
+        async with semaphore:
+            if rate_cap is not None:
+                await rate_cap.acquire_async()
+            return await coroutine_fn(key)
+
+    pending = collections.deque()
+    try:
+        for key in keys:
+            pending.append((key, asyncio.ensure_future(call(key))))
+            if len(pending) >= 2 * max_concurrency:
+                yield await _task_outcome(*pending.popleft())
+        while pending:
+            yield await _task_outcome(*pending.popleft())
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+async def _task_outcome(key, task: asyncio.Future) -> tuple[Any, Any, Exception | None]:
+    try:
+        return key, await task, None
+    except Exception as e:
+        return key, None, e
+
+
+async def gather_concurrently(
+    coroutine_fn: Callable[..., Awaitable],
+    keys: Iterable,
+    max_concurrency: int = 10,
+    rate_cap: RateLimiter | None = None,
+) -> BulkResult:
+    """
+    Async version of `map_concurrently`.
+    """
+    results = BulkResult()
+    outcomes = aiter_concurrently(coroutine_fn, keys, max_concurrency, rate_cap)
+    async with contextlib.aclosing(outcomes):
+        async for key, result, error in outcomes:
+            if isinstance(error, DeadlineExceeded):
+                raise error
+            if error is None:
+                results[key] = result
+            else:
+                results.errors[key] = error
+    return results
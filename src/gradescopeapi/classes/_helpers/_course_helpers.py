@@ -1,119 +1,155 @@
 import json
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 from gradescopeapi.classes.courses import Course
 from gradescopeapi.classes.member import Member
 
+# headings of the course lists on the account page, and the role of their courses.
+# Accounts that are both instructor and student have one list of each; others have a
+# single "Your Courses" list, whose role is told by the "Create a new course" button
+COURSE_LIST_HEADINGS = {
+    "Your Courses": None,
+    "Instructor Courses": "instructor",
+    "Student Courses": "student",
+}
 
-def get_courses_info(
-    soup: BeautifulSoup, user_type: str
-) -> tuple[dict[str, Course], bool]:
+# classes of the number of assignments in the course boxes shown to instructors
+UNPUBLISHED_ASSIGNMENTS_CLASSES = [
+    "courseBox--assignments",
+    "courseBox--assignments-unpublished",
+]
+
+
+def _iter_account_page(tag: Tag):
+    """Elements of the account page in document order, skipping the insides of course boxes"""
+    for child in tag.contents:
+        if isinstance(child, Tag):
+            yield child
+            if not (child.name == "a" and "courseBox" in child.get("class", ())):
+                yield from _iter_account_page(child)
+
+
+def get_all_courses_info(soup: BeautifulSoup) -> dict[str, dict[str, Course]]:
     """
-    Scrape all course info from the main page of Gradescope.
+    Scrape both instructor and student courses from the main page of Gradescope.
+
+    The page is walked once, in document order: each course list heading starts a list,
+    each term heading gives the semester of the courses following it.
 
     Args:
         soup (BeautifulSoup): BeautifulSoup object with parsed HTML.
-        user_type (str): The user type to scrape courses for (Instructor or Student courses).
 
     Returns:
-        tuple:
-            dict: A dictionary mapping course IDs to Course objects containing all course info.
-            bool: Flag indicating if the user is an instructor or not.
+        dict: A dictionary with keys "instructor" and "student", mapping to
+        dictionaries of course IDs to Course objects.
 
         For example:
         {
-            "123456": Course(
-                name="CS 1134",
-                full_name="Data Structures and Algorithms",
-                semester="Fall",
-                year="2021",
-                num_grades_published="0",
-                num_assignments="5"
-            )
+            "instructor": {
+                "123456": Course(
+                    name="CS 1134",
+                    full_name="Data Structures and Algorithms",
+                    semester="Fall",
+                    year="2021",
+                    num_grades_published=0,
+                    num_assignments=5
+                )
+            },
+            "student": {}
         }
     """
+    courses = {"instructor": {}, "student": {}}
 
-    # initalize dictionary to store all courses
-    all_courses = {}
-
-    # find heading for defined user_type's courses
-    courses = soup.find("h1", class_="pageHeading", string=user_type)
+    heading = None  # heading of the current course list
+    is_instructor = None  # told by the first button after the heading
+    semester = year = None
 
-    # if no courses found, return empty dictionary
-    if courses is None:
-        return all_courses, False
+    for element in _iter_account_page(soup):
+        match element.name:
+            case "h1" if "pageHeading" in element.get("class", ()):
+                heading = (
+                    element.string if element.string in COURSE_LIST_HEADINGS else None
+                )
+                is_instructor = None
+            case _ if heading is None:
+                # outside of course lists
+                continue
+            case "button" if is_instructor is None:
+                # intentional space before Create
+                is_instructor = element.text == " Create a new course"
+            case "div" if "courseList--term" in element.get("class", ()):
+                # fetch semester and year
+                time_of_year = element.text.split(" ")
+                semester = time_of_year[0]
+                year = time_of_year[1]
+            case "a" if "courseBox" in element.get("class", ()):
+                role = COURSE_LIST_HEADINGS[heading] or (
+                    "instructor" if is_instructor else "student"
+                )
+                course_id = element["href"].split("/")[-1]
+                courses[role][course_id] = _get_course_info(
+                    element,
+                    semester,
+                    year,
+                    instructor_view=heading == "Instructor Courses"
+                    or bool(is_instructor),
+                )
 
-    # use button to check if user is an instructor or not
-    button = courses.find_next("button")
-    if button.text == " Create a new course":  # intentional space before Create
-        is_instructor = True
-    else:
-        is_instructor = False
+    return courses
 
-    # find next div with class courseList
-    course_list = courses.find_next("div", class_="courseList")
 
-    for term in course_list.find_all("div", class_="courseList--term"):
-        # find first "a" -> course
-        course = term.find_next("a")
-        while course is not None:
-            # fetch course id and create new dictionary for each course
-            course_id = course["href"].split("/")[-1]
+def _get_course_info(
+    course: Tag, semester: str, year: str, instructor_view: bool
+) -> Course:
+    """
+    Scrape the info of a course from its box on the main page of Gradescope
 
+    Args:
+        course (Tag): "a" element of the course box.
+        semester (str): Semester of the course, from its term heading.
+        year (str): Year of the course, from its term heading.
+        instructor_view (bool): Whether the box is the one shown to instructors.
+    """
+    short_name = full_name = num_grades_published = num_assignments = None
+    for element in course.descendants:
+        if not isinstance(element, Tag):
+            continue
+        classes = element.get("class", ())
+        if element.name == "h3" and "courseBox--shortname" in classes:
             # fetch short name
-            course_name = course.find("h3", class_="courseBox--shortname")
-            short_name = course_name.text
-
+            short_name = short_name or element.text
+        elif element.name != "div":
+            continue
+        elif "courseBox--name" in classes:
             # fetch full name
-            course_full_name = course.find("div", class_="courseBox--name")
-            full_name = course_full_name.text
-
-            # fetch semester and year
-            time_of_year = term.text.split(" ")
-            semester = time_of_year[0]
-            year = time_of_year[1]
-
-            # fetch number of grades published and number of assignments
-            if user_type == "Instructor Courses" or is_instructor:
-                # find number of grades published and number of assignments
-                # if they exist
-                num_grades_published = course.find(
-                    "div", class_="courseBox--noGradesPublised"
-                )
-                if num_grades_published is not None:
-                    num_grades_published = num_grades_published.text
-
-                num_assignments = course.find(
-                    "div",
-                    class_="courseBox--assignments courseBox--assignments-unpublished",
-                )
-                if num_assignments is not None:
-                    num_assignments = num_assignments.text
-
-            else:
-                # students do not have number of grades published, so set to None
-                num_grades_published = None
-                num_assignments = course.find("div", class_="courseBox--assignments")
-                num_assignments = num_assignments.text
-
-            # create Course object with all relevant info
-            course_info = Course(
-                name=short_name,
-                full_name=full_name,
-                semester=semester,
-                year=year,
-                num_grades_published=num_grades_published,
-                num_assignments=num_assignments,
-            )
-
-            # store info for this course
-            all_courses[course_id] = course_info
-
-            # find next course, or "a" tag
-            course = course.find_next_sibling("a")
-
-    return all_courses, is_instructor
+            full_name = full_name or element.text
+        elif instructor_view:
+            # find number of grades published and number of assignments
+            # if they exist
+            if "courseBox--noGradesPublised" in classes:
+                num_grades_published = _parse_count(element.text)
+            elif classes == UNPUBLISHED_ASSIGNMENTS_CLASSES:
+                num_assignments = _parse_count(element.text)
+        elif "courseBox--assignments" in classes:
+            # students do not have number of grades published, so it stays None
+            num_assignments = _parse_count(element.text)
+
+    # create Course object with all relevant info
+    return Course(
+        name=short_name,
+        full_name=full_name,
+        semester=semester,
+        year=year,
+        num_grades_published=num_grades_published,
+        num_assignments=num_assignments,
+    )
+
+
+def _parse_count(text: str) -> int | None:
+    """Number at the start of e.g. "5 assignments", None if there is none"""
+    count = text.split(maxsplit=1)
+    return int(count[0]) if count and count[0].isdigit() else None
 
 
 def get_course_members(soup: BeautifulSoup, course_id: str) -> list[Member]:
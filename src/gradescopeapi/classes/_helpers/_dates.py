@@ -0,0 +1,55 @@
+"""Conversion of the dates found on Gradescope pages to datetime objects.
+
+Gradescope writes dates in a few ISO 8601 variants, which `datetime.fromisoformat` parses
+far faster than `dateutil.parser.parse`. dateutil is only used for other formats.
+"""
+
+import datetime
+import functools
+import zoneinfo
+
+import dateutil.parser
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone(identifier: str) -> zoneinfo.ZoneInfo:
+    """Return the time zone of an IANA identifier (e.g. "America/New_York"), cached"""
+    return zoneinfo.ZoneInfo(identifier)
+
+
+def parse_datetime(
+    value: str | None, tzinfo: datetime.tzinfo | None = None
+) -> datetime.datetime | None:
+    """
+    Parse a date from a Gradescope page
+
+    Args:
+        value (str | None): The date, e.g. "2024-04-15T00:00:00.000000-04:00" (course
+            pages), "2024-04-18T23:59:00" (extensions) or "2024-04-01 00:00:00 -0400"
+            (student course pages).
+        tzinfo (datetime.tzinfo | None): If given, replaces the time zone of the date.
+            Defaults to None.
+
+    Returns:
+        datetime.datetime | None: The date, None if `value` is empty.
+    """
+    if not value:
+        return None
+    try:
+        date = datetime.datetime.fromisoformat(_to_isoformat(value))
+    except ValueError:
+        date = dateutil.parser.parse(value)
+    if tzinfo is not None:
+        date = date.replace(tzinfo=tzinfo)
+    return date
+
+
+def _to_isoformat(value: str) -> str:
+    """Rewrite the dates of student course pages, which fromisoformat does not accept"""
+    # "2024-04-01 00:00:00 -0400" -> "2024-04-01 00:00:00-04:00"
+    if len(value) == 25 and value[19] == " " and value[20] in "+-":
+        return f"{value[:19]}{value[20:23]}:{value[23:]}"
+    # "Z" is only accepted by fromisoformat since Python 3.11
+    if value.endswith("Z"):
+        return f"{value[:-1]}+00:00"
+    return value
@@ -0,0 +1,18 @@
+import hashlib
+import pathlib
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def md5_file(path: pathlib.Path) -> str:
+    """Hex MD5 checksum of a file, read one chunk at a time"""
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_part_path(path: pathlib.Path) -> pathlib.Path:
+    """Path a file is written to until it is complete, and renamed to `path`"""
+    return path.with_name(f"{path.name}.part")
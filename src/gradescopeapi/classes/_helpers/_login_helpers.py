@@ -1,7 +1,115 @@
+import http.cookiejar
+import time
+import urllib.parse
+
 import requests
+import soupsieve
 from bs4 import BeautifulSoup
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes.parsing import make_soup
+
+_LOGIN_AUTH_TOKEN_SELECTOR = soupsieve.compile(
+    'form[action="/login"] input[name="authenticity_token"]'
+)
+_CSRF_TOKEN_SELECTOR = soupsieve.compile('meta[name="csrf-token"]')
+
+
+def get_login_auth_token(soup: BeautifulSoup) -> str:
+    """
+    Find the hidden authenticity token of the login form on the homepage
+    """
+    return _LOGIN_AUTH_TOKEN_SELECTOR.select_one(soup)["value"]
+
+
+def get_csrf_token(soup: BeautifulSoup) -> str:
+    """
+    Find the CSRF token stored in the page's meta tags
+    """
+    return _CSRF_TOKEN_SELECTOR.select_one(soup)["content"]
+
+
+def get_login_data(email: str, password: str, auth_token: str) -> dict:
+    """
+    Populate params for post request to login endpoint
+    """
+    return {
+        "utf8": "✓",
+        "session[email]": email,
+        "session[password]": password,
+        "session[remember_me]": 0,
+        "commit": "Log In",
+        "session[remember_me_sso]": 0,
+        "authenticity_token": auth_token,
+    }
+
+
+def is_login_successful(login_resp) -> bool:
+    """
+    Success marked with cookies set and a 302 redirect to the accounts page
+    """
+    # login_resp.history returns a list of redirects that occurred while handling a request
+    return (
+        len(login_resp.history) != 0
+        and login_resp.history[0].status_code == requests.codes.found
+    )
+
+
+def get_session_state(
+    cookie_jar: http.cookiejar.CookieJar,
+    csrf_token: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> dict:
+    """
+    Everything needed to restore a logged-in session: its cookies and CSRF token
+    (works with the cookie jars of both requests and httpx)
+    """
+    return {
+        "gradescope_base_url": gradescope_base_url,
+        "csrf_token": csrf_token,
+        "cookies": [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure,
+            }
+            for cookie in cookie_jar
+        ],
+        "saved_at": time.time(),
+    }
+
+
+def set_session_cookies(cookie_jar: http.cookiejar.CookieJar, state: dict):
+    """
+    Put the cookies of a session saved with get_session_state back in a cookie jar
+    """
+    for cookie in state["cookies"]:
+        cookie_jar.set_cookie(requests.cookies.create_cookie(**cookie))
+
+
+def is_session_valid(account_resp) -> bool:
+    """
+    Whether a session is still logged in, given the response to a GET of the account page
+    made without following redirects (logged out sessions are redirected or refused)
+    """
+    return account_resp.status_code == requests.codes.ok
+
+
+def is_session_expired(response) -> bool:
+    """
+    Whether a response means the session is no longer logged in: Gradescope either refuses
+    the request or redirects it to the login page (works for both requests and httpx responses)
+    """
+    if response.status_code == requests.codes.unauthorized:
+        return "You must be logged in" in response.text
+    return any(
+        resp.is_redirect
+        and urllib.parse.urlsplit(resp.headers.get("Location", "")).path == "/login"
+        for resp in [*response.history, response]
+    )
 
 
 def get_auth_token_init_gradescope_session(
@@ -13,13 +121,10 @@ def get_auth_token_init_gradescope_session(
     """
     # go to homepage and set initial "_gradescope_session" cookie
     homepage_resp = session.get(gradescope_base_url)
-    homepage_soup = BeautifulSoup(homepage_resp.text, "html.parser")
+    homepage_soup = make_soup(homepage_resp.text)
 
     # Find the authenticity token using CSS selectors
-    auth_token = homepage_soup.select_one(
-        'form[action="/login"] input[name="authenticity_token"]'
-    )["value"]
-    return auth_token
+    return get_login_auth_token(homepage_soup)
 
 
 def login_set_session_cookies(
@@ -32,29 +137,17 @@ def login_set_session_cookies(
     GS_LOGIN_ENDPOINT = f"{gradescope_base_url}/login"
 
     # populate params for post request to login endpoint
-    login_data = {
-        "utf8": "✓",
-        "session[email]": email,
-        "session[password]": password,
-        "session[remember_me]": 0,
-        "commit": "Log In",
-        "session[remember_me_sso]": 0,
-        "authenticity_token": auth_token,
-    }
+    login_data = get_login_data(email, password, auth_token)
 
     # login -> Send post request to login endpoint. Sets cookies
     login_resp = session.post(GS_LOGIN_ENDPOINT, params=login_data)
 
     # success marked with cookies set and a 302 redirect to the accounts page
-    if (
-        # login_resp.history returns a list of redirects that occurred while handling a request
-        len(login_resp.history) != 0
-        and login_resp.history[0].status_code == requests.codes.found
-    ):
+    if is_login_successful(login_resp):
         # update headers with csrf token
         # grab x-csrf-token
-        soup = BeautifulSoup(login_resp.text, "html.parser")
-        csrf_token = soup.select_one('meta[name="csrf-token"]')["content"]
+        soup = make_soup(login_resp.text)
+        csrf_token = get_csrf_token(soup)
 
         # update session headers
         session.cookies.update(login_resp.cookies)
@@ -1,20 +1,51 @@
-import time
-
-from bs4 import BeautifulSoup
+import contextlib
+import os
+import pathlib
+from collections.abc import Iterable, Iterator
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes import timeouts
 from gradescopeapi.classes._helpers._assignment_helpers import (
     check_page_auth,
-    get_assignments_instructor_view,
-    get_assignments_student_view,
+    get_assignments_from_course_page,
+    get_graders,
     get_submission_files,
+    get_submission_ids,
+    get_submission_pages,
+    get_submission_students,
+)
+from gradescopeapi.classes._helpers._bulk_helpers import (
+    get_rate_cap,
+    imap_concurrently,
+    map_concurrently,
 )
 from gradescopeapi.classes._helpers._course_helpers import (
+    get_all_courses_info,
     get_course_members,
-    get_courses_info,
 )
 from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.blob_store import BlobStore
+from gradescopeapi.classes.cache import parse_response
+from gradescopeapi.classes.downloads import (
+    DEFAULT_LAYOUT,
+    DownloadedFile,
+    download_submissions,
+)
 from gradescopeapi.classes.member import Member
+from gradescopeapi.classes.parsing import make_soup
+from gradescopeapi.classes.result_store import stored_result
+from gradescopeapi.classes.snapshot import (
+    CourseSnapshot,
+    ProgressCallback,
+    crawl_course,
+)
+from gradescopeapi.classes.submission_export import (
+    DEFAULT_POLL_INTERVAL,
+    ZipMember,
+    export_assignment_submissions,
+    iter_assignment_export,
+)
+from gradescopeapi.classes.submission_pages import download_submission_pages
 
 
 class Account:
@@ -52,39 +83,27 @@ class Account:
 
         endpoint = f"{self.gradescope_base_url}/account"
 
+        # a result saved by an earlier call is reused while fresh (see `result_store`)
+        return stored_result(
+            self.session, "courses", endpoint, lambda: self._fetch_courses(endpoint)
+        )
+
+    def _fetch_courses(self, endpoint: str) -> dict:
         # get main page
         response = self.session.get(endpoint)
 
         if response.status_code != 200:
             raise RuntimeError(
-                "Failed to access account page on Gradescope. Status code: {response.status_code}"
+                f"Failed to access account page on Gradescope. Status code: {response.status_code}"
             )
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # see if user is solely a student or instructor
-        user_courses, is_instructor = get_courses_info(soup, "Your Courses")
-
-        # if the user is indeed solely a student or instructor
-        # return the appropriate set of courses
-        if user_courses:
-            if is_instructor:
-                return {"instructor": user_courses, "student": {}}
-            else:
-                return {"instructor": {}, "student": user_courses}
-
-        # if user is both a student and instructor, get both sets of courses
-        courses = {"instructor": {}, "student": {}}
-
-        # get instructor courses
-        instructor_courses, _ = get_courses_info(soup, "Instructor Courses")
-        courses["instructor"] = instructor_courses
-
-        # get student courses
-        student_courses, _ = get_courses_info(soup, "Student Courses")
-        courses["student"] = student_courses
-
-        return courses
+        # pages that did not change since the last call are not parsed again
+        return parse_response(
+            self.session,
+            "courses",
+            response,
+            lambda page: get_all_courses_info(make_soup(page)),
+        )
 
     def get_course_users(self, course_id: str) -> list[Member]:
         """
@@ -97,27 +116,48 @@ class Account:
             "You must be logged in to access this page.": if no user is logged in
         """
 
+        # check that course_id is valid (not empty)
+        if not course_id:
+            raise Exception("Invalid Course ID")
+
+        try:
+            return self._get_course_members(course_id)
+        except timeouts.DeadlineExceeded:
+            raise
+        except Exception:
+            return None
+
+    def _get_course_members(self, course_id: str) -> list[Member]:
+        """Same as get_course_users, raising the exception that prevented getting the users
+        instead of returning None"""
         membership_endpoint = (
             f"{self.gradescope_base_url}/courses/{course_id}/memberships"
         )
-
-        # check that course_id is valid (not empty)
         if not course_id:
             raise Exception("Invalid Course ID")
 
-        session = self.session
+        return stored_result(
+            self.session,
+            "members",
+            membership_endpoint,
+            lambda: self._fetch_course_users(course_id, membership_endpoint),
+        )
 
-        try:
-            # scrape page
-            membership_resp = check_page_auth(session, membership_endpoint)
-            membership_soup = BeautifulSoup(membership_resp.text, "html.parser")
+    def _fetch_course_users(
+        self, course_id: str, membership_endpoint: str
+    ) -> list[Member]:
+        session = self.session
 
-            # get all users in the course
-            users = get_course_members(membership_soup, course_id)
+        # scrape page
+        membership_resp = check_page_auth(session, membership_endpoint)
 
-            return users
-        except Exception:
-            return None
+        # get all users in the course
+        return parse_response(
+            session,
+            "members",
+            membership_resp,
+            lambda page: get_course_members(make_soup(page), course_id),
+        )
 
     def get_assignments(self, course_id: str) -> list[Assignment]:
         """
@@ -134,27 +174,100 @@ class Account:
         # check that course_id is valid (not empty)
         if not course_id:
             raise Exception("Invalid Course ID")
+        return stored_result(
+            self.session,
+            "assignments",
+            course_endpoint,
+            lambda: self._fetch_assignments(course_endpoint),
+        )
+
+    def _fetch_assignments(self, course_endpoint: str) -> list[Assignment]:
         session = self.session
         # scrape page
         coursepage_resp = check_page_auth(session, course_endpoint)
-        coursepage_soup = BeautifulSoup(coursepage_resp.text, "html.parser")
 
-        # two different helper functions to parse assignment info
-        # webpage html structure differs based on if user if instructor or student
-        assignment_info_list = get_assignments_instructor_view(coursepage_soup)
-        if not assignment_info_list:
-            assignment_info_list = get_assignments_student_view(coursepage_soup)
+        return parse_response(
+            session, "assignments", coursepage_resp, get_assignments_from_course_page
+        )
 
-        return assignment_info_list
+    def get_rosters(
+        self,
+        course_ids: Iterable[str],
+        max_workers: int = 4,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, list[Member]]:
+        """
+        Get the users of several courses, fetching the courses in parallel
+        Args:
+            course_ids (Iterable[str]): The IDs of the courses, e.g. those returned by `get_courses`.
+            max_workers (int): Number of threads fetching courses in parallel. Defaults to 4.
+            requests_per_second (float | None): Extra cap on the rate at which requests are started,
+                shared by all workers. Requests are always subject to the connection's rate limiter as well.
+                Defaults to None (no extra cap).
+            deadline (float | None): Seconds the whole operation may take, see `timeouts.deadline`. Defaults to None.
+        Returns:
+            dict: A dictionary mapping course ids to the users of the course, as `get_course_users` returns them.
+            Courses that could not be fetched are left out of the dictionary and reported in its
+            `errors` attribute instead, mapping course ids to the exception that was raised.
+        Raises:
+            DeadlineExceeded: if the deadline passes, after cancelling the remaining requests
+        """
+
+        with timeouts.deadline(deadline):
+            return map_concurrently(
+                self._get_course_members,
+                course_ids,
+                max_workers,
+                get_rate_cap(requests_per_second),
+            )
+
+    def get_assignments_for_courses(
+        self,
+        course_ids: Iterable[str],
+        max_workers: int = 4,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, list[Assignment]]:
+        """
+        Get the assignments of several courses, fetching the courses in parallel
+        Args:
+            Same as get_rosters.
+        Returns:
+            dict: A dictionary mapping course ids to the assignments of the course, as `get_assignments`
+            returns them. Courses that could not be fetched are reported in its `errors` attribute instead.
+        Raises:
+            DeadlineExceeded: if the deadline passes, after cancelling the remaining requests
+        """
+        with timeouts.deadline(deadline):
+            return map_concurrently(
+                self.get_assignments,
+                course_ids,
+                max_workers,
+                get_rate_cap(requests_per_second),
+            )
 
     def get_assignment_submissions(
-        self, course_id: str, assignment_id: str
+        self,
+        course_id: str,
+        assignment_id: str,
+        max_workers: int = 1,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
     ) -> dict[str, list[str]]:
         """
         Get a list of dicts mapping AWS links for all submissions to each submission id
+        Args:
+            max_workers (int): Number of threads fetching submissions in parallel. Defaults to 1 (serial).
+            requests_per_second (float | None): Extra cap on the rate at which submission requests are started,
+                shared by all workers. Requests are always subject to the connection's rate limiter as well.
+                Defaults to None (no extra cap).
+            deadline (float | None): Seconds the whole operation may take, see `timeouts.deadline`. Defaults to None.
         Returns:
             dict: A dictionary of submissions, where the keys are the submission ids and the values are
             a list of aws links to the submission pdf
+            Submissions that could not be fetched are left out of the dictionary and reported in its
+            `errors` attribute instead, mapping submission ids to the exception that was raised.
             For example:
                 {
                     'submission_id': [
@@ -170,33 +283,293 @@ class Account:
                 "You are not authorized to access this page.": if logged in user is unable to access submissions
                 "You must be logged in to access this page.": if no user is logged in
                 "Page not Found": When link is invalid: change in url, invalid course_if or assignment id
-                "Image only submissions not yet supported": assignment is image submission only, which is not yet supported
         NOTE:
-        1. Image submissions not supports, need to find an endpoint to retrieve image pdfs
-        2. Not recommended for use, since this makes a GET request for every submission -> very slow!
+        1. For PDF/image submissions, the links are to the images of their pages (see get_submission_pages)
+        2. This makes a GET request for every submission -> slow for large assignments unless max_workers > 1
         3. so far only accessible for teachers, not for students to get submissions to an assignment
         """
+        with timeouts.deadline(deadline):
+            submission_ids = self._get_submission_ids(course_id, assignment_id)
+
+            return map_concurrently(
+                self._submission_files_fetcher(course_id, assignment_id),
+                submission_ids,
+                max_workers,
+                get_rate_cap(requests_per_second),
+            )
+
+    def iter_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        start_after: str | None = None,
+        max_workers: int = 1,
+        requests_per_second: float | None = None,
+    ) -> Iterator[tuple[str, list[str]]]:
+        """
+        Lazily yield the AWS links of every submission to an assignment, one submission at a time
+
+        Submissions are yielded in the order they are listed on the assignment page, as soon as each
+        one has been fetched, so they can be processed before the whole assignment has been crawled.
+        Only a small window of submissions is fetched ahead of the consumer, which keeps memory bounded.
+        Args:
+            start_after (str | None): Resume after the submission with this id, e.g. the last id
+                yielded by an interrupted run. Defaults to None (start from the first submission).
+            max_workers (int): Number of threads fetching submissions in parallel. Defaults to 1 (serial).
+            requests_per_second (float | None): Extra cap on the rate at which submission requests are started,
+                on top of the connection's rate limiter. Defaults to None (no extra cap).
+        Yields:
+            tuple: (submission_id, aws_links) for each submission
+            For example:
+                ('submission_id', ['aws_link1.com', 'aws_link2.com'])
+        Raises:
+            Exceptions:
+                Same as get_assignment_submissions. The first submission that cannot be fetched raises
+                its error and ends the iteration; call again with start_after set to the last yielded id
+                to retry from there.
+            ValueError: if start_after is not one of the assignment's submissions
+        """
+        submission_ids = self._get_submission_ids(course_id, assignment_id)
+        if start_after is not None:
+            try:
+                submission_ids = submission_ids[submission_ids.index(start_after) + 1 :]
+            except ValueError:
+                raise ValueError(
+                    f"Submission {start_after} not found in assignment {assignment_id}"
+                ) from None
+
+        results = imap_concurrently(
+            self._submission_files_fetcher(course_id, assignment_id),
+            submission_ids,
+            max_workers,
+            get_rate_cap(requests_per_second),
+        )
+        with contextlib.closing(results):
+            for submission_id, aws_links, error in results:
+                if error is not None:
+                    raise error
+                yield submission_id, aws_links
+
+    def download_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        directory: str | os.PathLike,
+        layout: str = DEFAULT_LAYOUT,
+        max_workers: int = 4,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+        store: BlobStore | None = None,
+    ) -> dict[str, list[DownloadedFile]]:
+        """
+        Download the files of all submissions to an assignment (see `downloads`)
+
+        Files already downloaded by an earlier call are skipped, and interrupted downloads are resumed.
+        Args:
+            directory (str | os.PathLike): Directory to save files under.
+            layout (str): Directory of each submission's files under `directory`, formatted with
+                `course_id`, `assignment_id` and `submission_id`. Defaults to "{course_id}/{assignment_id}/{submission_id}".
+            max_workers (int): Number of threads fetching links and files in parallel. Defaults to 4.
+            requests_per_second (float | None): Extra cap on the rate at which requests are started,
+                shared by all workers. Defaults to None (no extra cap).
+            deadline (float | None): Seconds the whole operation may take, see `timeouts.deadline`. Defaults to None.
+            store (BlobStore | None): Content-addressed store keeping one copy of identical files, and skipping
+                the download of files it already holds (see `blob_store`). Defaults to None.
+        Returns:
+            dict: A dictionary mapping submission ids to the files saved, as lists of `DownloadedFile`.
+            Submissions whose links or files could not be fetched are reported in its `errors` attribute instead.
+        Raises:
+            Exceptions:
+                Same as get_assignment_submissions.
+        """
+        with timeouts.deadline(deadline):
+            submissions = self.get_assignment_submissions(
+                course_id, assignment_id, max_workers, requests_per_second
+            )
+            downloaded = download_submissions(
+                self.session,
+                course_id,
+                assignment_id,
+                submissions,
+                directory,
+                layout,
+                max_workers,
+                requests_per_second,
+                store=store,
+            )
+        downloaded.errors.update(submissions.errors)
+        return downloaded
+
+    def get_submission_pages(
+        self, course_id: str, assignment_id: str, submission_id: str
+    ) -> list[str]:
+        """
+        Get the aws links to the page images of a PDF/image submission (e.g. a scanned exam), in page order
+        Returns:
+            list: A list of aws links as strings, empty for submissions without pages
+        Raises:
+            RuntimeError: If the submission could not be fetched.
+        """
+        return get_submission_pages(
+            self.session,
+            course_id,
+            assignment_id,
+            submission_id,
+            self.gradescope_base_url,
+        )
+
+    def download_assignment_pages(
+        self,
+        course_id: str,
+        assignment_id: str,
+        directory: str | os.PathLike,
+        layout: str = DEFAULT_LAYOUT,
+        pdf: bool = False,
+        max_workers: int = 4,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, list]:
+        """
+        Download the page images of all submissions to a PDF/image assignment (see `submission_pages`)
+
+        Args:
+            directory (str | os.PathLike): Directory to save pages under.
+            layout (str): Directory of each submission's pages under `directory`, or with `pdf`, path of its PDF
+                without ".pdf". Formatted with `course_id`, `assignment_id` and `submission_id`.
+                Defaults to "{course_id}/{assignment_id}/{submission_id}".
+            pdf (bool): Whether to assemble each submission's pages in order into a single PDF, written as
+                the pages arrive, instead of saving them as image files. Defaults to False.
+            max_workers (int): Number of threads fetching links and pages in parallel. Defaults to 4.
+            requests_per_second (float | None): Extra cap on the rate at which requests are started,
+                shared by all workers. Defaults to None (no extra cap).
+            deadline (float | None): Seconds the whole operation may take, see `timeouts.deadline`. Defaults to None.
+        Returns:
+            dict: A dictionary mapping submission ids to the files saved, as lists of `DownloadedFile`, or with
+            `pdf`, a list holding the path of the PDF.
+            Submissions whose links or pages could not be fetched are reported in its `errors` attribute instead.
+        Raises:
+            Exceptions:
+                Same as get_assignment_submissions.
+        """
+        with timeouts.deadline(deadline):
+            submission_ids = self._get_submission_ids(course_id, assignment_id)
+            pages = map_concurrently(
+                lambda submission_id: self.get_submission_pages(
+                    course_id, assignment_id, submission_id
+                ),
+                submission_ids,
+                max_workers,
+                get_rate_cap(requests_per_second),
+            )
+            downloaded = download_submission_pages(
+                self.session,
+                course_id,
+                assignment_id,
+                pages,
+                directory,
+                layout,
+                pdf,
+                max_workers,
+                requests_per_second,
+            )
+        downloaded.errors.update(pages.errors)
+        return downloaded
+
+    def export_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        directory: str | os.PathLike,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        deadline: float | None = None,
+    ) -> list[pathlib.Path]:
+        """
+        Export all submissions to an assignment as one archive, extracted to a directory as it
+        downloads (see `submission_export`). Takes a few requests however many submissions there are.
+
+        Args:
+            directory (str | os.PathLike): Directory to extract the archive to.
+            poll_interval (float): Seconds between two checks of whether the archive is ready. Defaults to 2.
+            deadline (float | None): Seconds the whole export may take, see `timeouts.deadline`. Defaults to None.
+        Returns:
+            list: The paths of the files extracted, as `pathlib.Path`.
+        Raises:
+            RuntimeError: If the archive could not be built or downloaded.
+            ValueError: If the archive is corrupt.
+        """
+        return export_assignment_submissions(
+            self.session,
+            course_id,
+            assignment_id,
+            directory,
+            self.gradescope_base_url,
+            poll_interval,
+            deadline,
+        )
+
+    def iter_assignment_export(
+        self,
+        course_id: str,
+        assignment_id: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> Iterator[tuple[ZipMember, Iterator[bytes]]]:
+        """
+        Export all submissions to an assignment as one archive, yielding each file of the archive as
+        it downloads, without writing it to disk (see `submission_export.iter_zip_members`)
+
+        Yields:
+            tuple: (member, content), where `content` yields the bytes of the file in chunks.
+        """
+        return iter_assignment_export(
+            self.session,
+            course_id,
+            assignment_id,
+            self.gradescope_base_url,
+            poll_interval,
+        )
+
+    def get_submission_students(
+        self, course_id: str, assignment_id: str
+    ) -> dict[str, str]:
+        """
+        Get the name of the student of every submission to an assignment
+        Returns:
+            dict: A dictionary mapping submission ids to student names
+            For example:
+                {
+                    '300001': 'Ada Lovelace',
+                    ...
+                }
+        Raises:
+            Exceptions:
+                Same as get_assignment_submissions.
+        """
+        ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+        if not course_id or not assignment_id:
+            raise Exception("One or more invalid parameters")
+        submissions_resp = check_page_auth(self.session, ASSIGNMENT_ENDPOINT)
+        return get_submission_students(make_soup(submissions_resp.text))
+
+    def _get_submission_ids(self, course_id: str, assignment_id: str) -> list[str]:
         ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
         # ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{ASSIGNMENT_ENDPOINT}/review_grades"
         if not course_id or not assignment_id:
             raise Exception("One or more invalid parameters")
-        session = self.session
-        submissions_resp = check_page_auth(session, ASSIGNMENT_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        # select submissions (class of td.table--primaryLink a tag, submission id stored in href link)
-        submissions_a_tags = submissions_soup.select("td.table--primaryLink a")
-        submission_ids = [
-            a_tag.attrs.get("href").split("/")[-1] for a_tag in submissions_a_tags
-        ]
-        submission_links = {}
-        for submission_id in submission_ids:  # doesn't support image submissions yet
-            aws_links = get_submission_files(
-                session, course_id, assignment_id, submission_id
+        submissions_resp = check_page_auth(self.session, ASSIGNMENT_ENDPOINT)
+        submissions_soup = make_soup(submissions_resp.text)
+        return get_submission_ids(submissions_soup)
+
+    def _submission_files_fetcher(self, course_id: str, assignment_id: str):
+        def fetch(submission_id):
+            return get_submission_files(
+                self.session,
+                course_id,
+                assignment_id,
+                submission_id,
+                self.gradescope_base_url,
             )
-            submission_links[submission_id] = aws_links
-            # sleep for 0.1 seconds to avoid sending too many requests to gradescope
-            time.sleep(0.1)
-        return submission_links
+
+        return fetch
 
     def get_assignment_submission(
         self, student_email: str, course_id: str, assignment_id: str
@@ -217,7 +590,6 @@ class Account:
                 "You are not authorized to access this page.": if logged in user is unable to access submissions
                 "You must be logged in to access this page.": if no user is logged in
                 "Page not Found": When link is invalid: change in url, invalid course_if or assignment id
-                "PDF/Image only submissions not yet supported": assignment is pdf/image submission only, which is not yet supported
                 "No submission found": When no submission is found for given student_email
         NOTE: so far only accessible for teachers, not for students to get their own submission
         """
@@ -228,7 +600,7 @@ class Account:
             raise Exception("One or more invalid parameters")
         session = self.session
         submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
+        submissions_soup = make_soup(submissions_resp.text)
         td_with_email = submissions_soup.find(
             "td", string=lambda s: student_email in str(s)
         )
@@ -243,7 +615,11 @@ class Account:
                 raise Exception("No submission found")
             # call get_submission_files helper function
             aws_links = get_submission_files(
-                session, course_id, assignment_id, submission_id
+                session,
+                course_id,
+                assignment_id,
+                submission_id,
+                self.gradescope_base_url,
             )
             return aws_links
         else:
@@ -275,10 +651,47 @@ class Account:
             raise Exception("One or more invalid parameters")
         session = self.session
         submissions_resp = check_page_auth(session, ASSIGNMENT_SUBMISSIONS_ENDPOINT)
-        submissions_soup = BeautifulSoup(submissions_resp.text, "html.parser")
-        # select graders (class of td tag, grader name stored in text)
-        graders = submissions_soup.select("td")[2::3]
-        grader_names = set(
-            [grader.text for grader in graders if grader.text]
-        )  # get non-empty grader names
-        return grader_names
+        submissions_soup = make_soup(submissions_resp.text)
+        return get_graders(submissions_soup)
+
+    def snapshot_course(
+        self,
+        course_id: str,
+        question_ids: Iterable[str] = (),
+        max_workers: int = 4,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> CourseSnapshot:
+        """
+        Get the roster, assignments, extensions, submissions and graders of a course at once
+
+        The roster and the assignment list are fetched first, then the extensions and
+        submissions of every assignment, each request starting as soon as the ones it
+        depends on are done (see `snapshot`).
+        Args:
+            question_ids (Iterable[str]): Questions whose graders are fetched too. Defaults to none.
+            max_workers (int): Number of threads sending requests in parallel. Defaults to 4.
+            requests_per_second (float | None): Extra cap on the rate at which requests are started,
+                shared by all workers. Requests are always subject to the connection's rate limiter as well.
+                Defaults to None (no extra cap).
+            deadline (float | None): Seconds the whole snapshot may take, see `timeouts.deadline`. Defaults to None.
+            progress (Callable[[int, int], None] | None): Called after each request with the number of
+                requests done and the number of requests known so far. Defaults to None.
+        Returns:
+            CourseSnapshot: The data of the course. Requests that failed are reported in its `errors`
+            attribute, and the data depending on them is left out.
+        Raises:
+            Exceptions:
+                "Invalid Course ID": if course_id is null or empty value
+            DeadlineExceeded: if the deadline passes, after cancelling the remaining requests
+        """
+        with timeouts.deadline(deadline):
+            return crawl_course(
+                self,
+                course_id,
+                question_ids,
+                max_workers,
+                requests_per_second,
+                progress,
+            )
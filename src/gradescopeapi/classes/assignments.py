@@ -3,23 +3,28 @@
 import datetime
 from dataclasses import dataclass
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes.parsing import make_soup
 
+_AUTH_TOKEN_SELECTOR = soupsieve.compile('input[name="authenticity_token"]')
 
-@dataclass
+
+@dataclass(slots=True)
 class Assignment:
     assignment_id: str
     name: str
-    release_date: datetime.datetime
-    due_date: datetime.datetime
-    late_due_date: datetime.datetime
-    submissions_status: str
-    grade: str
-    max_grade: str
+    release_date: datetime.datetime | None
+    due_date: datetime.datetime | None
+    late_due_date: datetime.datetime | None
+    submissions_status: str | None
+    grade: float | None
+    max_grade: float | None
 
 
 def update_assignment_date(
@@ -30,6 +35,7 @@ def update_assignment_date(
     due_date: datetime.datetime | None = None,
     late_due_date: datetime.datetime | None = None,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    deadline: float | None = None,
 ):
     """Update the dates of an assignment on Gradescope.
 
@@ -40,6 +46,7 @@ def update_assignment_date(
         release_date (datetime.datetime | None, optional): The release date of the assignment. Defaults to None.
         due_date (datetime.datetime | None, optional): The due date of the assignment. Defaults to None.
         late_due_date (datetime.datetime | None, optional): The late due date of the assignment. Defaults to None.
+        deadline (float | None, optional): Seconds both requests may take in total, see `timeouts.deadline`. Defaults to None.
 
     Notes:
         The timezone for dates used in Gradescope is specific to an institution. For example, for NYU, the timezone is America/New_York.
@@ -55,13 +62,81 @@ def update_assignment_date(
         f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
     )
 
-    # Get auth token
-    response = session.get(GS_EDIT_ASSIGNMENT_ENDPOINT)
-    soup = BeautifulSoup(response.text, "html.parser")
-    auth_token = soup.select_one('input[name="authenticity_token"]')["value"]
+    with timeouts.deadline(deadline):
+        # Get auth token
+        response = session.get(GS_EDIT_ASSIGNMENT_ENDPOINT)
+        soup = make_soup(response.text)
+        auth_token = _AUTH_TOKEN_SELECTOR.select_one(soup)["value"]
+
+        # Setup multipart form data
+        multipart = _get_assignment_date_form(
+            auth_token, release_date, due_date, late_due_date
+        )
+        headers = {
+            "Content-Type": multipart.content_type,
+            "Referer": GS_EDIT_ASSIGNMENT_ENDPOINT,
+        }
+
+        response = session.post(
+            GS_POST_ASSIGNMENT_ENDPOINT, data=multipart, headers=headers
+        )
+
+        return response.status_code == 200
+
+
+async def update_assignment_date_async(
+    client: httpx.AsyncClient,
+    course_id: str,
+    assignment_id: str,
+    release_date: datetime.datetime | None = None,
+    due_date: datetime.datetime | None = None,
+    late_due_date: datetime.datetime | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    deadline: float | None = None,
+):
+    """Update the dates of an assignment on Gradescope, without blocking the event loop.
+
+    Same as `update_assignment_date`, but uses an `httpx.AsyncClient` for the requests.
+
+    Returns:
+        bool: True if the assignment dates were successfully updated, False otherwise.
+    """
+    GS_EDIT_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/edit"
+    )
+    GS_POST_ASSIGNMENT_ENDPOINT = (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+    )
+
+    with timeouts.deadline(deadline):
+        # Get auth token
+        response = await client.get(GS_EDIT_ASSIGNMENT_ENDPOINT)
+        soup = make_soup(response.text)
+        auth_token = _AUTH_TOKEN_SELECTOR.select_one(soup)["value"]
 
-    # Setup multipart form data
-    multipart = MultipartEncoder(
+        multipart = _get_assignment_date_form(
+            auth_token, release_date, due_date, late_due_date
+        )
+        headers = {
+            "Content-Type": multipart.content_type,
+            "Referer": GS_EDIT_ASSIGNMENT_ENDPOINT,
+        }
+
+        response = await client.post(
+            GS_POST_ASSIGNMENT_ENDPOINT, content=multipart.to_string(), headers=headers
+        )
+
+        return response.status_code == 200
+
+
+def _get_assignment_date_form(
+    auth_token: str,
+    release_date: datetime.datetime | None,
+    due_date: datetime.datetime | None,
+    late_due_date: datetime.datetime | None,
+) -> MultipartEncoder:
+    """Build the multipart form used by the assignment edit page to save dates"""
+    return MultipartEncoder(
         fields={
             "utf8": "✓",
             "_method": "patch",
@@ -79,13 +154,3 @@ def update_assignment_date(
             "commit": "Save",
         }
     )
-    headers = {
-        "Content-Type": multipart.content_type,
-        "Referer": GS_EDIT_ASSIGNMENT_ENDPOINT,
-    }
-
-    response = session.post(
-        GS_POST_ASSIGNMENT_ENDPOINT, data=multipart, headers=headers
-    )
-
-    return response.status_code == 200
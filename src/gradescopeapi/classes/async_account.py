@@ -0,0 +1,625 @@
+import contextlib
+import datetime
+import io
+import os
+import pathlib
+from collections.abc import AsyncIterator, Iterable
+
+import httpx
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    check_response_auth,
+    get_assignments_from_course_page,
+    get_graders,
+    get_submission_files_endpoint,
+    get_submission_ids,
+    get_submission_links,
+    get_submission_page_links,
+    get_submission_pages_endpoint,
+    get_submission_students,
+)
+from gradescopeapi.classes._helpers._bulk_helpers import (
+    aiter_concurrently,
+    gather_concurrently,
+    get_rate_cap,
+)
+from gradescopeapi.classes._helpers._course_helpers import (
+    get_all_courses_info,
+    get_course_members,
+)
+from gradescopeapi.classes.assignments import Assignment, update_assignment_date_async
+from gradescopeapi.classes.blob_store import BlobStore
+from gradescopeapi.classes.cache import parse_response
+from gradescopeapi.classes.downloads import (
+    DEFAULT_LAYOUT,
+    DownloadedFile,
+    download_submissions_async,
+)
+from gradescopeapi.classes.extensions import (
+    Extension,
+    get_extensions_async,
+    update_student_extension_async,
+)
+from gradescopeapi.classes.member import Member
+from gradescopeapi.classes.parsing import make_soup
+from gradescopeapi.classes.result_store import stored_result_async
+from gradescopeapi.classes.snapshot import (
+    CourseSnapshot,
+    ProgressCallback,
+    crawl_course_async,
+)
+from gradescopeapi.classes.submission_export import (
+    DEFAULT_POLL_INTERVAL,
+    export_assignment_submissions_async,
+)
+from gradescopeapi.classes.submission_pages import (
+    download_submission_pages_async,
+)
+from gradescopeapi.classes.upload import upload_assignment_async
+
+
+class AsyncAccount:
+    """asyncio counterpart of `Account`.
+
+    Every method is a coroutine with the same arguments, return values and errors
+    as the method of the same name on `Account`. Pages are parsed with the same
+    helpers, so results are identical to the synchronous client.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        max_concurrency: int = 10,
+    ):
+        self.client = client
+        self.gradescope_base_url = gradescope_base_url
+        # bounds the number of requests a single bulk call keeps in flight
+        self.max_concurrency = max_concurrency
+
+    async def _get_page(self, endpoint: str) -> httpx.Response:
+        """Async version of `check_page_auth`"""
+        response = await self.client.get(endpoint)
+        return check_response_auth(response)
+
+    async def get_courses(self) -> dict:
+        """
+        Get all courses for the user, including both instructor and student courses
+
+        Returns:
+            dict: A dictionary of dictionaries, where keys are "instructor" and "student" and values are
+            dictionaries containing all courses, where keys are course IDs and values are Course objects.
+
+        Raises:
+            RuntimeError: If request to account page fails.
+        """
+        endpoint = f"{self.gradescope_base_url}/account"
+
+        return await stored_result_async(
+            self.client, "courses", endpoint, lambda: self._fetch_courses(endpoint)
+        )
+
+    async def _fetch_courses(self, endpoint: str) -> dict:
+        response = await self.client.get(endpoint)
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Failed to access account page on Gradescope. Status code: {response.status_code}"
+            )
+
+        return parse_response(
+            self.client,
+            "courses",
+            response,
+            lambda page: get_all_courses_info(make_soup(page)),
+        )
+
+    async def get_course_users(self, course_id: str) -> list[Member]:
+        """
+        Get a list of all users in a course
+        Returns:
+            list: A list of users in the course (Member objects)
+        Raises:
+            Exceptions:
+            "One or more invalid parameters": if course_id is null or empty value
+            "You must be logged in to access this page.": if no user is logged in
+        """
+        # check that course_id is valid (not empty)
+        if not course_id:
+            raise Exception("Invalid Course ID")
+
+        try:
+            return await self._get_course_members(course_id)
+        except timeouts.DeadlineExceeded:
+            raise
+        except Exception:
+            return None
+
+    async def _get_course_members(self, course_id: str) -> list[Member]:
+        """Async version of `Account._get_course_members`"""
+        membership_endpoint = (
+            f"{self.gradescope_base_url}/courses/{course_id}/memberships"
+        )
+        if not course_id:
+            raise Exception("Invalid Course ID")
+
+        return await stored_result_async(
+            self.client,
+            "members",
+            membership_endpoint,
+            lambda: self._fetch_course_users(course_id, membership_endpoint),
+        )
+
+    async def _fetch_course_users(
+        self, course_id: str, membership_endpoint: str
+    ) -> list[Member]:
+        membership_resp = await self._get_page(membership_endpoint)
+
+        return parse_response(
+            self.client,
+            "members",
+            membership_resp,
+            lambda page: get_course_members(make_soup(page), course_id),
+        )
+
+    async def get_assignments(self, course_id: str) -> list[Assignment]:
+        """
+        Get a list of detailed assignment information for a course
+        Returns:
+            list: A list of Assignments
+        Raises:
+            Exceptions:
+            "One or more invalid parameters": if course_id or assignment_id is null or empty value
+            "You are not authorized to access this page.": if logged in user is unable to access submissions
+            "You must be logged in to access this page.": if no user is logged in
+        """
+        course_endpoint = f"{self.gradescope_base_url}/courses/{course_id}"
+        # check that course_id is valid (not empty)
+        if not course_id:
+            raise Exception("Invalid Course ID")
+        return await stored_result_async(
+            self.client,
+            "assignments",
+            course_endpoint,
+            lambda: self._fetch_assignments(course_endpoint),
+        )
+
+    async def _fetch_assignments(self, course_endpoint: str) -> list[Assignment]:
+        coursepage_resp = await self._get_page(course_endpoint)
+
+        return parse_response(
+            self.client,
+            "assignments",
+            coursepage_resp,
+            get_assignments_from_course_page,
+        )
+
+    async def get_rosters(
+        self,
+        course_ids: Iterable[str],
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, list[Member]]:
+        """
+        Async version of `Account.get_rosters`, with at most `max_concurrency` courses
+        fetched at once
+        """
+
+        with timeouts.deadline(deadline):
+            return await gather_concurrently(
+                self._get_course_members,
+                course_ids,
+                self.max_concurrency,
+                get_rate_cap(requests_per_second),
+            )
+
+    async def get_assignments_for_courses(
+        self,
+        course_ids: Iterable[str],
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, list[Assignment]]:
+        """
+        Async version of `Account.get_assignments_for_courses`, with at most
+        `max_concurrency` courses fetched at once
+        """
+        with timeouts.deadline(deadline):
+            return await gather_concurrently(
+                self.get_assignments,
+                course_ids,
+                self.max_concurrency,
+                get_rate_cap(requests_per_second),
+            )
+
+    async def get_submission_files(
+        self, course_id: str, assignment_id: str, submission_id: str
+    ) -> list[str]:
+        """
+        Get the aws links to all files of a single submission
+        Returns:
+            list: A list of aws links as strings
+        Raises:
+            RuntimeError: If the submission could not be fetched.
+        """
+        file_info_link = get_submission_files_endpoint(
+            course_id, assignment_id, submission_id, self.gradescope_base_url
+        )
+
+        async def fetch() -> list[str]:
+            file_info_resp = await self.client.get(file_info_link)
+            if file_info_resp.status_code != 200:
+                raise RuntimeError(
+                    f"Failed to get files for submission {submission_id}. Status code: {file_info_resp.status_code}"
+                )
+            return get_submission_links(file_info_resp.json())
+
+        return await stored_result_async(
+            self.client, "submission_files", file_info_link, fetch
+        )
+
+    async def get_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, list[str]]:
+        """
+        Get a list of dicts mapping AWS links for all submissions to each submission id
+
+        Unlike `Account.get_assignment_submissions`, the per-submission requests are always made
+        concurrently, with at most `max_concurrency` requests in flight at once.
+
+        Args:
+            requests_per_second (float | None): Extra cap on the rate at which submission requests are started,
+                on top of the connection's rate limiter. Defaults to None (no extra cap).
+            deadline (float | None): Seconds the whole operation may take, see `timeouts.deadline`. Defaults to None.
+        Returns:
+            dict: A dictionary of submissions, where the keys are the submission ids and the values are
+            a list of aws links to the submission pdf
+            Submissions that could not be fetched are reported in the `errors` attribute instead.
+        Raises:
+            Exceptions:
+                "One or more invalid parameters": if course_id or assignment_id is null or empty value
+                "You are not authorized to access this page.": if logged in user is unable to access submissions
+                "You must be logged in to access this page.": if no user is logged in
+                "Page not Found": When link is invalid: change in url, invalid course_if or assignment id
+        """
+        with timeouts.deadline(deadline):
+            submission_ids = await self._get_submission_ids(course_id, assignment_id)
+
+            return await gather_concurrently(
+                self._submission_files_fetcher(course_id, assignment_id),
+                submission_ids,
+                self.max_concurrency,
+                get_rate_cap(requests_per_second),
+            )
+
+    async def iter_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        start_after: str | None = None,
+        requests_per_second: float | None = None,
+    ) -> AsyncIterator[tuple[str, list[str]]]:
+        """
+        Async generator version of `Account.iter_assignment_submissions`
+
+        Yields (submission_id, aws_links) in the order submissions are listed, fetching up to
+        `max_concurrency` submissions concurrently ahead of the consumer.
+        """
+        submission_ids = await self._get_submission_ids(course_id, assignment_id)
+        if start_after is not None:
+            try:
+                submission_ids = submission_ids[submission_ids.index(start_after) + 1 :]
+            except ValueError:
+                raise ValueError(
+                    f"Submission {start_after} not found in assignment {assignment_id}"
+                ) from None
+
+        results = aiter_concurrently(
+            self._submission_files_fetcher(course_id, assignment_id),
+            submission_ids,
+            self.max_concurrency,
+            get_rate_cap(requests_per_second),
+        )
+        async with contextlib.aclosing(results):
+            async for submission_id, aws_links, error in results:
+                if error is not None:
+                    raise error
+                yield submission_id, aws_links
+
+    async def download_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        directory: str | os.PathLike,
+        layout: str = DEFAULT_LAYOUT,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+        store: BlobStore | None = None,
+    ) -> dict[str, list[DownloadedFile]]:
+        """
+        Async version of `Account.download_assignment_submissions`, with at most
+        `max_concurrency` requests in flight at once
+        """
+        with timeouts.deadline(deadline):
+            submissions = await self.get_assignment_submissions(
+                course_id, assignment_id, requests_per_second
+            )
+            downloaded = await download_submissions_async(
+                self.client,
+                course_id,
+                assignment_id,
+                submissions,
+                directory,
+                layout,
+                self.max_concurrency,
+                requests_per_second,
+                store=store,
+            )
+        downloaded.errors.update(submissions.errors)
+        return downloaded
+
+    async def get_submission_pages(
+        self, course_id: str, assignment_id: str, submission_id: str
+    ) -> list[str]:
+        """Async version of `Account.get_submission_pages`"""
+        pages_link = get_submission_pages_endpoint(
+            course_id, assignment_id, submission_id, self.gradescope_base_url
+        )
+
+        async def fetch() -> list[str]:
+            pages_resp = await self.client.get(pages_link)
+            if pages_resp.status_code != 200:
+                raise RuntimeError(
+                    f"Failed to get pages of submission {submission_id}. Status code: {pages_resp.status_code}"
+                )
+            return get_submission_page_links(pages_resp.json())
+
+        return await stored_result_async(
+            self.client, "submission_pages", pages_link, fetch
+        )
+
+    async def download_assignment_pages(
+        self,
+        course_id: str,
+        assignment_id: str,
+        directory: str | os.PathLike,
+        layout: str = DEFAULT_LAYOUT,
+        pdf: bool = False,
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, list]:
+        """
+        Async version of `Account.download_assignment_pages`, with at most
+        `max_concurrency` requests in flight at once
+        """
+
+        async def fetch(submission_id: str) -> list[str]:
+            return await self.get_submission_pages(
+                course_id, assignment_id, submission_id
+            )
+
+        with timeouts.deadline(deadline):
+            submission_ids = await self._get_submission_ids(course_id, assignment_id)
+            pages = await gather_concurrently(
+                fetch,
+                submission_ids,
+                self.max_concurrency,
+                get_rate_cap(requests_per_second),
+            )
+            downloaded = await download_submission_pages_async(
+                self.client,
+                course_id,
+                assignment_id,
+                pages,
+                directory,
+                layout,
+                pdf,
+                self.max_concurrency,
+                requests_per_second,
+            )
+        downloaded.errors.update(pages.errors)
+        return downloaded
+
+    async def export_assignment_submissions(
+        self,
+        course_id: str,
+        assignment_id: str,
+        directory: str | os.PathLike,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        deadline: float | None = None,
+    ) -> list[pathlib.Path]:
+        """Async version of `Account.export_assignment_submissions`"""
+        return await export_assignment_submissions_async(
+            self.client,
+            course_id,
+            assignment_id,
+            directory,
+            self.gradescope_base_url,
+            poll_interval,
+            deadline,
+        )
+
+    async def get_submission_students(
+        self, course_id: str, assignment_id: str
+    ) -> dict[str, str]:
+        """
+        Get the name of the student of every submission to an assignment
+        Returns:
+            dict: A dictionary mapping submission ids to student names
+        """
+        ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+        if not course_id or not assignment_id:
+            raise Exception("One or more invalid parameters")
+        submissions_resp = await self._get_page(ASSIGNMENT_ENDPOINT)
+        return get_submission_students(make_soup(submissions_resp.text))
+
+    async def _get_submission_ids(
+        self, course_id: str, assignment_id: str
+    ) -> list[str]:
+        ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+        if not course_id or not assignment_id:
+            raise Exception("One or more invalid parameters")
+        submissions_resp = await self._get_page(ASSIGNMENT_ENDPOINT)
+        submissions_soup = make_soup(submissions_resp.text)
+        return get_submission_ids(submissions_soup)
+
+    def _submission_files_fetcher(self, course_id: str, assignment_id: str):
+        async def fetch(submission_id: str) -> list[str]:
+            return await self.get_submission_files(
+                course_id, assignment_id, submission_id
+            )
+
+        return fetch
+
+    async def get_assignment_submission(
+        self, student_email: str, course_id: str, assignment_id: str
+    ) -> list[str]:
+        """
+        Get a list of aws links to files of the student's most recent submission to an assignment
+        Returns:
+            list: A list of aws links as strings
+        Raises:
+             Exceptions:
+                "One or more invalid parameters": if course_id or assignment_id is null or empty value
+                "You are not authorized to access this page.": if logged in user is unable to access submissions
+                "You must be logged in to access this page.": if no user is logged in
+                "Page not Found": When link is invalid: change in url, invalid course_if or assignment id
+                "No submission found": When no submission is found for given student_email
+        """
+        ASSIGNMENT_ENDPOINT = f"{self.gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}"
+        ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{ASSIGNMENT_ENDPOINT}/review_grades"
+        if not (student_email and course_id and assignment_id):
+            raise Exception("One or more invalid parameters")
+        submissions_resp = await self._get_page(ASSIGNMENT_SUBMISSIONS_ENDPOINT)
+        submissions_soup = make_soup(submissions_resp.text)
+        td_with_email = submissions_soup.find(
+            "td", string=lambda s: student_email in str(s)
+        )
+        if not td_with_email:
+            raise Exception("No submission found")
+        # submission_td will have an anchor element as a child if there is a submission
+        a_element = td_with_email.find_previous_sibling().find("a")
+        if not a_element:
+            raise Exception("No submission found")
+        submission_id = a_element.get("href").split("/")[-1]
+        return await self.get_submission_files(course_id, assignment_id, submission_id)
+
+    async def get_assignment_graders(
+        self, course_id: str, question_id: str
+    ) -> set[str]:
+        """
+        Get a set of graders for a specific question in an assignment
+        Returns:
+            set: A set of graders as strings
+        Raises:
+            Exceptions:
+                "One or more invalid parameters": if course_id or assignment_id is null or empty value
+                "You are not authorized to access this page.": if logged in user is unable to access submissions
+                "You must be logged in to access this page.": if no user is logged in
+                "Page not Found": When link is invalid: change in url, invalid course_if or assignment id
+        """
+        QUESTION_ENDPOINT = (
+            f"{self.gradescope_base_url}/courses/{course_id}/questions/{question_id}"
+        )
+        ASSIGNMENT_SUBMISSIONS_ENDPOINT = f"{QUESTION_ENDPOINT}/submissions"
+        if not course_id or not question_id:
+            raise Exception("One or more invalid parameters")
+        submissions_resp = await self._get_page(ASSIGNMENT_SUBMISSIONS_ENDPOINT)
+        submissions_soup = make_soup(submissions_resp.text)
+        return get_graders(submissions_soup)
+
+    async def snapshot_course(
+        self,
+        course_id: str,
+        question_ids: Iterable[str] = (),
+        requests_per_second: float | None = None,
+        deadline: float | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> CourseSnapshot:
+        """
+        Async version of `Account.snapshot_course`, with at most `max_concurrency` requests
+        in flight at once
+        """
+        with timeouts.deadline(deadline):
+            return await crawl_course_async(
+                self,
+                course_id,
+                question_ids,
+                self.max_concurrency,
+                requests_per_second,
+                progress,
+            )
+
+    async def get_extensions(
+        self, course_id: str, assignment_id: str
+    ) -> dict[str, Extension]:
+        """See `gradescopeapi.classes.extensions.get_extensions`"""
+        return await get_extensions_async(
+            self.client, course_id, assignment_id, self.gradescope_base_url
+        )
+
+    async def update_student_extension(
+        self,
+        course_id: str,
+        assignment_id: str,
+        user_id: str,
+        release_date: datetime.datetime | None = None,
+        due_date: datetime.datetime | None = None,
+        late_due_date: datetime.datetime | None = None,
+    ) -> bool:
+        """See `gradescopeapi.classes.extensions.update_student_extension`"""
+        return await update_student_extension_async(
+            self.client,
+            course_id,
+            assignment_id,
+            user_id,
+            release_date,
+            due_date,
+            late_due_date,
+            self.gradescope_base_url,
+        )
+
+    async def update_assignment_date(
+        self,
+        course_id: str,
+        assignment_id: str,
+        release_date: datetime.datetime | None = None,
+        due_date: datetime.datetime | None = None,
+        late_due_date: datetime.datetime | None = None,
+        deadline: float | None = None,
+    ) -> bool:
+        """See `gradescopeapi.classes.assignments.update_assignment_date`"""
+        return await update_assignment_date_async(
+            self.client,
+            course_id,
+            assignment_id,
+            release_date,
+            due_date,
+            late_due_date,
+            self.gradescope_base_url,
+            deadline,
+        )
+
+    async def upload_assignment(
+        self,
+        course_id: str,
+        assignment_id: str,
+        *files: io.TextIOWrapper,
+        leaderboard_name: str | None = None,
+        deadline: float | None = None,
+    ) -> str | None:
+        """See `gradescopeapi.classes.upload.upload_assignment`"""
+        return await upload_assignment_async(
+            self.client,
+            course_id,
+            assignment_id,
+            *files,
+            leaderboard_name=leaderboard_name,
+            gradescope_base_url=self.gradescope_base_url,
+            deadline=deadline,
+        )
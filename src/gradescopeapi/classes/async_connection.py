@@ -0,0 +1,227 @@
+import functools
+
+import httpx
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._login_helpers import (
+    get_csrf_token,
+    get_login_auth_token,
+    get_login_data,
+    get_session_state,
+    is_login_successful,
+    is_session_valid,
+    set_session_cookies,
+)
+from gradescopeapi.classes.async_account import AsyncAccount
+from gradescopeapi.classes.cache import ResponseCache
+from gradescopeapi.classes.parsing import make_soup
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.result_store import ResultStore
+from gradescopeapi.classes.retry import CircuitBreaker, RetryPolicy
+from gradescopeapi.classes.session_store import SessionStore
+from gradescopeapi.classes.timeouts import DEFAULT_TIMEOUT, Timeout
+from gradescopeapi.classes.transport import (
+    AsyncGSClient,
+    AsyncGSTransport,
+    PoolConfig,
+    SharedAsyncTransport,
+    _check_shared_transport,
+)
+
+
+class AsyncGSConnection:
+    """asyncio counterpart of `GSConnection`, backed by an `httpx.AsyncClient`.
+
+    Connections given the same `transport` (an `AsyncGSTransport`) share its connection pool
+    and policies; closing them leaves it open. HTTP/2 can be enabled with
+    `pool=PoolConfig(http2=True)`, which requires `pip install gradescopeapi[http2]`. A
+    `cache` answers repeated GET requests from memory (see `cache.ResponseCache`), and a
+    `result_store` keeps scraped results across processes (see `result_store`).
+
+    Example:
+        async with AsyncGSConnection() as connection:
+            await connection.login("email@domain.com", "password")
+            courses = await connection.account.get_courses()
+    """
+
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        max_concurrency: int = 10,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool: PoolConfig | None = None,
+        transport: AsyncGSTransport | None = None,
+        cache: ResponseCache | None = None,
+        result_store: ResultStore | None = None,
+    ):
+        if transport is None:
+            self.transport = AsyncGSTransport(
+                gradescope_base_url,
+                rate_limiter,
+                retry_policy=retry_policy,
+                circuit_breaker=circuit_breaker,
+                pool=pool,
+            )
+            client_transport = self.transport
+        else:
+            # the timeout belongs to the client, so it can differ between connections
+            _check_shared_transport(
+                transport.gradescope_base_url,
+                gradescope_base_url,
+                rate_limiter,
+                retry_policy,
+                circuit_breaker,
+                DEFAULT_TIMEOUT,
+                pool,
+            )
+            self.transport = transport
+            # closing the client must leave the shared transport open
+            client_transport = SharedAsyncTransport(transport)
+        self.client = AsyncGSClient(
+            gradescope_base_url,
+            cache,
+            result_store,
+            transport=client_transport,
+            follow_redirects=True,
+            timeout=_httpx_timeout(timeout),
+        )
+        self.gradescope_base_url = gradescope_base_url
+        self.max_concurrency = max_concurrency
+        self.logged_in = False
+        self.account = None
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self.transport.rate_limiter
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self.transport.retry_policy
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self.transport.circuit_breaker
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        return self.client.cache
+
+    @property
+    def result_store(self) -> ResultStore | None:
+        return self.client.result_store
+
+    def stats(self) -> dict:
+        """Counters of the rate limiter, retries, circuit breaker and cache, for monitoring"""
+        stats = self.transport.stats()
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    async def login(
+        self,
+        email,
+        password,
+        session_store: SessionStore | None = None,
+        relogin: bool = True,
+    ):
+        """Async version of `GSConnection.login`"""
+        if session_store is None or not await self.load_session(session_store, email):
+            await self._login(email, password)
+            if session_store is not None:
+                self.save_session(session_store, email)
+
+        if relogin:
+            self.client.relogin = functools.partial(
+                self._relogin, email, password, session_store
+            )
+
+    async def _login(self, email, password):
+        # go to homepage to parse hidden authenticity token and to set initial "_gradescope_session" cookie
+        homepage_resp = await self.client.get(self.gradescope_base_url)
+        auth_token = get_login_auth_token(make_soup(homepage_resp.text))
+
+        # login and set cookies in client
+        login_resp = await self.client.post(
+            f"{self.gradescope_base_url}/login",
+            params=get_login_data(email, password, auth_token),
+        )
+        if is_login_successful(login_resp):
+            # update headers with csrf token
+            csrf_token = get_csrf_token(make_soup(login_resp.text))
+            self.client.headers.update({"X-CSRF-Token": csrf_token})
+
+            self.logged_in = True
+            self.client.user = email
+            self.account = AsyncAccount(
+                self.client, self.gradescope_base_url, self.max_concurrency
+            )
+        else:
+            raise ValueError("Invalid credentials.")
+
+    async def _relogin(self, email, password, session_store: SessionStore | None):
+        self.client.cookies.clear()
+        await self._login(email, password)
+        if session_store is not None:
+            self.save_session(session_store, email)
+
+    def save_session(self, session_store: SessionStore, key: str):
+        """See `GSConnection.save_session`"""
+        if not self.logged_in:
+            raise ValueError("Not logged in.")
+        session_store.save(
+            key,
+            get_session_state(
+                self.client.cookies.jar,
+                self.client.headers["X-CSRF-Token"],
+                self.gradescope_base_url,
+            ),
+        )
+
+    async def load_session(self, session_store: SessionStore, key: str) -> bool:
+        """Async version of `GSConnection.load_session`"""
+        state = session_store.load(key)
+        if (
+            state is None
+            or state.get("gradescope_base_url") != self.gradescope_base_url
+        ):
+            return False
+
+        set_session_cookies(self.client.cookies.jar, state)
+        self.client.headers.update({"X-CSRF-Token": state["csrf_token"]})
+
+        account_resp = await self.client.get(
+            f"{self.gradescope_base_url}/account", follow_redirects=False
+        )
+        if not is_session_valid(account_resp):
+            self.client.cookies.clear()
+            self.client.headers.pop("X-CSRF-Token", None)
+            session_store.delete(key)
+            return False
+
+        self.logged_in = True
+        self.client.user = key
+        self.account = AsyncAccount(
+            self.client, self.gradescope_base_url, self.max_concurrency
+        )
+        return True
+
+    async def aclose(self):
+        """Close the underlying client and its connections, unless its transport is shared"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+def _httpx_timeout(timeout: Timeout) -> httpx.Timeout:
+    """Convert a requests-style (connect, read) timeout"""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
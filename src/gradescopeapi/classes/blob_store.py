@@ -0,0 +1,311 @@
+"""Content-addressed store of downloaded submission files.
+
+Most files of a re-downloaded assignment (starter code, unchanged resubmissions) are
+byte-identical to files downloaded before. A `BlobStore` keeps each distinct content once,
+as a "blob" named by its MD5 checksum, and a manifest mapping the key of every file
+("{course_id}/{assignment_id}/{submission_id}/{file name}") to its blob.
+
+Given a store, `downloads.download_submissions` asks the file host for each file's
+checksum (S3's ETag) before downloading it, and does not download files whose blob is
+already in the store. Files are still laid out under the download directory, as hard
+links to their blob (copies where hard links are not supported): identical files take
+the space of one, across submissions and assignments. Since hard links share their
+content, change a downloaded file by replacing it, not by editing it in place.
+
+The manifest is a sorted index, looked up by binary search through a memory map, so
+lookups stay fast and memory use low with hundreds of thousands of files. Files added
+since the index was written are kept in a journal, merged into the index by `compact`
+(called by `close`, and whenever the journal grows large).
+
+Directory layout:
+- blobs/ab/cdef...: the blob whose MD5 checksum is "abcdef...".
+- index: the sorted index.
+- journal.jsonl: files added since the index was written.
+- incoming/: downloads in progress, resumed by the next run if interrupted.
+
+Example:
+    store = BlobStore("~/.gradescope/blobs")
+    connection.account.download_assignment_submissions(
+        course_id, assignment_id, "submissions", store=store
+    )
+    store.lookup(f"{course_id}/{assignment_id}/{submission_id}/main.py")
+    store.close()
+"""
+
+import dataclasses
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import shutil
+import struct
+import threading
+
+from gradescopeapi.classes._helpers._file_helpers import md5_file
+
+# header of the index: magic, version, number of records
+_HEADER = struct.Struct("<4sIQ")
+_MAGIC = b"GSBI"
+_VERSION = 1
+# record of the index: hash of the key, MD5 of the content, size, offset and length of the key
+_RECORD = struct.Struct("<16s16sQQI")
+
+# journal entries merged into the index automatically
+MAX_JOURNAL_ENTRIES = 10_000
+
+
+@dataclasses.dataclass(slots=True)
+class StoredFile:
+    """A file of the manifest.
+
+    Attributes:
+        key (str): "{course_id}/{assignment_id}/{submission_id}/{file name}".
+        md5 (str): MD5 checksum of the content, naming its blob.
+        size (int): Size of the content, in bytes.
+    """
+
+    key: str
+    md5: str
+    size: int
+
+
+class BlobStore:
+    """Content-addressed store of files, in a directory. Safe to use from several threads,
+    but not from several processes at once.
+
+    Args:
+        directory (str | os.PathLike): Directory of the store, created if it does not exist.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = pathlib.Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / "incoming").mkdir(exist_ok=True)
+        self._index_path = self.directory / "index"
+        self._journal_path = self.directory / "journal.jsonl"
+        self._lock = threading.Lock()
+        self._index: mmap.mmap | None = None
+        self._count = 0
+        self._open_index()
+        # files added since the index was written, by key
+        self._journal: dict[str, StoredFile] = {}
+        complete = True
+        if self._journal_path.exists():
+            with open(self._journal_path, encoding="utf-8") as journal:
+                for line in journal:
+                    complete = line.endswith("\n")
+                    # a line cut short by a crash is ignored
+                    try:
+                        entry = StoredFile(**json.loads(line))
+                    except (TypeError, ValueError):
+                        continue
+                    self._journal[entry.key] = entry
+        self._journal_file = open(self._journal_path, "a", encoding="utf-8")
+        if not complete:
+            self._journal_file.write("\n")
+
+    def blob_path(self, md5: str) -> pathlib.Path:
+        """Path of the blob of the content with checksum `md5`, which may not exist"""
+        return self.directory / "blobs" / md5[:2] / md5[2:]
+
+    def has_blob(self, md5: str) -> bool:
+        """Whether the store holds the content with checksum `md5`"""
+        return self.blob_path(md5).exists()
+
+    def incoming_path(self, key: str) -> pathlib.Path:
+        """Where to download the file of `key` to before `add`ing it, the same across runs
+        so that interrupted downloads can be resumed"""
+        name = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return self.directory / "incoming" / name
+
+    def lookup(self, key: str) -> StoredFile | None:
+        """Return the file of the manifest with this key, None if there is none"""
+        with self._lock:
+            entry = self._journal.get(key)
+            if entry is not None:
+                return entry
+            return self._lookup_index(key)
+
+    def add(self, key: str, path: str | os.PathLike) -> StoredFile:
+        """
+        Move the file at `path` into the store as the file of `key`, or delete it if its
+        content is already stored
+
+        Returns:
+            StoredFile: The entry of the file in the manifest.
+        """
+        path = pathlib.Path(path)
+        md5 = md5_file(path)
+        blob = self.blob_path(md5)
+        if blob.exists():
+            path.unlink()
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, blob)
+        return self.link(key, md5, blob.stat().st_size)
+
+    def link(self, key: str, md5: str, size: int) -> StoredFile:
+        """
+        Record that the file of `key` has the content of an existing blob
+
+        Raises:
+            ValueError: If the store holds no blob with checksum `md5`.
+        """
+        if not self.has_blob(md5):
+            raise ValueError(f"No blob with checksum {md5}")
+        entry = StoredFile(key, md5, size)
+        with self._lock:
+            current = self._journal.get(key) or self._lookup_index(key)
+            if current == entry:
+                return entry
+            self._journal_file.write(json.dumps(dataclasses.asdict(entry)) + "\n")
+            self._journal_file.flush()
+            self._journal[key] = entry
+            if len(self._journal) >= MAX_JOURNAL_ENTRIES:
+                self._compact()
+        return entry
+
+    def materialize(self, entry: StoredFile, path: str | os.PathLike) -> bool:
+        """
+        Make `path` a hard link to the blob of `entry` (a copy, where hard links are not
+        supported), unless it already is one
+
+        Returns:
+            bool: Whether `path` changed.
+        """
+        path = pathlib.Path(path)
+        blob = self.blob_path(entry.md5)
+        if path.exists() and (
+            os.path.samefile(path, blob)
+            or (path.stat().st_size == entry.size and md5_file(path) == entry.md5)
+        ):
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.part")
+        temporary.unlink(missing_ok=True)
+        try:
+            os.link(blob, temporary)
+        except OSError:
+            shutil.copyfile(blob, temporary)
+        os.replace(temporary, path)
+        return True
+
+    def entries(self) -> list[StoredFile]:
+        """Every file of the manifest, sorted by key"""
+        with self._lock:
+            entries = {entry.key: entry for entry in self._read_index()}
+            entries.update(self._journal)
+        return [entries[key] for key in sorted(entries)]
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+    def compact(self):
+        """Merge the journal into the sorted index"""
+        with self._lock:
+            self._compact()
+
+    def close(self):
+        """Merge the journal into the index and close the store"""
+        with self._lock:
+            self._compact()
+            self._journal_file.close()
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+
+    def _open_index(self):
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        self._count = 0
+        if not self._index_path.exists():
+            return
+        with open(self._index_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                return
+            index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(index)
+        if magic != _MAGIC or version != _VERSION:
+            index.close()
+            raise ValueError(f"{self._index_path} is not a blob store index")
+        self._index = index
+        self._count = count
+
+    def _lookup_index(self, key: str) -> StoredFile | None:
+        """Binary search of the index, without reading more of it than needed"""
+        if self._index is None:
+            return None
+        key_hash = _hash_key(key)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            record_hash = self._record(middle)[0]
+            if record_hash < key_hash:
+                low = middle + 1
+            else:
+                high = middle
+        # keys whose hashes collide are next to each other
+        while low < self._count:
+            record = self._record(low)
+            if record[0] != key_hash:
+                break
+            entry = self._entry(record)
+            if entry.key == key:
+                return entry
+            low += 1
+        return None
+
+    def _record(self, position: int) -> tuple:
+        return _RECORD.unpack_from(self._index, _HEADER.size + position * _RECORD.size)
+
+    def _entry(self, record: tuple) -> StoredFile:
+        _, md5, size, key_offset, key_length = record
+        key = self._index[key_offset : key_offset + key_length].decode()
+        return StoredFile(key, md5.hex(), size)
+
+    def _read_index(self) -> list[StoredFile]:
+        return [self._entry(self._record(i)) for i in range(self._count)]
+
+    def _compact(self):
+        if not self._journal:
+            return
+        entries = {entry.key: entry for entry in self._read_index()}
+        entries.update(self._journal)
+        ordered = sorted(entries.values(), key=lambda entry: _hash_key(entry.key))
+
+        keys = [entry.key.encode() for entry in ordered]
+        key_offset = _HEADER.size + len(ordered) * _RECORD.size
+        temporary = self._index_path.with_name("index.tmp")
+        with open(temporary, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, len(ordered)))
+            for entry, key in zip(ordered, keys):
+                file.write(
+                    _RECORD.pack(
+                        _hash_key(entry.key),
+                        bytes.fromhex(entry.md5),
+                        entry.size,
+                        key_offset,
+                        len(key),
+                    )
+                )
+                key_offset += len(key)
+            for key in keys:
+                file.write(key)
+            file.flush()
+            os.fsync(file.fileno())
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        os.replace(temporary, self._index_path)
+        self._open_index()
+
+        # the journal is only emptied once the index holding its entries is in place
+        self._journal_file.close()
+        self._journal_file = open(self._journal_path, "w", encoding="utf-8")
+        self._journal.clear()
+
+
+def _hash_key(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
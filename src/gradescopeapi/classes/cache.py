@@ -0,0 +1,297 @@
+"""In-memory cache of the pages a connection fetches from Gradescope.
+
+Many calls fetch the same pages: every `get_courses` fetches the account page, and
+`get_assignments` and every upload fetch the course page (uploads only need its CSRF
+token). A `ResponseCache` given to a `GSConnection` (or an `AsyncGSConnection`) answers
+repeated GET requests from memory until their time to live expires.
+
+Only pages matching one of the cache's `ttls` patterns are cached, each for the TTL of its
+pattern. The least recently used pages are dropped once the cache holds more than
+`max_entries` pages or `max_bytes` of content. Any other request made to Gradescope (a
+POST, PUT, PATCH or DELETE) invalidates the pages it may change:
+- under `/courses/{course_id}/assignments/{assignment_id}`: the pages of that assignment,
+  and the course page listing it.
+- elsewhere under `/courses/{course_id}`: the pages of that course.
+- anywhere else (e.g. logging in): every page.
+
+Once a page's TTL expires, it is kept if Gradescope sent validators with it (an ETag or
+Last-Modified header): the next request for it is sent with If-None-Match or
+If-Modified-Since, and a 304 Not Modified response is answered with the cached page
+without downloading it again.
+
+The cache also remembers what the scraping methods (e.g. `Account.get_courses`) parsed
+from each page, keyed by a hash of the page's content. A page that did not change, whether
+it came from the cache, a 304 response or an identical download, is not parsed again: the
+method returns a copy of its previous result.
+
+Example:
+    connection = GSConnection(cache=ResponseCache())
+    connection.login(email, password)
+    connection.account.get_courses()
+    connection.account.get_courses()  # answered from the cache
+    connection.stats()["cache"]  # {"hits": 1, "misses": 1, ...}
+"""
+
+import copy
+import dataclasses
+import hashlib
+import re
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import TypeVar
+
+# seconds pages of each kind stay cached, by path pattern ("*" matches one path segment)
+DEFAULT_TTLS = {
+    "/account": 300.0,
+    "/courses/*": 60.0,
+    "/courses/*/memberships": 300.0,
+    "/courses/*/assignments/*/edit": 60.0,
+    "/courses/*/assignments/*/extensions": 60.0,
+}
+
+T = TypeVar("T")
+
+_COURSE_PATH = re.compile(r"/courses/([^/]+)(?:/assignments/([^/]+))?")
+
+
+class ResponseCache:
+    """LRU cache of responses to GET requests, with a time to live per kind of page.
+
+    The cache is safe to use from several threads. It holds the pages of a single login, so
+    each connection needs its own.
+
+    Args:
+        ttls (Mapping[str, float] | None): Seconds pages stay cached, by path pattern, e.g.
+            `{"/courses/*/assignments/*": 30}`. "*" matches one path segment. Pages matching
+            no pattern are not cached. Defaults to `DEFAULT_TTLS`.
+        max_entries (int): Pages kept at most. Defaults to 256.
+        max_bytes (int): Total size of the pages' content kept at most. Defaults to 32 MiB.
+        max_results (int): Parsed results kept at most. Defaults to 256.
+
+    Attributes:
+        hits (int): Requests answered from the cache.
+        misses (int): Requests to cacheable pages that were sent to Gradescope.
+        revalidations (int): Requests answered by Gradescope with 304 Not Modified.
+        parse_hits (int): Pages whose previous parsed result was reused.
+        parse_misses (int): Pages that had to be parsed.
+        evictions (int): Pages dropped to stay within the size bounds.
+        invalidations (int): Pages dropped because a request changed them.
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        max_entries: int = 256,
+        max_bytes: int = 32 * 2**20,
+        max_results: int = 256,
+    ):
+        if max_entries <= 0 or max_bytes <= 0 or max_results <= 0:
+            raise ValueError("max_entries, max_bytes and max_results must be positive")
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_results = max_results
+        self._patterns = [
+            (_compile_pattern(pattern), ttl) for pattern, ttl in self.ttls.items()
+        ]
+        # url -> (expiry time, response, size, conditional request headers), least
+        # recently used first
+        self._entries: OrderedDict[str, tuple[float, object, int, dict[str, str]]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        # (kind, url, content hash) -> parsed result, least recently used first
+        self._results: OrderedDict[tuple[str, str, bytes], object] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.parse_hits = 0
+        self.parse_misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def ttl(self, url: str) -> float:
+        """Seconds the page at `url` may be cached, 0 if it is not cacheable"""
+        path = urllib.parse.urlsplit(url).path.rstrip("/")
+        for pattern, ttl in self._patterns:
+            if pattern.fullmatch(path):
+                return ttl
+        return 0.0
+
+    def get(self, url: str):
+        """Return the response cached for `url`, None if there is none or it expired"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and entry[0] <= time.monotonic():
+                # expired pages are kept for revalidation, if they can be
+                if not entry[3]:
+                    self._remove(url)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return entry[1]
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Headers asking Gradescope to send the page at `url` only if it changed since it
+        was cached (If-None-Match, If-Modified-Since), empty if it is not cached"""
+        with self._lock:
+            entry = self._entries.get(url)
+            return {} if entry is None else entry[3]
+
+    def revalidate(self, url: str):
+        """Renew the TTL of the page at `url`, which Gradescope answered with 304 Not
+        Modified. Returns the cached response, None if it was dropped meanwhile."""
+        ttl = self.ttl(url)
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries[url] = (time.monotonic() + ttl, *entry[1:])
+            self._entries.move_to_end(url)
+            self.revalidations += 1
+            return entry[1]
+
+    def put(self, url: str, response, size: int):
+        """Cache `response` (whose content is `size` bytes long) for the TTL of `url`"""
+        ttl = self.ttl(url)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        headers = {}
+        if etag := response.headers.get("ETag"):
+            headers["If-None-Match"] = etag
+        if last_modified := response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = last_modified
+        with self._lock:
+            if url in self._entries:
+                self._remove(url)
+            self._entries[url] = (time.monotonic() + ttl, response, size, headers)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, url: str):
+        """Drop the cached pages that a write request to `url` may change"""
+        with self._lock:
+            for cached_url in list(self._entries):
+                if is_changed_by_write(cached_url, url):
+                    self._remove(cached_url)
+                    self.invalidations += 1
+
+    def parse(self, kind: str, response, parse: Callable[[str], T]) -> T:
+        """
+        Return `parse(response.text)`, reusing the result of a previous call if `response`
+        has the same URL and content as an earlier response parsed the same `kind` of way
+
+        Args:
+            kind (str): Name of the kind of result parsed, e.g. "courses".
+            response (requests.Response | httpx.Response): Page to parse.
+            parse (Callable[[str], T]): Function parsing the text of the page.
+
+        Returns:
+            T: A copy of the parsed result, so callers may change it.
+        """
+        key = (
+            kind,
+            str(response.url),
+            hashlib.blake2b(response.content, digest_size=16).digest(),
+        )
+        with self._lock:
+            result = self._results.get(key, _MISSING)
+            if result is not _MISSING:
+                self._results.move_to_end(key)
+                self.parse_hits += 1
+                return _copy_result(result)
+            self.parse_misses += 1
+
+        result = parse(response.text)
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return _copy_result(result)
+
+    def clear(self):
+        """Drop every cached page and parsed result"""
+        with self._lock:
+            self._entries.clear()
+            self._results.clear()
+            self._size = 0
+
+    def _remove(self, url: str):
+        size = self._entries.pop(url)[2]
+        self._size -= size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Hit and miss counts and current size, for monitoring"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "parse_hits": self.parse_hits,
+            "parse_misses": self.parse_misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+
+def parse_response(client, kind: str, response, parse: Callable[[str], T]) -> T:
+    """Parse a page with `ResponseCache.parse` if the session or client fetching it has a
+    cache, with `parse(response.text)` otherwise"""
+    cache = getattr(client, "cache", None)
+    if cache is None:
+        return parse(response.text)
+    return cache.parse(kind, response, parse)
+
+
+def is_changed_by_write(url: str, write_url: str) -> bool:
+    """
+    Whether the page at `url` may change when a write request (POST, PUT, PATCH, DELETE) is
+    sent to `write_url`, following the rules described at the top of this module
+    """
+    match = _COURSE_PATH.match(urllib.parse.urlsplit(write_url).path)
+    if match is None:
+        return True
+    course_id, assignment_id = match.groups()
+    path = urllib.parse.urlsplit(url).path.rstrip("/")
+    course_path = f"/courses/{course_id}"
+    if assignment_id is None:
+        return path == course_path or path.startswith(f"{course_path}/")
+    assignment_path = f"{course_path}/assignments/{assignment_id}"
+    return (
+        path == course_path
+        or path == assignment_path
+        or path.startswith(f"{assignment_path}/")
+    )
+
+
+_MISSING = object()
+
+
+def _copy_result(result):
+    """Copy a parsed result down to its rows, whose fields are immutable"""
+    if isinstance(result, dict):
+        return {key: _copy_result(value) for key, value in result.items()}
+    if isinstance(result, (list, set)):
+        return type(result)(_copy_result(value) for value in result)
+    if dataclasses.is_dataclass(result):
+        return copy.copy(result)
+    return result
+
+
+def _compile_pattern(pattern: str) -> re.Pattern:
+    return re.compile(
+        "[^/]+".join(re.escape(part) for part in pattern.rstrip("/").split("*"))
+    )
@@ -1,21 +1,119 @@
-import requests
+import functools
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
 from gradescopeapi.classes._helpers._login_helpers import (
     get_auth_token_init_gradescope_session,
+    get_session_state,
+    is_session_valid,
     login_set_session_cookies,
+    set_session_cookies,
 )
 from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.cache import ResponseCache
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.result_store import ResultStore
+from gradescopeapi.classes.retry import CircuitBreaker, RetryPolicy
+from gradescopeapi.classes.session_store import SessionStore
+from gradescopeapi.classes.timeouts import DEFAULT_TIMEOUT, Timeout
+from gradescopeapi.classes.transport import GSSession, GSTransport, PoolConfig
 
 
 class GSConnection:
-    def __init__(self, gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL):
-        self.session = requests.Session()
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool: PoolConfig | None = None,
+        transport: GSTransport | None = None,
+        cache: ResponseCache | None = None,
+        result_store: ResultStore | None = None,
+    ):
+        # every request made through the session to Gradescope goes through the circuit
+        # breaker, rate limiter and retry policy (defaults are used unless others are given).
+        # requests to any host get `timeout` unless they set their own.
+        # connections given the same `transport` share its connection pools and policies.
+        # a `cache` answers repeated GET requests from memory (see `cache.ResponseCache`), and
+        # a `result_store` keeps scraped results across processes (see `result_store`)
+        self.session = GSSession(
+            gradescope_base_url,
+            rate_limiter,
+            retry_policy,
+            circuit_breaker,
+            timeout,
+            pool,
+            transport,
+            cache,
+            result_store,
+        )
         self.gradescope_base_url = gradescope_base_url
         self.logged_in = False
         self.account = None
 
-    def login(self, email, password):
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self.session.rate_limiter
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self.session.retry_policy
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self.session.circuit_breaker
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        return self.session.cache
+
+    @property
+    def result_store(self) -> ResultStore | None:
+        return self.session.result_store
+
+    def stats(self) -> dict:
+        """Counters of the rate limiter, retries, circuit breaker and cache, for monitoring"""
+        return self.session.stats()
+
+    def close(self):
+        """Close the session's connections, unless its transport is shared"""
+        self.session.close()
+
+    def login(
+        self,
+        email,
+        password,
+        session_store: SessionStore | None = None,
+        relogin: bool = True,
+    ):
+        """
+        Log in to Gradescope
+
+        Args:
+            email (str): Email address of the account.
+            password (str): Password of the account.
+            session_store (SessionStore | None): If given, a session previously saved in it for
+                this email is reused when still valid, instead of logging in again. A new
+                session is saved in it after a full login. Defaults to None.
+            relogin (bool): Keep the credentials in memory to log in again when the session
+                expires. Only one login runs at a time; concurrent requests wait for it and
+                idempotent ones (e.g. GET) are sent again. Defaults to True.
+
+        Raises:
+            ValueError: If the credentials are invalid.
+        """
+        if session_store is None or not self.load_session(session_store, email):
+            self._login(email, password)
+            if session_store is not None:
+                self.save_session(session_store, email)
+
+        if relogin:
+            self.session.relogin = functools.partial(
+                self._relogin, email, password, session_store
+            )
+
+    def _login(self, email, password):
         # go to homepage to parse hidden authenticity token and to set initial "_gradescope_session" cookie
         auth_token = get_auth_token_init_gradescope_session(
             self.session, self.gradescope_base_url
@@ -27,6 +125,64 @@ class GSConnection:
         )
         if login_success:
             self.logged_in = True
+            self.session.user = email
             self.account = Account(self.session, self.gradescope_base_url)
         else:
             raise ValueError("Invalid credentials.")
+
+    def _relogin(self, email, password, session_store: SessionStore | None):
+        self.session.cookies.clear()
+        self._login(email, password)
+        if session_store is not None:
+            self.save_session(session_store, email)
+
+    def save_session(self, session_store: SessionStore, key: str):
+        """
+        Save the cookies and CSRF token of the logged-in session under `key`, so another
+        process can reuse it with `load_session` instead of logging in again
+
+        Raises:
+            ValueError: If the connection is not logged in.
+        """
+        if not self.logged_in:
+            raise ValueError("Not logged in.")
+        session_store.save(
+            key,
+            get_session_state(
+                self.session.cookies,
+                self.session.headers["X-CSRF-Token"],
+                self.gradescope_base_url,
+            ),
+        )
+
+    def load_session(self, session_store: SessionStore, key: str) -> bool:
+        """
+        Restore the session saved under `key`, checking with a single request that it is
+        still logged in. Expired sessions are removed from the store.
+
+        Returns:
+            bool: True if the connection is now logged in, False otherwise.
+        """
+        state = session_store.load(key)
+        if (
+            state is None
+            or state.get("gradescope_base_url") != self.gradescope_base_url
+        ):
+            return False
+
+        set_session_cookies(self.session.cookies, state)
+        self.session.headers.update({"X-CSRF-Token": state["csrf_token"]})
+
+        account_resp = self.session.get(
+            f"{self.gradescope_base_url}/account", allow_redirects=False
+        )
+        if not is_session_valid(account_resp):
+            self.session.cookies.clear()
+            self.session.headers.pop("X-CSRF-Token", None)
+            session_store.delete(key)
+            return False
+
+        self.logged_in = True
+        self.session.user = key
+        self.account = Account(self.session, self.gradescope_base_url)
+        return True
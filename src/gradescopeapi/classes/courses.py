@@ -1,11 +1,11 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Course:
     name: str
     full_name: str
     semester: str
     year: str
-    num_grades_published: str
-    num_assignments: str
+    num_grades_published: int | None
+    num_assignments: int | None
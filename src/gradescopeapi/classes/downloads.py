@@ -0,0 +1,481 @@
+"""Concurrent downloads of submission files to disk.
+
+`download_submissions` (and `download_submissions_async`) take the file links returned by
+`Account.get_assignment_submissions` and save every file under a directory, laid out by
+course, assignment and submission (see `DEFAULT_LAYOUT`). Files are downloaded in
+parallel and streamed to disk in chunks, so memory use does not depend on their size.
+
+Downloads can be interrupted and run again at any time:
+- Each file is written to a ".part" file next to its destination, then renamed into
+  place once complete, so a file under its final name is always whole.
+- A ".part" file left by an interrupted run is resumed with an HTTP Range request, if the
+  file host supports them (S3 does), instead of being downloaded again. The request is
+  conditional (If-Range) on the ETag or Last-Modified date the file had when the ".part"
+  file was started, kept next to it in a ".part.validator" file: a file changed since is
+  downloaded again from the start, never spliced onto the start of its old version.
+- A file already on disk is skipped when its size matches the file host's, and so does
+  its MD5 checksum when the host's ETag is one (as S3's are for files uploaded at once).
+  Checking this costs a request for the file's first byte, not a download.
+
+Given a `blob_store.BlobStore`, identical files are stored once and not downloaded again,
+even under other submissions or assignments.
+
+Example:
+    submissions = connection.account.get_assignment_submissions(course_id, assignment_id)
+    saved = download_submissions(
+        connection.session, course_id, assignment_id, submissions, "submissions"
+    )
+    saved[submission_id]  # [DownloadedFile(path=PosixPath("submissions/1/2/3/main.py"), ...)]
+"""
+
+import dataclasses
+import os
+import pathlib
+import re
+import urllib.parse
+from collections.abc import Mapping
+
+import httpx
+import requests
+
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes._helpers._bulk_helpers import (
+    BulkResult,
+    gather_concurrently,
+    get_rate_cap,
+    map_concurrently,
+)
+from gradescopeapi.classes._helpers._file_helpers import get_part_path, md5_file
+from gradescopeapi.classes.blob_store import BlobStore, StoredFile
+
+# directory of each submission's files, relative to the download directory
+DEFAULT_LAYOUT = "{course_id}/{assignment_id}/{submission_id}"
+
+# bytes read from the network and written to disk at once
+CHUNK_SIZE = 64 * 1024
+
+_CONTENT_RANGE = re.compile(r"bytes (?:(\d+)-\d+|\*)/(\d+)")
+_MD5_ETAG = re.compile(r'"?([0-9a-f]{32})"?')
+
+
+@dataclasses.dataclass(slots=True)
+class DownloadedFile:
+    """A file saved to disk.
+
+    Attributes:
+        url (str): Link the file was downloaded from.
+        path (pathlib.Path): Where the file was saved.
+        size (int): Size of the file, in bytes.
+        skipped (bool): Whether the file was already on disk, and was not downloaded again.
+        resumed (bool): Whether the download continued a ".part" file left by an earlier run.
+    """
+
+    url: str
+    path: pathlib.Path
+    size: int
+    skipped: bool = False
+    resumed: bool = False
+
+
+def download_submissions(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    submissions: Mapping[str, list[str]],
+    directory: str | os.PathLike,
+    layout: str = DEFAULT_LAYOUT,
+    max_workers: int = 4,
+    requests_per_second: float | None = None,
+    deadline: float | None = None,
+    store: BlobStore | None = None,
+) -> BulkResult:
+    """Download the files of submissions to an assignment.
+
+    Args:
+        session (requests.Session): The session to download files with, e.g.
+            `GSConnection.session`.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+        submissions (Mapping[str, list[str]]): File links by submission ID, as returned by
+            `Account.get_assignment_submissions`.
+        directory (str | os.PathLike): Directory to save files under.
+        layout (str): Directory of each submission's files under `directory`, formatted with
+            `course_id`, `assignment_id` and `submission_id`. Defaults to `DEFAULT_LAYOUT`.
+        max_workers (int): Number of files downloaded in parallel. Defaults to 4.
+        requests_per_second (float | None): Cap on the rate at which downloads are started.
+            Defaults to None (no cap).
+        deadline (float | None): Seconds the whole operation may take, see
+            `timeouts.deadline`. Defaults to None.
+        store (BlobStore | None): Content-addressed store to keep files in, laying them
+            out under `directory` as links to it, and skipping the download of files
+            whose content it already holds (see `blob_store`). Defaults to None.
+
+    Returns:
+        BulkResult: The files saved for each submission, as lists of `DownloadedFile` in the
+        order of their links. Submissions with a file that could not be downloaded are
+        reported in its `errors` attribute instead, mapping submission IDs to the first
+        exception raised. Their other files are still saved, and skipped by the next run.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes, after cancelling the remaining downloads.
+    """
+    targets = _get_targets(course_id, assignment_id, submissions, directory, layout)
+
+    def download(key: tuple[str, int]) -> DownloadedFile:
+        submission_id, index = key
+        url = submissions[submission_id][index]
+        if store is None:
+            return download_file(session, url, targets[key])
+        store_key = _get_store_key(
+            course_id, assignment_id, submission_id, targets[key]
+        )
+        return _download_to_store(session, url, targets[key], store, store_key)
+
+    with timeouts.deadline(deadline):
+        files = map_concurrently(
+            download,
+            targets,
+            max_workers,
+            get_rate_cap(requests_per_second),
+        )
+    return _group_by_submission(submissions, targets, files)
+
+
+async def download_submissions_async(
+    client: httpx.AsyncClient,
+    course_id: str,
+    assignment_id: str,
+    submissions: Mapping[str, list[str]],
+    directory: str | os.PathLike,
+    layout: str = DEFAULT_LAYOUT,
+    max_concurrency: int = 10,
+    requests_per_second: float | None = None,
+    deadline: float | None = None,
+    store: BlobStore | None = None,
+) -> BulkResult:
+    """Async version of `download_submissions`, with at most `max_concurrency` files
+    downloaded at once. Files are written from the event loop's thread, one chunk at a
+    time."""
+    targets = _get_targets(course_id, assignment_id, submissions, directory, layout)
+
+    async def download(key: tuple[str, int]) -> DownloadedFile:
+        submission_id, index = key
+        url = submissions[submission_id][index]
+        if store is None:
+            return await download_file_async(client, url, targets[key])
+        store_key = _get_store_key(
+            course_id, assignment_id, submission_id, targets[key]
+        )
+        return await _download_to_store_async(
+            client, url, targets[key], store, store_key
+        )
+
+    with timeouts.deadline(deadline):
+        files = await gather_concurrently(
+            download, targets, max_concurrency, get_rate_cap(requests_per_second)
+        )
+    return _group_by_submission(submissions, targets, files)
+
+
+def download_file(
+    session: requests.Session, url: str, path: str | os.PathLike
+) -> DownloadedFile:
+    """
+    Download a file to `path`, through a ".part" file renamed into place once complete
+
+    A file already at `path` with the same size (and checksum, if known) as the file at
+    `url` is not downloaded again, and a ".part" file left by an earlier download is
+    resumed.
+
+    Returns:
+        DownloadedFile: The file saved.
+
+    Raises:
+        RuntimeError: If the file host answers with an error, or sends a file whose size or
+            checksum does not match what it announced.
+    """
+    path = pathlib.Path(path)
+    if path.exists():
+        with session.get(url, headers={"Range": "bytes=0-0"}, stream=True) as response:
+            size, md5 = _get_remote_file(response, 0)
+        if _is_current(path, size, md5):
+            return DownloadedFile(url, path, size, skipped=True)
+
+    part = get_part_path(path)
+    offset, headers = _get_resume(part)
+    with session.get(url, headers=headers, stream=True) as response:
+        size, md5 = _get_remote_file(response, offset)
+        resumed = response.status_code in (206, 416)
+        with _open_part(part, resumed, response) as file:
+            if response.status_code != 416:
+                # bytes as sent, which the size and checksum of the file host are about
+                for chunk in response.raw.stream(CHUNK_SIZE, decode_content=False):
+                    file.write(chunk)
+    return _finish(url, part, path, size, md5, resumed)
+
+
+async def download_file_async(
+    client: httpx.AsyncClient, url: str, path: str | os.PathLike
+) -> DownloadedFile:
+    """Async version of `download_file`"""
+    path = pathlib.Path(path)
+    if path.exists():
+        async with client.stream(
+            "GET", url, headers={"Range": "bytes=0-0"}
+        ) as response:
+            size, md5 = _get_remote_file(response, 0)
+        if _is_current(path, size, md5):
+            return DownloadedFile(url, path, size, skipped=True)
+
+    part = get_part_path(path)
+    offset, headers = _get_resume(part)
+    async with client.stream("GET", url, headers=headers) as response:
+        size, md5 = _get_remote_file(response, offset)
+        resumed = response.status_code in (206, 416)
+        with _open_part(part, resumed, response) as file:
+            if response.status_code != 416:
+                async for chunk in response.aiter_raw(CHUNK_SIZE):
+                    file.write(chunk)
+    return _finish(url, part, path, size, md5, resumed)
+
+
+def _download_to_store(
+    session: requests.Session,
+    url: str,
+    path: pathlib.Path,
+    store: BlobStore,
+    key: str,
+) -> DownloadedFile:
+    """Download a file into a store, unless its content is already there, and lay it out
+    at `path`"""
+    with session.get(url, headers={"Range": "bytes=0-0"}, stream=True) as response:
+        size, md5 = _get_remote_file(response, 0)
+    entry = _get_stored_entry(store, key, size, md5)
+    if entry is not None:
+        store.materialize(entry, path)
+        return DownloadedFile(url, path, entry.size, skipped=True)
+
+    incoming = download_file(session, url, store.incoming_path(key))
+    entry = store.add(key, incoming.path)
+    store.materialize(entry, path)
+    return DownloadedFile(url, path, entry.size, resumed=incoming.resumed)
+
+
+async def _download_to_store_async(
+    client: httpx.AsyncClient,
+    url: str,
+    path: pathlib.Path,
+    store: BlobStore,
+    key: str,
+) -> DownloadedFile:
+    """Async version of `_download_to_store`"""
+    async with client.stream("GET", url, headers={"Range": "bytes=0-0"}) as response:
+        size, md5 = _get_remote_file(response, 0)
+    entry = _get_stored_entry(store, key, size, md5)
+    if entry is not None:
+        store.materialize(entry, path)
+        return DownloadedFile(url, path, entry.size, skipped=True)
+
+    incoming = await download_file_async(client, url, store.incoming_path(key))
+    entry = store.add(key, incoming.path)
+    store.materialize(entry, path)
+    return DownloadedFile(url, path, entry.size, resumed=incoming.resumed)
+
+
+def _get_stored_entry(
+    store: BlobStore, key: str, size: int, md5: str | None
+) -> StoredFile | None:
+    """The entry of a file of `size` bytes and checksum `md5` (if known) in a store, linked
+    to `key` if needed, None if the store does not hold its content"""
+    if md5 is not None:
+        return store.link(key, md5, size) if store.has_blob(md5) else None
+    # without a checksum, a file of the same size stored under the same key is kept
+    entry = store.lookup(key)
+    if entry is not None and entry.size == size and store.has_blob(entry.md5):
+        return entry
+    return None
+
+
+def _get_store_key(
+    course_id: str, assignment_id: str, submission_id: str, path: pathlib.Path
+) -> str:
+    return f"{course_id}/{assignment_id}/{submission_id}/{path.name}"
+
+
+def _get_targets(
+    course_id: str,
+    assignment_id: str,
+    submissions: Mapping[str, list[str]],
+    directory: str | os.PathLike,
+    layout: str,
+) -> dict[tuple[str, int], pathlib.Path]:
+    """Path to save each file at, by (submission ID, position of its link). A link listed
+    twice in one submission is saved to two files, like two links to files of the same
+    name"""
+    directory = pathlib.Path(directory).expanduser()
+    targets = {}
+    for submission_id, urls in submissions.items():
+        submission_directory = directory / layout.format(
+            course_id=course_id,
+            assignment_id=assignment_id,
+            submission_id=submission_id,
+        )
+        names = set()
+        for index, url in enumerate(urls):
+            name = _get_file_name(url, index)
+            # files with the same name in one submission are told apart by their
+            # position, or the next free number if another file already has that name
+            stem, dot, suffix = name.partition(".")
+            number = index
+            while name in names:
+                name = f"{stem}-{number}{dot}{suffix}"
+                number += 1
+            names.add(name)
+            targets[submission_id, index] = submission_directory / name
+    return targets
+
+
+def _get_file_name(url: str, index: int) -> str:
+    """Name of the file at `url`, without any directory part"""
+    name = os.path.basename(urllib.parse.unquote(urllib.parse.urlsplit(url).path))
+    if name in ("", ".", "..") or name.endswith(".part"):
+        return f"file-{index}"
+    return name
+
+
+def _group_by_submission(
+    submissions: Mapping[str, list[str]],
+    targets: dict[tuple[str, int], pathlib.Path],
+    files: BulkResult,
+) -> BulkResult:
+    results = BulkResult()
+    for submission_id in submissions:
+        keys = [key for key in targets if key[0] == submission_id]
+        errors = [files.errors[key] for key in keys if key in files.errors]
+        if errors:
+            results.errors[submission_id] = errors[0]
+        else:
+            results[submission_id] = [files[key] for key in keys]
+    return results
+
+
+def _get_validator_path(part: pathlib.Path) -> pathlib.Path:
+    """File next to a ".part" file, holding the validator (ETag or Last-Modified) of the
+    version of the file it is the start of"""
+    return part.with_name(f"{part.name}.validator")
+
+
+def _get_resume(part: pathlib.Path) -> tuple[int, dict[str, str]]:
+    """
+    Offset to download a file from and headers to send, to resume a ".part" file
+
+    The Range request is conditional on the file being the version the ".part" file is the
+    start of (If-Range): otherwise the file host sends the whole file, which replaces it. A
+    ".part" file without a validator cannot be resumed safely, and is discarded.
+    """
+    validator_path = _get_validator_path(part)
+    if not part.exists():
+        validator_path.unlink(missing_ok=True)
+        return 0, {}
+    validator = (
+        validator_path.read_text(encoding="utf-8").strip()
+        if validator_path.exists()
+        else ""
+    )
+    offset = part.stat().st_size
+    if not validator or not offset:
+        part.unlink()
+        validator_path.unlink(missing_ok=True)
+        return 0, {}
+    return offset, {"Range": f"bytes={offset}-", "If-Range": validator}
+
+
+def _get_validator(response: requests.Response | httpx.Response) -> str | None:
+    """Validator of the version of the file a response is about, usable in If-Range"""
+    etag = response.headers.get("ETag")
+    # weak ETags cannot be used for Range requests
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def _get_remote_file(
+    response: requests.Response | httpx.Response, offset: int
+) -> tuple[int, str | None]:
+    """
+    Size and MD5 checksum (if the ETag is one) of the file a response to a request for
+    its bytes from `offset` on is part of
+
+    Raises:
+        RuntimeError: If the response is an error, or does not start at `offset`.
+    """
+    status_code = response.status_code
+    if status_code == 200:
+        size = int(response.headers.get("Content-Length", -1))
+    elif status_code in (206, 416):
+        # 416: the ".part" file already holds the whole file
+        match = _CONTENT_RANGE.fullmatch(response.headers.get("Content-Range", ""))
+        if match is None or (status_code == 206 and int(match[1]) != offset):
+            raise RuntimeError(f"Unexpected Content-Range from {response.url}")
+        size = int(match[2])
+    else:
+        raise RuntimeError(
+            f"Failed to download {response.url}. Status code: {status_code}"
+        )
+    md5 = _MD5_ETAG.fullmatch(response.headers.get("ETag", ""))
+    return size, md5 and md5[1]
+
+
+def _is_current(path: pathlib.Path, size: int, md5: str | None) -> bool:
+    """Whether the file at `path` has the given size and checksum"""
+    if path.stat().st_size != size:
+        return False
+    return md5 is None or md5_file(path) == md5
+
+
+def _open_part(
+    part: pathlib.Path, resumed: bool, response: requests.Response | httpx.Response
+):
+    """Open a ".part" file to append to, or to write from the start, recording the
+    validator of the file being downloaded so that the next run can resume it"""
+    part.parent.mkdir(parents=True, exist_ok=True)
+    if resumed:
+        return open(part, "ab")
+    validator_path = _get_validator_path(part)
+    validator = _get_validator(response)
+    if validator is None:
+        validator_path.unlink(missing_ok=True)
+    else:
+        validator_path.write_text(validator, encoding="utf-8")
+    return open(part, "wb")
+
+
+def _finish(
+    url: str,
+    part: pathlib.Path,
+    path: pathlib.Path,
+    size: int,
+    md5: str | None,
+    resumed: bool,
+) -> DownloadedFile:
+    """Check a complete ".part" file and move it to `path`"""
+    part_size = part.stat().st_size
+    if size >= 0 and part_size != size:
+        if part_size > size:
+            # left by a download of a larger version of the file
+            _discard_part(part)
+        # an interrupted transfer is resumed by the next run
+        raise RuntimeError(
+            f"Downloaded {part_size} of the {size} bytes of {url}, run again to resume"
+        )
+    if md5 is not None and md5_file(part) != md5:
+        _discard_part(part)
+        raise RuntimeError(f"Checksum of {url} does not match its ETag")
+    os.replace(part, path)
+    _get_validator_path(part).unlink(missing_ok=True)
+    return DownloadedFile(url, path, part_size, resumed=resumed)
+
+
+def _discard_part(part: pathlib.Path):
+    part.unlink()
+    _get_validator_path(part).unlink(missing_ok=True)
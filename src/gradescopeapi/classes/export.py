@@ -0,0 +1,308 @@
+"""Export of scraped results to CSV, JSON Lines, Arrow, Parquet and pandas.
+
+The exporters take the results of the library as they are returned: lists of `Member`,
+`Assignment` or `Course` objects, dicts of them (e.g. `get_extensions`, whose keys are
+written to the `key_column` column), or the columnar tables of `tables`. Rows are
+processed in batches of `batch_size`, and the file exporters write each batch before
+reading the next one, so that exporting a `Roster` or `AssignmentTable` to a file takes
+constant memory. Tables are read column by column, without building their rows.
+
+The main functions in this module are:
+- `to_csv`, `to_jsonl`: Write rows to a text file. Dates are written in ISO 8601.
+- `to_parquet`: Write rows to a Parquet file. Requires pyarrow (`pip install gradescopeapi[arrow]`).
+- `to_arrow`: Convert rows to a `pyarrow.Table`. Requires pyarrow.
+- `to_dataframe`: Convert rows to a `pandas.DataFrame`. Requires pandas and pyarrow.
+
+Example:
+    from gradescopeapi.classes.export import to_csv
+
+    to_csv(account.get_course_users(course_id), "roster.csv")
+    to_csv(get_extensions(session, course_id, assignment_id), "extensions.csv", key_column="user_id")
+"""
+
+import contextlib
+import csv
+import dataclasses
+import datetime
+import io
+import itertools
+import json
+import os
+import types
+import typing
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+from gradescopeapi.classes.tables import Table
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+DEFAULT_BATCH_SIZE = 10_000
+
+Rows = Iterable | Mapping | Table
+
+
+def to_csv(
+    rows: Rows,
+    file: str | os.PathLike | io.TextIOBase,
+    key_column: str = "key",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Write rows to a CSV file, with a header line of column names
+
+    Args:
+        rows (Rows): Dataclass objects, a dict of them, or a `Table`.
+        file (str | os.PathLike | io.TextIOBase): Path of the file, or a text file opened
+            with newline="".
+        key_column (str): Column of the keys, when rows is a dict. Defaults to "key".
+        batch_size (int): Rows read at a time. Defaults to 10,000.
+
+    Returns:
+        int: Number of rows written.
+    """
+    with _open_text(file) as text_file:
+        writer = csv.writer(text_file)
+        num_rows = 0
+        for columns, batch in _iter_batches(rows, key_column, batch_size):
+            if num_rows == 0:
+                writer.writerow(columns)
+            values = [[_to_text(value) for value in batch[name]] for name in columns]
+            writer.writerows(zip(*values))
+            num_rows += len(values[0])
+        return num_rows
+
+
+def to_jsonl(
+    rows: Rows,
+    file: str | os.PathLike | io.TextIOBase,
+    key_column: str = "key",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Write rows to a JSON Lines file, one JSON object per row
+
+    Args:
+        rows (Rows): Dataclass objects, a dict of them, or a `Table`.
+        file (str | os.PathLike | io.TextIOBase): Path of the file, or a text file.
+        key_column (str): Column of the keys, when rows is a dict. Defaults to "key".
+        batch_size (int): Rows read at a time. Defaults to 10,000.
+
+    Returns:
+        int: Number of rows written.
+    """
+    with _open_text(file) as text_file:
+        num_rows = 0
+        for columns, batch in _iter_batches(rows, key_column, batch_size):
+            values = [[_to_json(value) for value in batch[name]] for name in columns]
+            for row in zip(*values):
+                text_file.write(json.dumps(dict(zip(columns, row))))
+                text_file.write("\n")
+            num_rows += len(values[0])
+        return num_rows
+
+
+def to_arrow(
+    rows: Rows, key_column: str = "key", batch_size: int = DEFAULT_BATCH_SIZE
+) -> "pyarrow.Table":
+    """
+    Convert rows to a `pyarrow.Table`. Dates are converted to UTC timestamps.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    schema = _arrow_schema(rows, key_column)
+    batches = [
+        _record_batch(columns, batch, schema)
+        for columns, batch in _iter_batches(rows, key_column, batch_size)
+    ]
+    if not batches and schema is None:
+        return pyarrow.table({})
+    return pyarrow.Table.from_batches(batches, schema)
+
+
+def to_parquet(
+    rows: Rows,
+    file: str | os.PathLike,
+    key_column: str = "key",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Write rows to a Parquet file, one row group per batch. Dates are written as UTC
+    timestamps.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    schema = _arrow_schema(rows, key_column)
+    num_rows = 0
+    writer = None
+    try:
+        for columns, batch in _iter_batches(rows, key_column, batch_size):
+            record_batch = _record_batch(columns, batch, schema)
+            if writer is None:
+                # without type hints, the first batch gives the schema
+                schema = record_batch.schema
+                writer = pyarrow.parquet.ParquetWriter(file, schema)
+            writer.write_batch(record_batch)
+            num_rows += record_batch.num_rows
+        if writer is None:
+            writer = pyarrow.parquet.ParquetWriter(file, schema or pyarrow.schema([]))
+    finally:
+        if writer is not None:
+            writer.close()
+    return num_rows
+
+
+def to_dataframe(rows: Rows, key_column: str = "key"):
+    """
+    Convert rows to a `pandas.DataFrame`, e.g. `to_dataframe(account.get_course_users(course_id))`
+
+    Raises:
+        ImportError: If pandas or pyarrow is not installed.
+    """
+    return to_arrow(rows, key_column).to_pandas()
+
+
+def _iter_batches(
+    rows: Rows, key_column: str, batch_size: int
+) -> Iterator[tuple[list[str], dict[str, list]]]:
+    """Yield the column names and a batch of values per column, until rows run out"""
+    if isinstance(rows, Table):
+        columns = list(rows.columns)
+        for start in range(0, len(rows), batch_size):
+            yield (
+                columns,
+                {
+                    name: rows.column(name, start, start + batch_size)
+                    for name in columns
+                },
+            )
+        return
+
+    items = iter(rows.items() if isinstance(rows, Mapping) else rows)
+    while batch := list(itertools.islice(items, batch_size)):
+        if isinstance(rows, Mapping):
+            keys, values = zip(*batch)
+            columns = [key_column, *_field_names(values[0])]
+            yield (
+                columns,
+                {
+                    key_column: list(keys),
+                    **{
+                        name: [getattr(value, name) for value in values]
+                        for name in columns[1:]
+                    },
+                },
+            )
+        else:
+            columns = _field_names(batch[0])
+            yield (
+                columns,
+                {name: [getattr(row, name) for row in batch] for name in columns},
+            )
+
+
+def _field_names(row) -> list[str]:
+    return [field.name for field in dataclasses.fields(row)]
+
+
+@contextlib.contextmanager
+def _open_text(file: str | os.PathLike | io.TextIOBase):
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "w", newline="", encoding="utf-8") as text_file:
+            yield text_file
+    else:
+        yield file
+
+
+def _to_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def _to_json(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def _arrow_schema(rows: Rows, key_column: str) -> "pyarrow.Schema | None":
+    """Schema of the rows from the type hints of their dataclass, None if unknown"""
+    if pyarrow is None:
+        raise ImportError("pyarrow is required: pip install gradescopeapi[arrow]")
+
+    if isinstance(rows, Table):
+        row_type = rows.row_type
+    elif isinstance(rows, Mapping):
+        row_type = type(next(iter(rows.values()), None))
+    elif isinstance(rows, Sequence) and rows:
+        # an iterator can not be peeked at without losing its first row
+        row_type = type(rows[0])
+    else:
+        return None
+    if not dataclasses.is_dataclass(row_type):
+        return None
+
+    fields = (
+        [pyarrow.field(key_column, pyarrow.string())]
+        if isinstance(rows, Mapping)
+        else []
+    )
+    for field in dataclasses.fields(row_type):
+        field_type = _arrow_type(field.type)
+        if field_type is None:
+            return None
+        fields.append(pyarrow.field(field.name, field_type))
+    return pyarrow.schema(fields)
+
+
+def _arrow_type(annotation) -> "pyarrow.DataType | None":
+    # optional values, e.g. "int | None"
+    if isinstance(annotation, types.UnionType) or (
+        typing.get_origin(annotation) is typing.Union
+    ):
+        annotation = next(
+            (arg for arg in typing.get_args(annotation) if arg is not type(None)),
+            None,
+        )
+    return {
+        str: pyarrow.string(),
+        int: pyarrow.int64(),
+        float: pyarrow.float64(),
+        bool: pyarrow.bool_(),
+        datetime.datetime: pyarrow.timestamp("us", tz="UTC"),
+    }.get(annotation)
+
+
+def _record_batch(
+    columns: list[str], batch: dict[str, list], schema: "pyarrow.Schema | None"
+) -> "pyarrow.RecordBatch":
+    arrays = []
+    for name in columns:
+        values = batch[name]
+        if any(isinstance(value, datetime.datetime) for value in values):
+            values = [_to_utc(value) for value in values]
+        field_type = schema.field(name).type if schema is not None else None
+        arrays.append(pyarrow.array(values, type=field_type))
+    if schema is not None:
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+    return pyarrow.RecordBatch.from_arrays(arrays, names=columns)
+
+
+def _to_utc(value: datetime.datetime | None) -> datetime.datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # dates without time zone are taken as UTC
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
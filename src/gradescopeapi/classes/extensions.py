@@ -8,26 +8,37 @@ The main functions in this module are:
 - `get_extensions`: Retrieves all extensions for a specific assignment.
 - `update_student_extension`: Updates the extension for a specific student on an assignment.
 - `remove_student_extension`: Removes the extension for a specific student.
+
+`get_extensions_async` and `update_student_extension_async` are the asyncio counterparts,
+taking an `httpx.AsyncClient` instead of a `requests.Session`.
 """
 
 import datetime
-import json
-import zoneinfo
+import re
 from dataclasses import dataclass
 
-import dateutil.parser
+import httpx
 import requests
-from bs4 import BeautifulSoup
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes._helpers._dates import get_timezone, parse_datetime
+from gradescopeapi.classes.cache import parse_response
+from gradescopeapi.classes.parsing import find_react_props
+from gradescopeapi.classes.result_store import stored_result, stored_result_async
+
+# start tag of the table containing the extensions, and the end of a table
+_EXTENSIONS_TABLE = re.compile(
+    r"<table\b[^>]*\bjs-overridesTable\b[^>]*>", re.IGNORECASE
+)
+_TABLE_END = re.compile(r"</table\s*>", re.IGNORECASE)
 
 
-@dataclass
+@dataclass(slots=True)
 class Extension:
     name: str
-    release_date: datetime.datetime
-    due_date: datetime.datetime
-    late_due_date: datetime.datetime
+    release_date: datetime.datetime | None
+    due_date: datetime.datetime | None
+    late_due_date: datetime.datetime | None
     delete_path: str
 
 
@@ -58,82 +69,116 @@ def get_extensions(
     """
 
     GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
-    GS_EXTENSIONS_TABLE_CSS_CLASSES = (
-        "table js-overridesTable"  # Table containing extensions
-    )
 
-    # get the extensions from the page
-    response = session.get(GS_EXTENSIONS_ENDPOINT)
+    def fetch() -> dict[str, Extension]:
+        # get the extensions from the page
+        response = session.get(GS_EXTENSIONS_ENDPOINT)
 
-    # check if the request was successful
-    if response.status_code != 200:
-        raise RuntimeError(
-            f"Failed to get extensions for assignment {assignment_id}. Status code: {response.status_code}"
-        )
+        # check if the request was successful
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Failed to get extensions for assignment {assignment_id}. Status code: {response.status_code}"
+            )
+
+        # parse the extensions from the html response (unless it did not change)
+        return parse_response(session, "extensions", response, parse_extensions_page)
+
+    # a result saved by an earlier call is reused while fresh (see `result_store`)
+    return stored_result(session, "extensions", GS_EXTENSIONS_ENDPOINT, fetch)
+
+
+async def get_extensions_async(
+    client: httpx.AsyncClient,
+    course_id: str,
+    assignment_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> dict:
+    """Get all extensions for an assignment, without blocking the event loop.
+
+    Same as `get_extensions`, but uses an `httpx.AsyncClient` for the request.
+
+    Raises:
+        RuntimeError: If the request to get extensions fails.
+    """
+    GS_EXTENSIONS_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions"
+
+    async def fetch() -> dict[str, Extension]:
+        response = await client.get(GS_EXTENSIONS_ENDPOINT)
+
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Failed to get extensions for assignment {assignment_id}. Status code: {response.status_code}"
+            )
 
-    # parse the html response
-    extensions_soup = BeautifulSoup(response.text, "html.parser")
+        return parse_response(client, "extensions", response, parse_extensions_page)
 
-    extensions_table = extensions_soup.find(
-        "table", class_=GS_EXTENSIONS_TABLE_CSS_CLASSES
+    return await stored_result_async(
+        client, "extensions", GS_EXTENSIONS_ENDPOINT, fetch
     )
 
+
+def parse_extensions_page(extensions_html: str) -> dict[str, Extension]:
+    """Parse all extensions from the HTML of the extensions page of an assignment.
+
+    Only the EditExtension components in the table of extensions are parsed, not the
+    whole page.
+
+    Args:
+        extensions_html (str): HTML of the extensions page.
+
+    Returns:
+        dict: A dictionary containing the extensions, where the keys are user IDs and the values are Extension objects.
+    """
+    table = _EXTENSIONS_TABLE.search(extensions_html)
+    if table is None:
+        return {}
+    table_end = _TABLE_END.search(extensions_html, table.end())
+    extensions_table = extensions_html[
+        table.start() : len(extensions_html) if table_end is None else table_end.end()
+    ]
+
     extensions = {}
+    for user_properties in find_react_props(extensions_table, "EditExtension"):
+        user_id, extension = _parse_extension(user_properties)
+        extensions[user_id] = extension
+    return extensions
 
-    table_body = extensions_table.find("tbody")
-    for row in table_body.find_all("tr"):
-        # find relevant data
-        user_properties = row.find("div", {"data-react-class": "EditExtension"}).get(
-            "data-react-props"
-        )
-        user_properties = json.loads(user_properties)
 
-        # user id
-        user_id = str(user_properties["override"]["user_id"])  # TODO: keep as int?
+def _parse_extension(user_properties: dict) -> tuple[str, Extension]:
+    """Parse the props of the EditExtension component of a student"""
+    # user id
+    user_id = str(user_properties["override"]["user_id"])  # TODO: keep as int?
 
-        # timezone
-        timezone = zoneinfo.ZoneInfo(user_properties["timezone"]["identifier"])
+    # timezone
+    timezone = get_timezone(user_properties["timezone"]["identifier"])
 
-        # extension properties
-        extension_info = user_properties["override"]["settings"]
-        release_date = extension_info.get("release_date", {}).get("value", None)
-        due_date = extension_info.get("due_date", {}).get("value", None)
-        late_due_date = extension_info.get("hard_due_date", {}).get("value", None)
+    # extension properties
+    extension_info = user_properties["override"]["settings"]
+    release_date = extension_info.get("release_date", {}).get("value", None)
+    due_date = extension_info.get("due_date", {}).get("value", None)
+    late_due_date = extension_info.get("hard_due_date", {}).get("value", None)
 
-        # convert dates to datetime objects
-        release_date = (
-            dateutil.parser.parse(release_date).replace(tzinfo=timezone)
-            if release_date
-            else None
-        )
-        due_date = (
-            dateutil.parser.parse(due_date).replace(tzinfo=timezone)
-            if due_date
-            else None
-        )
-        late_due_date = (
-            dateutil.parser.parse(late_due_date).replace(tzinfo=timezone)
-            if late_due_date
-            else None
-        )
+    # convert dates to datetime objects
+    release_date = parse_datetime(release_date, timezone)
+    due_date = parse_datetime(due_date, timezone)
+    late_due_date = parse_datetime(late_due_date, timezone)
 
-        # delete path
-        delete_path = user_properties["deletePath"]
+    # delete path
+    delete_path = user_properties["deletePath"]
 
-        # name
-        name = user_properties["studentName"]
+    # name
+    name = user_properties["studentName"]
 
-        # create extension object
-        extension = Extension(
-            name=name,
-            release_date=release_date,
-            due_date=due_date,
-            late_due_date=late_due_date,
-            delete_path=delete_path,
-        )
-        extensions[user_id] = extension
+    # create extension object
+    extension = Extension(
+        name=name,
+        release_date=release_date,
+        due_date=due_date,
+        late_due_date=late_due_date,
+        delete_path=delete_path,
+    )
 
-    return extensions
+    return user_id, extension
 
 
 def update_student_extension(
@@ -178,6 +223,51 @@ def update_student_extension(
         ValueError: If the dates are not in order
     """
 
+    body = _get_extension_body(user_id, release_date, due_date, late_due_date)
+
+    # send the request
+    resp = session.post(
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions",
+        json=body,
+    )
+    return resp.status_code == 200
+
+
+async def update_student_extension_async(
+    client: httpx.AsyncClient,
+    course_id: str,
+    assignment_id: str,
+    user_id: str,
+    release_date: datetime.datetime | None = None,
+    due_date: datetime.datetime | None = None,
+    late_due_date: datetime.datetime | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> bool:
+    """Updates the extension for a student on an assignment, without blocking the event loop.
+
+    Same as `update_student_extension`, but uses an `httpx.AsyncClient` for the request.
+
+    Raises:
+        ValueError: If no dates are provided
+        ValueError: If the dates are not in order
+    """
+    body = _get_extension_body(user_id, release_date, due_date, late_due_date)
+
+    resp = await client.post(
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions",
+        json=body,
+    )
+    return resp.status_code == 200
+
+
+def _get_extension_body(
+    user_id: str,
+    release_date: datetime.datetime | None,
+    due_date: datetime.datetime | None,
+    late_due_date: datetime.datetime | None,
+) -> dict:
+    """Validate the extension dates and build the JSON body for the POST request"""
+
     # Check if at least 1 date is set
     if release_date is None and due_date is None and late_due_date is None:
         raise ValueError("At least one date must be provided")
@@ -216,12 +306,7 @@ def update_student_extension(
         if extension_datetime is not None:
             add_to_body(extension_name, extension_datetime)
 
-    # send the request
-    resp = session.post(
-        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/extensions",
-        json=body,
-    )
-    return resp.status_code == 200
+    return body
 
 
 def remove_student_extension(
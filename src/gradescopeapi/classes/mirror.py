@@ -0,0 +1,362 @@
+"""Local mirror of course data in SQLite, for answering questions without scraping.
+
+A `CourseMirror` keeps normalized tables of the courses of an account and of the members,
+assignments, extensions, submissions and graders of the courses it is asked to sync. They
+are filled by the methods of `Account`, and can be queried with SQL (`CourseMirror.query`)
+or with the methods answering common questions, e.g. `expiring_extensions`, in
+milliseconds and without any request to Gradescope.
+
+Syncing a course fetches all its data before changing the mirror, then replaces the rows of
+every table whose content changed in a single transaction: readers never see a course half
+synced, and tables that did not change are left untouched. Run `sync_course` on a schedule
+to keep the mirror up to date; connections with a `cache` or `result_store` make the
+fetches cheaper.
+
+Tables (dates are ISO 8601 text in UTC, e.g. "2024-04-15T04:00:00+00:00"):
+- courses(course_id, role, name, full_name, semester, year, num_grades_published,
+  num_assignments): role is "instructor" or "student".
+- members(course_id, user_id, full_name, first_name, last_name, sid, email, role,
+  num_submissions, sections)
+- assignments(course_id, assignment_id, name, release_date, due_date, late_due_date,
+  submissions_status, grade, max_grade)
+- extensions(course_id, assignment_id, user_id, name, release_date, due_date,
+  late_due_date, delete_path)
+- submissions(course_id, assignment_id, submission_id, student_name)
+- graders(course_id, question_id, grader)
+- syncs(course_id, table_name, digest, synced_at): when each table of a course was last
+  synced, and a hash of its rows.
+
+Example:
+    mirror = CourseMirror("~/.gradescope/mirror.db")
+    mirror.sync_course(connection.account, course_id)
+    mirror.expiring_extensions(datetime.timedelta(hours=24))
+"""
+
+import datetime
+import hashlib
+import os
+import pathlib
+import sqlite3
+import threading
+from collections.abc import Iterable
+
+from gradescopeapi.classes.account import Account
+from gradescopeapi.classes.extensions import get_extensions
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    course_id TEXT PRIMARY KEY, role TEXT NOT NULL, name TEXT, full_name TEXT,
+    semester TEXT, year TEXT, num_grades_published INTEGER, num_assignments INTEGER
+);
+CREATE TABLE IF NOT EXISTS members (
+    course_id TEXT NOT NULL, user_id TEXT NOT NULL, full_name TEXT, first_name TEXT,
+    last_name TEXT, sid TEXT, email TEXT, role TEXT, num_submissions INTEGER,
+    sections TEXT, PRIMARY KEY (course_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    course_id TEXT NOT NULL, assignment_id TEXT NOT NULL, name TEXT, release_date TEXT,
+    due_date TEXT, late_due_date TEXT, submissions_status TEXT, grade REAL,
+    max_grade REAL, PRIMARY KEY (course_id, assignment_id)
+);
+CREATE TABLE IF NOT EXISTS extensions (
+    course_id TEXT NOT NULL, assignment_id TEXT NOT NULL, user_id TEXT NOT NULL,
+    name TEXT, release_date TEXT, due_date TEXT, late_due_date TEXT, delete_path TEXT,
+    PRIMARY KEY (course_id, assignment_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS submissions (
+    course_id TEXT NOT NULL, assignment_id TEXT NOT NULL, submission_id TEXT NOT NULL,
+    student_name TEXT, PRIMARY KEY (course_id, assignment_id, submission_id)
+);
+CREATE TABLE IF NOT EXISTS graders (
+    course_id TEXT NOT NULL, question_id TEXT NOT NULL, grader TEXT NOT NULL,
+    PRIMARY KEY (course_id, question_id, grader)
+);
+CREATE TABLE IF NOT EXISTS syncs (
+    course_id TEXT NOT NULL, table_name TEXT NOT NULL, digest TEXT NOT NULL,
+    synced_at TEXT NOT NULL, PRIMARY KEY (course_id, table_name)
+);
+CREATE INDEX IF NOT EXISTS extensions_due_date ON extensions (due_date);
+CREATE INDEX IF NOT EXISTS assignments_due_date ON assignments (due_date);
+"""
+
+# tables holding the data of a single course, synced by `sync_course`
+COURSE_TABLES = ("members", "assignments", "extensions", "submissions", "graders")
+
+
+class CourseMirror:
+    """Mirror of course data in a SQLite database, created with permissions 0600.
+
+    The mirror can be used from several threads, and read by other processes (e.g. a
+    dashboard) while it is being synced.
+
+    Args:
+        path (str | os.PathLike): File of the database, created if it does not exist.
+            ":memory:" keeps the mirror in memory.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        if path != ":memory:":
+            path = pathlib.Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # create the file first, so that it is only readable by the current user
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+    def sync_courses(self, account: Account) -> bool:
+        """
+        Mirror the list of courses of the account
+
+        Returns:
+            bool: Whether the list changed since the last sync.
+        """
+        rows = [
+            (
+                course_id,
+                role,
+                course.name,
+                course.full_name,
+                course.semester,
+                course.year,
+                course.num_grades_published,
+                course.num_assignments,
+            )
+            for role, courses in account.get_courses().items()
+            for course_id, course in courses.items()
+        ]
+        with self._lock, self._db:
+            return self._replace("", "courses", rows)
+
+    def sync_course(
+        self,
+        account: Account,
+        course_id: str,
+        question_ids: Iterable[str] = (),
+    ) -> set[str]:
+        """
+        Mirror the members, assignments, extensions and submissions of a course
+
+        Extensions and submissions are only visible to the staff of the course.
+
+        Args:
+            account (Account): Account of a staff member of the course.
+            course_id (str): The ID of the course.
+            question_ids (Iterable[str]): Questions whose graders are mirrored too. Defaults
+                to none.
+
+        Returns:
+            set[str]: Names of the tables whose rows of the course changed.
+
+        Raises:
+            Exception: Errors of the requests to Gradescope, such as the one that prevented
+                fetching the roster, are raised as they are. Nothing is changed in the
+                mirror when an error is raised.
+        """
+        members = account._get_course_members(course_id)
+        assignments = account.get_assignments(course_id)
+
+        extensions = []
+        submissions = []
+        for assignment in assignments:
+            assignment_id = assignment.assignment_id
+            for user_id, extension in get_extensions(
+                account.session, course_id, assignment_id, account.gradescope_base_url
+            ).items():
+                extensions.append(
+                    (
+                        course_id,
+                        assignment_id,
+                        user_id,
+                        extension.name,
+                        _to_sql_date(extension.release_date),
+                        _to_sql_date(extension.due_date),
+                        _to_sql_date(extension.late_due_date),
+                        extension.delete_path,
+                    )
+                )
+            for submission_id, student_name in account.get_submission_students(
+                course_id, assignment_id
+            ).items():
+                submissions.append(
+                    (course_id, assignment_id, submission_id, student_name)
+                )
+
+        graders = [
+            (course_id, question_id, grader)
+            for question_id in question_ids
+            for grader in sorted(account.get_assignment_graders(course_id, question_id))
+        ]
+
+        tables = {
+            "members": [
+                (
+                    course_id,
+                    member.id,
+                    member.full_name,
+                    member.first_name,
+                    member.last_name,
+                    member.sid,
+                    member.email,
+                    member.role,
+                    member.num_submissions,
+                    member.sections,
+                )
+                for member in members
+            ],
+            "assignments": [
+                (
+                    course_id,
+                    assignment.assignment_id,
+                    assignment.name,
+                    _to_sql_date(assignment.release_date),
+                    _to_sql_date(assignment.due_date),
+                    _to_sql_date(assignment.late_due_date),
+                    assignment.submissions_status,
+                    assignment.grade,
+                    assignment.max_grade,
+                )
+                for assignment in assignments
+            ],
+            "extensions": extensions,
+            "submissions": submissions,
+            "graders": graders,
+        }
+        with self._lock, self._db:
+            return {
+                table
+                for table, rows in tables.items()
+                if self._replace(course_id, table, rows)
+            }
+
+    def _replace(self, course_id: str, table: str, rows: list[tuple]) -> bool:
+        """Replace the rows of a course in a table, unless they did not change. Must be
+        called in a transaction."""
+        digest = hashlib.blake2b(repr(rows).encode(), digest_size=16).hexdigest()
+        previous = self._db.execute(
+            "SELECT digest FROM syncs WHERE course_id = ? AND table_name = ?",
+            (course_id, table),
+        ).fetchone()
+        now = _to_sql_date(datetime.datetime.now(datetime.timezone.utc))
+        self._db.execute(
+            "INSERT OR REPLACE INTO syncs VALUES (?, ?, ?, ?)",
+            (course_id, table, digest, now),
+        )
+        if previous is not None and previous["digest"] == digest:
+            return False
+
+        if table == "courses":
+            self._db.execute("DELETE FROM courses")
+        else:
+            self._db.execute(f"DELETE FROM {table} WHERE course_id = ?", (course_id,))
+        if rows:
+            placeholders = ", ".join("?" * len(rows[0]))
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", rows
+            )
+        return True
+
+    def query(self, sql: str, params: tuple | dict = ()) -> list[dict]:
+        """
+        Run a SQL query on the mirror, e.g.
+        `mirror.query("SELECT email FROM members WHERE course_id = ?", (course_id,))`
+
+        Returns:
+            list[dict]: The rows of the result, as dicts mapping column names to values.
+        """
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params)]
+
+    def synced_at(self, course_id: str) -> datetime.datetime | None:
+        """When a course was last synced, None if it never was"""
+        rows = self.query(
+            "SELECT MIN(synced_at) AS synced_at FROM syncs WHERE course_id = ?",
+            (course_id,),
+        )
+        synced_at = rows[0]["synced_at"]
+        return None if synced_at is None else datetime.datetime.fromisoformat(synced_at)
+
+    def students_without_submissions(
+        self, course_id: str, start: datetime.datetime, end: datetime.datetime
+    ) -> list[dict]:
+        """
+        Get the students of a course who submitted nothing to the assignments due between
+        `start` (included) and `end` (excluded), e.g. this week
+
+        Submissions are matched to students by name, as assignment pages list them.
+
+        Returns:
+            list[dict]: Rows of the members table.
+        """
+        return self.query(
+            """
+            SELECT * FROM members AS m
+            WHERE m.course_id = :course_id AND m.role = 'Student' AND NOT EXISTS (
+                SELECT 1 FROM submissions AS s JOIN assignments AS a
+                    ON a.course_id = s.course_id AND a.assignment_id = s.assignment_id
+                WHERE s.course_id = m.course_id AND s.student_name = m.full_name
+                    AND a.due_date >= :start AND a.due_date < :end
+            )
+            ORDER BY m.full_name
+            """,
+            {
+                "course_id": course_id,
+                "start": _to_sql_date(start),
+                "end": _to_sql_date(end),
+            },
+        )
+
+    def expiring_extensions(
+        self,
+        within: datetime.timedelta = datetime.timedelta(hours=24),
+        now: datetime.datetime | None = None,
+        course_id: str | None = None,
+    ) -> list[dict]:
+        """
+        Get the extensions whose due date falls within `within` from `now`
+
+        Args:
+            within (datetime.timedelta): Defaults to 24 hours.
+            now (datetime.datetime | None): Defaults to the current time.
+            course_id (str | None): Only get extensions of this course. Defaults to all.
+
+        Returns:
+            list[dict]: Rows of the extensions table, with the name of their assignment as
+            "assignment_name", soonest first.
+        """
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc)
+        return self.query(
+            """
+            SELECT e.*, a.name AS assignment_name FROM extensions AS e
+            LEFT JOIN assignments AS a
+                ON a.course_id = e.course_id AND a.assignment_id = e.assignment_id
+            WHERE e.due_date >= :start AND e.due_date < :end
+                AND (:course_id IS NULL OR e.course_id = :course_id)
+            ORDER BY e.due_date, e.course_id, e.assignment_id
+            """,
+            {
+                "start": _to_sql_date(now),
+                "end": _to_sql_date(now + within),
+                "course_id": course_id,
+            },
+        )
+
+
+def _to_sql_date(value: datetime.datetime | None) -> str | None:
+    """Dates are stored in UTC, so that comparing their text compares them"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # dates without time zone are taken as UTC
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,166 @@
+"""HTML parser backend of the scraping helpers.
+
+Pages scraped by this library go through `make_soup`, which builds a BeautifulSoup tree
+with the fastest parser installed: lxml (`pip install gradescopeapi[fast]`, a C library
+several times faster on large roster and course pages) when available, else Python's
+html.parser. The helpers only use the BeautifulSoup API, so they return the same objects
+with either parser.
+
+Pages whose data is all in the `data-react-props` JSON of React components (the
+instructor's assignments table, the extensions page) skip the tree: `find_react_props`
+jumps straight to the components' tags and only parses their attributes.
+
+Example:
+    from gradescopeapi.classes import parsing
+
+    parsing.set_parser("html.parser")  # e.g. to rule out a parser difference
+"""
+
+import html
+import json
+import re
+
+import bs4
+from bs4 import BeautifulSoup
+
+# supported parsers, fastest first
+PARSERS = ("lxml", "html.parser")
+
+_parser: str | None = None
+
+
+def available_parsers() -> list[str]:
+    """Return the supported parsers that are installed, fastest first"""
+    return [parser for parser in PARSERS if bs4.builder.builder_registry.lookup(parser)]
+
+
+def get_parser() -> str:
+    """Return the parser used by `make_soup`"""
+    global _parser
+    if _parser is None:
+        _parser = available_parsers()[0]
+    return _parser
+
+
+def set_parser(parser: str | None):
+    """
+    Choose the parser used by `make_soup`
+
+    Args:
+        parser (str | None): One of `PARSERS`, or None to use the fastest one installed.
+
+    Raises:
+        ValueError: If the parser is not supported or not installed.
+    """
+    global _parser
+    if parser is not None and parser not in available_parsers():
+        raise ValueError(
+            f"Unavailable HTML parser: {parser}. Available parsers: {available_parsers()}"
+        )
+    _parser = parser
+
+
+def make_soup(markup: str | bytes) -> BeautifulSoup:
+    """Parse an HTML page with the chosen parser"""
+    return BeautifulSoup(markup, get_parser())
+
+
+_REACT_CLASS_ATTRIBUTE = re.compile("data-react-class", re.IGNORECASE)
+# spans the parsers find no tags in: comments, and the raw text of scripts and styles
+_SKIPPED_SPAN = re.compile(r"<!--|<(script|style)(?=[\s/>])", re.IGNORECASE)
+# a start tag, whose attribute values may contain ">" when quoted
+_START_TAG = re.compile(
+    r"""<[a-zA-Z][^\s/>]*((?:\s+[^\s"'=/>]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>]+))?)*)\s*/?>"""
+)
+_ATTRIBUTE = re.compile(
+    r"""([^\s"'=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?"""
+)
+
+
+def find_react_props(
+    markup: str, react_class: str, limit: int | None = None
+) -> list[dict]:
+    """
+    Find the props of the React components of a class rendered in a page, without parsing
+    the rest of the page
+
+    Args:
+        markup (str): HTML of the page.
+        react_class (str): Value of the components' `data-react-class` attribute.
+        limit (int | None): Stop after this many components. Defaults to None (all of them).
+
+    Returns:
+        list[dict]: The decoded `data-react-props` of the components, in page order.
+    """
+    props = []
+    position = 0
+    while limit is None or len(props) < limit:
+        candidate = _REACT_CLASS_ATTRIBUTE.search(markup, position)
+        if candidate is None:
+            break
+        tag_start = markup.rfind("<", 0, candidate.start())
+        tag = _START_TAG.match(markup, tag_start)
+        in_tag = tag is not None and tag.end() > candidate.start()
+        # the candidate may be in a comment or a script: look again after its end
+        skipped = _SKIPPED_SPAN.search(
+            markup, position, tag_start if in_tag else candidate.start()
+        )
+        if skipped is not None:
+            position = _skip_span(markup, skipped)
+            continue
+        if not in_tag:
+            position = candidate.end()
+            continue
+        attributes = _parse_attributes(tag.group(1))
+        if (
+            attributes.get("data-react-class") == react_class
+            and "data-react-props" in attributes
+        ):
+            props.append(json.loads(attributes["data-react-props"]))
+        position = tag.end()
+        raw_text = _SKIPPED_SPAN.match(markup, tag_start)
+        if raw_text is not None:
+            # the component is a script or a style: its content is raw text
+            position = _skip_span(markup, raw_text, position)
+    return props
+
+
+def _skip_span(markup: str, span: re.Match, content_start: int | None = None) -> int:
+    """Position after a comment, or after the raw text of a script or style element"""
+    if span.group(1) is None:
+        end = markup.find("-->", span.end())
+        return len(markup) if end < 0 else end + 3
+    if content_start is None:
+        tag = _START_TAG.match(markup, span.start())
+        content_start = span.end() if tag is None else tag.end()
+    end = re.compile(rf"</{span.group(1)}(?=[\s/>])", re.IGNORECASE).search(
+        markup, content_start
+    )
+    return len(markup) if end is None else end.end()
+
+
+def _parse_attributes(attributes: str) -> dict[str, str]:
+    """Attributes of a start tag, as html.parser and lxml see them"""
+    parsed = {}
+    for name, double_quoted, single_quoted, unquoted in _ATTRIBUTE.findall(attributes):
+        # the first of repeated attributes wins
+        parsed.setdefault(
+            name.lower(), _unescape(double_quoted or single_quoted or unquoted)
+        )
+    return parsed
+
+
+def _unescape(value: str) -> str:
+    """`html.unescape`, fast for the few entities Rails escapes attribute values with"""
+    if "&" not in value:
+        return value
+    unescaped = (
+        value.replace("&quot;", '"')
+        .replace("&#39;", "'")
+        .replace("&lt;", "<")
+        .replace("&gt;", ">")
+    )
+    if unescaped.count("&") != unescaped.count("&amp;"):
+        # other entities
+        return html.unescape(value)
+    return unescaped.replace("&amp;", "&")
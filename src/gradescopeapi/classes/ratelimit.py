@@ -0,0 +1,197 @@
+"""Rate limiters for requests made to Gradescope.
+
+Every request a `GSConnection` (or `AsyncGSConnection`) makes to Gradescope first takes a
+token from the connection's rate limiter, and reports its outcome back to it afterwards.
+
+The main classes in this module are:
+- `RateLimiter`: Base class and "no limit" implementation. Subclass it to plug in your own policy.
+- `TokenBucketRateLimiter`: Fixed average rate, with bursts up to the bucket size.
+- `AdaptiveRateLimiter`: Token bucket whose rate adapts to how Gradescope is responding (AIMD):
+  it grows slowly while responses are fast and successful, and is cut in half on 429/5xx
+  responses or slow responses. Retry-After headers pause all requests until they expire.
+"""
+
+import email.utils
+import threading
+import time
+
+from gradescopeapi.classes import timeouts
+
+
+class RateLimiter:
+    """Base rate limiter, which does not limit anything."""
+
+    def reserve(self) -> float:
+        """Take a token, returning the number of seconds to wait before using it"""
+        return 0.0
+
+    def acquire(self):
+        """Block the current thread until a request may be sent"""
+        timeouts.sleep(self.reserve())
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be sent"""
+        await timeouts.sleep_async(self.reserve())
+
+    def feedback(
+        self,
+        status_code: int | None,
+        latency: float,
+        retry_after: float | None = None,
+    ):
+        """Report the outcome of a request.
+
+        Args:
+            status_code (int | None): Status code of the response, None if the request failed without one.
+            latency (float): Seconds between sending the request and receiving the response.
+            retry_after (float | None): Seconds to wait requested by a Retry-After header, if any.
+        """
+
+    def stats(self) -> dict:
+        """Current state of the limiter, for monitoring"""
+        return {}
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """Allows `rate` requests per second on average, and bursts of up to `burst` requests."""
+
+    def __init__(self, rate: float, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current rate, in requests per second"""
+        return self._rate
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._last_refill) * self._rate
+        )
+        self._last_refill = now
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # tokens may go negative: each waiting request queues behind the previous ones
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float):
+        """Hold back all requests for `seconds`"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + seconds)
+            # do not let a burst of queued requests through as soon as the pause ends
+            self._tokens = min(self._tokens, 0.0)
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "paused_for": max(0.0, self._paused_until - time.monotonic()),
+        }
+
+
+class AdaptiveRateLimiter(TokenBucketRateLimiter):
+    """Token bucket that adapts its rate with additive increase/multiplicative decrease.
+
+    Args:
+        rate (float): Initial rate, in requests per second. Defaults to 10.
+        min_rate (float): The rate never drops below this. Defaults to 0.5.
+        max_rate (float): The rate never grows above this. Defaults to 50.
+        increase (float): Requests per second added for roughly every second of successful
+            requests. Defaults to 1.
+        decrease (float): Factor applied to the rate on a backoff. Defaults to 0.5.
+        latency_threshold (float): Responses slower than this many seconds count as a
+            sign of overload. Defaults to 2.
+        cooldown (float): Minimum number of seconds between two backoffs, so a burst of
+            failures only backs off once. Defaults to 1.
+        burst (float | None): Bucket size. Defaults to the initial rate.
+
+    Attributes:
+        backoffs (int): Number of times the rate was decreased.
+        throttled (int): Number of 429 responses seen.
+    """
+
+    BACKOFF_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        rate: float = 10,
+        min_rate: float = 0.5,
+        max_rate: float = 50,
+        increase: float = 1,
+        decrease: float = 0.5,
+        latency_threshold: float = 2,
+        cooldown: float = 1,
+        burst: float | None = None,
+    ):
+        super().__init__(rate, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_threshold = latency_threshold
+        self.cooldown = cooldown
+        self.backoffs = 0
+        self.throttled = 0
+        self._last_backoff = float("-inf")
+
+    def feedback(
+        self,
+        status_code: int | None,
+        latency: float,
+        retry_after: float | None = None,
+    ):
+        if status_code == 429:
+            self.throttled += 1
+        if retry_after:
+            self.pause(retry_after)
+
+        overloaded = (
+            status_code is None
+            or status_code in self.BACKOFF_STATUS_CODES
+            or latency > self.latency_threshold
+        )
+        with self._lock:
+            if overloaded:
+                now = time.monotonic()
+                if now - self._last_backoff >= self.cooldown:
+                    self._last_backoff = now
+                    self._refill(now)
+                    self._rate = max(self.min_rate, self._rate * self.decrease)
+                    self.backoffs += 1
+            else:
+                # spread the additive increase over about one second's worth of requests
+                self._rate = min(self.max_rate, self._rate + self.increase / self._rate)
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "backoffs": self.backoffs,
+            "throttled": self.throttled,
+        }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delay in seconds or HTTP date) into seconds to wait"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
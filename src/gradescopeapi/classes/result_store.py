@@ -0,0 +1,345 @@
+"""Durable storage of scraped results, so they can be reused across processes.
+
+A `GSConnection` (or `AsyncGSConnection`) given a `result_store` saves what
+`get_courses`, `get_course_users`, `get_assignments`, `get_extensions` and the submission
+file methods return, along with the time it was fetched. Later calls, in this process or
+another one logged in to the same account, return the saved result without any request
+while it is younger than the store's maximum age for that kind of result, and fetch it
+again otherwise. A job run by cron thus only refetches what went stale since its last run.
+
+Results are saved per Gradescope base URL and account, under the path of the page they
+were scraped from. Write requests to Gradescope drop the results they may change, like
+they drop the pages of a `cache.ResponseCache`, and writes to a course also drop the saved
+courses, which count its assignments. Each saved result records the
+`SCHEMA_VERSION` of its format: results saved in another format are fetched again.
+
+Saved results contain personal data of students (names, emails, IDs): store them like the
+rest of your course data.
+
+The main classes in this module are:
+- `ResultStore`: Base class. Subclass it to keep results elsewhere.
+- `SQLiteResultStore`: Keeps results in a SQLite database, only readable by the current user.
+- `MemoryResultStore`: Keeps results in memory, for the lifetime of the process.
+
+Example:
+    connection = GSConnection(result_store=SQLiteResultStore("~/.gradescope/results.db"))
+    connection.login(email, password)
+    connection.account.get_courses()  # fetched at most once a day
+"""
+
+import dataclasses
+import datetime
+import functools
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections.abc import Awaitable, Callable, Mapping
+from typing import TypeVar
+
+from gradescopeapi.classes._helpers._dates import get_timezone
+from gradescopeapi.classes.cache import is_changed_by_write
+
+T = TypeVar("T")
+
+# path of the page `get_courses` results are saved under
+_ACCOUNT_PATH = "/account"
+
+# version of the format results are saved in, increased whenever it changes
+SCHEMA_VERSION = 1
+
+# seconds results of each kind are reused for. Submission file links expire after a while.
+DEFAULT_MAX_AGES = {
+    "courses": 86400.0,
+    "members": 3600.0,
+    "assignments": 3600.0,
+    "extensions": 600.0,
+    "submission_files": 600.0,
+    "submission_pages": 600.0,
+}
+
+
+@dataclasses.dataclass(slots=True)
+class StoredResult:
+    """A result read back from a store, with the time (`time.time()`) it was fetched at"""
+
+    value: object
+    fetched_at: float
+
+
+class ResultStore:
+    """Base class of result stores: maps (scope, kind, path) keys to saved results.
+
+    Subclasses implement `_load`, `_save`, `_paths` and `_delete`, which handle results
+    already encoded to text by `encode_result`.
+
+    Args:
+        max_ages (Mapping[str, float] | None): Seconds results of each kind (e.g. "members")
+            are reused for. Results of kinds left out are always fetched again. Defaults to
+            `DEFAULT_MAX_AGES`.
+    """
+
+    def __init__(self, max_ages: Mapping[str, float] | None = None):
+        self.max_ages = dict(DEFAULT_MAX_AGES if max_ages is None else max_ages)
+
+    def is_fresh(self, kind: str, result: StoredResult) -> bool:
+        """Whether a saved result of `kind` is young enough to be reused"""
+        return time.time() - result.fetched_at < self.max_ages.get(kind, 0.0)
+
+    def load(self, scope: str, kind: str, path: str) -> StoredResult | None:
+        """Return the result saved under a key, None if there is none or it is in another
+        format"""
+        row = self._load(scope, kind, path)
+        if row is None:
+            return None
+        version, fetched_at, text = row
+        if version != SCHEMA_VERSION:
+            return None
+        try:
+            return StoredResult(decode_result(text), fetched_at)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def save(self, scope: str, kind: str, path: str, value):
+        """Save a result fetched now under a key, replacing any previous one"""
+        self._save(scope, kind, path, time.time(), encode_result(value))
+
+    def invalidate(self, scope: str, url: str):
+        """Drop the results of `scope` that a write request to `url` may change"""
+        # writes outside of courses (e.g. logging in) change no result
+        if not urllib.parse.urlsplit(url).path.startswith("/courses/"):
+            return
+        self._delete(
+            scope,
+            [
+                path
+                for path in self._paths(scope)
+                # the account page counts the assignments of every course
+                if path == _ACCOUNT_PATH or is_changed_by_write(path, url)
+            ],
+        )
+
+    def clear(self, scope: str):
+        """Drop every result of `scope`"""
+        self._delete(scope, self._paths(scope))
+
+    def _load(self, scope: str, kind: str, path: str) -> tuple[int, float, str] | None:
+        """Return the schema version, fetch time and text of a saved result"""
+        raise NotImplementedError
+
+    def _save(self, scope: str, kind: str, path: str, fetched_at: float, text: str):
+        raise NotImplementedError
+
+    def _paths(self, scope: str) -> list[str]:
+        """Return the paths results of `scope` are saved under"""
+        raise NotImplementedError
+
+    def _delete(self, scope: str, paths: list[str]):
+        """Drop the results of `scope` saved under `paths`, of any kind"""
+        raise NotImplementedError
+
+
+class MemoryResultStore(ResultStore):
+    def __init__(self, max_ages: Mapping[str, float] | None = None):
+        super().__init__(max_ages)
+        self._rows: dict[tuple[str, str, str], tuple[int, float, str]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, scope: str, kind: str, path: str) -> tuple[int, float, str] | None:
+        return self._rows.get((scope, kind, path))
+
+    def _save(self, scope: str, kind: str, path: str, fetched_at: float, text: str):
+        with self._lock:
+            self._rows[scope, kind, path] = (SCHEMA_VERSION, fetched_at, text)
+
+    def _paths(self, scope: str) -> list[str]:
+        with self._lock:
+            return list(
+                {path for key_scope, _, path in self._rows if key_scope == scope}
+            )
+
+    def _delete(self, scope: str, paths: list[str]):
+        paths = set(paths)
+        with self._lock:
+            for key in [
+                key for key in self._rows if key[0] == scope and key[2] in paths
+            ]:
+                del self._rows[key]
+
+
+class SQLiteResultStore(ResultStore):
+    """Keeps results in a SQLite database, created with permissions 0600.
+
+    The database can be shared by several processes. A store can be used from several
+    threads.
+
+    Args:
+        path (str | os.PathLike): File of the database. Created if it does not exist.
+        max_ages (Mapping[str, float] | None): See `ResultStore`.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike, max_ages: Mapping[str, float] | None = None
+    ):
+        super().__init__(max_ages)
+        self.path = pathlib.Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # create the file first, so that it is only readable by the current user
+        os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "scope TEXT NOT NULL, kind TEXT NOT NULL, path TEXT NOT NULL, "
+                "version INTEGER NOT NULL, fetched_at REAL NOT NULL, value TEXT NOT NULL, "
+                "PRIMARY KEY (scope, kind, path))"
+            )
+
+    def _load(self, scope: str, kind: str, path: str) -> tuple[int, float, str] | None:
+        with self._lock:
+            return self._db.execute(
+                "SELECT version, fetched_at, value FROM results "
+                "WHERE scope = ? AND kind = ? AND path = ?",
+                (scope, kind, path),
+            ).fetchone()
+
+    def _save(self, scope: str, kind: str, path: str, fetched_at: float, text: str):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (scope, kind, path, SCHEMA_VERSION, fetched_at, text),
+            )
+
+    def _paths(self, scope: str) -> list[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT path FROM results WHERE scope = ?", (scope,)
+            ).fetchall()
+        return [path for (path,) in rows]
+
+    def _delete(self, scope: str, paths: list[str]):
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM results WHERE scope = ? AND path = ?",
+                [(scope, path) for path in paths],
+            )
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+
+def stored_result(client, kind: str, url: str, fetch: Callable[[], T]) -> T:
+    """
+    Return the result saved for the page at `url` by the result store of the session or
+    client fetching it, if it has one and the result is still fresh. Otherwise return
+    `fetch()`, saving it unless it is None.
+    """
+    store, scope = _get_store(client)
+    if store is None:
+        return fetch()
+    path = urllib.parse.urlsplit(url).path
+    stored = store.load(scope, kind, path)
+    if stored is not None and store.is_fresh(kind, stored):
+        return stored.value
+    value = fetch()
+    if value is not None:
+        store.save(scope, kind, path, value)
+    return value
+
+
+async def stored_result_async(
+    client, kind: str, url: str, fetch: Callable[[], Awaitable[T]]
+) -> T:
+    """Async version of `stored_result`, awaiting `fetch()`"""
+    store, scope = _get_store(client)
+    if store is None:
+        return await fetch()
+    path = urllib.parse.urlsplit(url).path
+    stored = store.load(scope, kind, path)
+    if stored is not None and store.is_fresh(kind, stored):
+        return stored.value
+    value = await fetch()
+    if value is not None:
+        store.save(scope, kind, path, value)
+    return value
+
+
+def get_scope(gradescope_base_url: str, user: str) -> str:
+    """Key of the results of an account (e.g. an email address) on a Gradescope instance"""
+    return f"{gradescope_base_url} {user}"
+
+
+def _get_store(client) -> tuple[ResultStore | None, str | None]:
+    store = getattr(client, "result_store", None)
+    user = getattr(client, "user", None)
+    # results are only saved once the account they belong to is known
+    if store is None or user is None:
+        return None, None
+    return store, get_scope(client.gradescope_base_url, user)
+
+
+def encode_result(value) -> str:
+    """Encode a result (made of dataclass rows, dates, lists, sets and dicts) as JSON text"""
+    return json.dumps(_encode(value), separators=(",", ":"))
+
+
+def decode_result(text: str):
+    """Decode a result encoded by `encode_result`"""
+    return json.loads(text, object_hook=_decode_object)
+
+
+def _encode(value):
+    if isinstance(value, datetime.datetime):
+        tz_key = getattr(value.tzinfo, "key", None)
+        return {"__datetime__": value.isoformat(), "tz": tz_key}
+    if dataclasses.is_dataclass(value):
+        return {
+            "__row__": type(value).__name__,
+            "values": [
+                _encode(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+            ],
+        }
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": [_encode(item) for item in value]}
+    return value
+
+
+def _decode_object(obj: dict):
+    if "__datetime__" in obj:
+        date = datetime.datetime.fromisoformat(obj["__datetime__"])
+        if obj["tz"] is not None:
+            # keep the time zone (e.g. America/New_York), not only its offset
+            date = date.astimezone(get_timezone(obj["tz"]))
+        return date
+    if "__row__" in obj:
+        return _row_types()[obj["__row__"]](*obj["values"])
+    if "__set__" in obj:
+        return set(obj["__set__"])
+    return obj
+
+
+@functools.cache
+def _row_types() -> dict[str, type]:
+    """Dataclasses results are made of, by name"""
+    # imported here, the modules defining them depending on this one
+    from gradescopeapi.classes.assignments import Assignment
+    from gradescopeapi.classes.courses import Course
+    from gradescopeapi.classes.extensions import Extension
+    from gradescopeapi.classes.member import Member
+
+    return {
+        row_type.__name__: row_type
+        for row_type in (Course, Member, Assignment, Extension)
+    }
@@ -0,0 +1,194 @@
+"""Retries and circuit breaking for requests made to Gradescope.
+
+Like rate limiting, these policies are applied by the connection's transport
+(`GSSession`/`AsyncGSTransport`) to every request made to Gradescope.
+
+The main classes in this module are:
+- `RetryPolicy`: Decides whether a failed request may be sent again, and how long to wait
+  before doing so (exponential backoff with full jitter). GET requests are retried on
+  connection errors, timeouts and 429/5xx responses. Other requests, which may have side
+  effects, are only retried when Gradescope cannot have acted on them: when the
+  connection could not be established, or on 429/503 responses.
+- `CircuitBreaker`: Stops sending requests for a while once Gradescope keeps failing,
+  raising `CircuitOpenError` right away instead of waiting on a server that is down.
+"""
+
+import random
+import threading
+import time
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open"""
+
+
+class RetryPolicy:
+    """Retries with exponential backoff and full jitter.
+
+    Args:
+        max_retries (int): Maximum number of times a request is sent again. Defaults to 3.
+        backoff_factor (float): The wait before retry `n` (starting at 0) is drawn uniformly
+            from `[0, backoff_factor * 2**n]` seconds. Defaults to 0.5.
+        max_backoff (float): Cap on the wait between two attempts. A Retry-After header
+            asking for longer than this is not waited for: the response is returned as-is.
+            Defaults to 30.
+
+    Attributes:
+        retries (int): Number of requests sent again.
+        exhausted (int): Number of requests that still failed after `max_retries` retries.
+    """
+
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    # status codes meaning the request was turned away before being processed
+    REJECTED_STATUS_CODES = frozenset({429, 503})
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retries = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def should_retry(
+        self,
+        attempt: int,
+        method: str,
+        status_code: int | None,
+        connect_error: bool = False,
+        replayable: bool = True,
+        retry_after: float | None = None,
+    ) -> bool:
+        """Whether to send a request again after attempt number `attempt` (starting at 0).
+
+        Args:
+            attempt (int): Number of retries already made for this request.
+            method (str): HTTP method of the request.
+            status_code (int | None): Status code of the response, None if the request failed without one.
+            connect_error (bool): Whether the request failed before a connection was established.
+            replayable (bool): Whether the request body can be sent again.
+            retry_after (float | None): Seconds to wait requested by a Retry-After header, if any.
+        """
+        if not replayable:
+            return False
+        if status_code is not None and status_code not in self.RETRY_STATUS_CODES:
+            return False
+        if retry_after is not None and retry_after > self.max_backoff:
+            return False
+        if method.upper() not in self.IDEMPOTENT_METHODS and not (
+            connect_error or status_code in self.REJECTED_STATUS_CODES
+        ):
+            return False
+        with self._lock:
+            if attempt >= self.max_retries:
+                self.exhausted += 1
+                return False
+            self.retries += 1
+        return True
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 0)"""
+        ceiling = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return max(random.uniform(0, ceiling), retry_after or 0.0)
+
+    def stats(self) -> dict:
+        """Retry counts, for monitoring"""
+        return {"retries": self.retries, "exhausted": self.exhausted}
+
+
+class NoRetry(RetryPolicy):
+    """Retry policy that never retries"""
+
+    def __init__(self):
+        super().__init__(max_retries=0)
+
+
+class CircuitBreaker:
+    """Fails fast once Gradescope looks down.
+
+    After `failure_threshold` consecutive failures (connection errors and 5xx responses)
+    the circuit opens: requests raise `CircuitOpenError` without being sent. After
+    `recovery_timeout` seconds a single trial request is let through; the circuit closes
+    again if it succeeds, and stays open for another `recovery_timeout` otherwise.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit. Defaults to 5.
+        recovery_timeout (float): Seconds the circuit stays open. Defaults to 30.
+
+    Attributes:
+        trips (int): Number of times the circuit opened.
+        rejected (int): Number of requests refused while the circuit was open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.trips = 0
+        self.rejected = 0
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.recovery_timeout
+            ):
+                return self.HALF_OPEN
+            return self._state
+
+    def before_request(self):
+        """Raise `CircuitOpenError` if the request must not be sent"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if self._state == self.OPEN and remaining <= 0:
+                # let a single trial request through
+                self._state = self.HALF_OPEN
+                return
+            self.rejected += 1
+        raise CircuitOpenError(
+            "Gradescope is failing, not sending requests for the next "
+            f"{max(0.0, remaining):.1f} seconds."
+        )
+
+    def record(self, status_code: int | None):
+        """Report the outcome of a request that was let through"""
+        failed = status_code is None or status_code >= 500
+        with self._lock:
+            if not failed:
+                self._state = self.CLOSED
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.trips += 1
+
+    def abandon(self):
+        """Report that a request let through was given up before its outcome was known"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                # the recovery timeout has already passed: the next request is a new trial
+                self._state = self.OPEN
+
+    def stats(self) -> dict:
+        """Current state of the breaker, for monitoring"""
+        return {"state": self.state, "trips": self.trips, "rejected": self.rejected}
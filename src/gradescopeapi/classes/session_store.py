@@ -0,0 +1,98 @@
+"""Storage for logged-in sessions, so they can be reused across processes.
+
+A saved session is a small dict holding the cookies and the X-CSRF-Token of a logged-in
+connection (see `GSConnection.save_session` and `GSConnection.load_session`). Anyone who
+gets hold of it is logged in as the account it belongs to: store it like a password.
+
+The main classes in this module are:
+- `SessionStore`: Base class. Subclass it to keep sessions elsewhere (a database, a secrets
+  manager, a cache shared by several workers...).
+- `FileSessionStore`: Keeps sessions in a JSON file only readable by the current user.
+- `MemorySessionStore`: Keeps sessions in memory, for the lifetime of the process.
+"""
+
+import json
+import os
+import pathlib
+import tempfile
+import threading
+
+
+class SessionStore:
+    """Base class of session stores: maps keys (e.g. an email address) to saved sessions."""
+
+    def load(self, key: str) -> dict | None:
+        """Return the session saved under `key`, None if there is none"""
+        raise NotImplementedError
+
+    def save(self, key: str, state: dict):
+        """Save a session under `key`, replacing any previous one"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Forget the session saved under `key`, if any"""
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    def __init__(self):
+        self._states: dict[str, dict] = {}
+
+    def load(self, key: str) -> dict | None:
+        return self._states.get(key)
+
+    def save(self, key: str, state: dict):
+        self._states[key] = state
+
+    def delete(self, key: str):
+        self._states.pop(key, None)
+
+
+class FileSessionStore(SessionStore):
+    """Keeps sessions in a JSON file, written atomically with permissions 0600.
+
+    Args:
+        path (str | os.PathLike): File holding the sessions. Created on the first save.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = pathlib.Path(path).expanduser()
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            # a corrupted file only costs a fresh login
+            return {}
+
+    def _write(self, states: dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name)
+        try:
+            os.chmod(tmp_path, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(states, file)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, key: str) -> dict | None:
+        with self._lock:
+            return self._read().get(key)
+
+    def save(self, key: str, state: dict):
+        with self._lock:
+            states = self._read()
+            states[key] = state
+            self._write(states)
+
+    def delete(self, key: str):
+        with self._lock:
+            states = self._read()
+            if states.pop(key, None) is not None:
+                self._write(states)
@@ -0,0 +1,275 @@
+"""Snapshots of everything a course's staff can see, crawled concurrently.
+
+`Account.snapshot_course` (and `AsyncAccount.snapshot_course`) fetch the roster,
+assignments, extensions, submissions and graders of a course in one call. The requests
+form a graph: the roster and the assignment list come first, then the extensions and the
+list of submissions of each assignment, then the files of each submission. Every request
+is started as soon as the ones it depends on are done, so up to `max_workers` (or the
+account's `max_concurrency`) requests are in flight at once, all subject to the
+connection's rate limiter and to an optional `requests_per_second` cap for the snapshot.
+
+A request that fails does not stop the crawl: its error is recorded in
+`CourseSnapshot.errors`, and only the requests depending on it are skipped.
+
+Example:
+    snapshot = connection.account.snapshot_course(
+        course_id, max_workers=8, progress=lambda done, total: print(f"{done}/{total}")
+    )
+    snapshot.submissions[assignment_id]  # {submission_id: [file links]}
+"""
+
+import asyncio
+import contextvars
+import dataclasses
+import datetime
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes._helpers._assignment_helpers import get_submission_files
+from gradescopeapi.classes._helpers._bulk_helpers import get_rate_cap
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.extensions import Extension, get_extensions
+from gradescopeapi.classes.member import Member
+
+# called with the number of requests done and the number known so far, which grows as the
+# crawl discovers assignments and submissions
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclasses.dataclass(slots=True)
+class CourseSnapshot:
+    """Data of a course at the time it was crawled.
+
+    Attributes:
+        course_id (str): The ID of the course.
+        taken_at (datetime.datetime): When the crawl started, in UTC.
+        members (list[Member]): The roster of the course.
+        assignments (list[Assignment]): The assignments of the course.
+        extensions (dict): Extensions of each assignment, by assignment ID then user ID.
+        submission_students (dict): Student name of each submission, by assignment ID then
+            submission ID.
+        submissions (dict): File links of each submission, by assignment ID then
+            submission ID.
+        graders (dict): Graders of each question, by question ID.
+        errors (dict): Requests that failed, mapping keys such as `("members",)`,
+            `("extensions", assignment_id)` or
+            `("submission_files", assignment_id, submission_id)` to the exception raised.
+    """
+
+    course_id: str
+    taken_at: datetime.datetime
+    members: list[Member] = dataclasses.field(default_factory=list)
+    assignments: list[Assignment] = dataclasses.field(default_factory=list)
+    extensions: dict[str, dict[str, Extension]] = dataclasses.field(
+        default_factory=dict
+    )
+    submission_students: dict[str, dict[str, str]] = dataclasses.field(
+        default_factory=dict
+    )
+    submissions: dict[str, dict[str, list[str]]] = dataclasses.field(
+        default_factory=dict
+    )
+    graders: dict[str, set[str]] = dataclasses.field(default_factory=dict)
+    errors: dict[tuple, Exception] = dataclasses.field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every request succeeded"""
+        return not self.errors
+
+
+def crawl_course(
+    account,
+    course_id: str,
+    question_ids: Iterable[str] = (),
+    max_workers: int = 4,
+    requests_per_second: float | None = None,
+    progress: ProgressCallback | None = None,
+) -> CourseSnapshot:
+    """Crawl a course with an `Account`, on a pool of `max_workers` threads. See
+    `Account.snapshot_course`."""
+    snapshot = _new_snapshot(course_id)
+    rate_cap = get_rate_cap(requests_per_second)
+
+    def call(key: tuple):
+        if rate_cap is not None:
+            rate_cap.acquire()
+        return _fetch(account, course_id, key)
+
+    done = 0
+    total = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        running = {}
+
+        def submit(keys: list[tuple]):
+            nonlocal total
+            for key in keys:
+                # requests run in a copy of the caller's context, so they share its deadline
+                context = contextvars.copy_context()
+                running[executor.submit(context.run, call, key)] = key
+            total += len(keys)
+
+        try:
+            submit(_root_keys(question_ids))
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = running.pop(future)
+                    try:
+                        unlocked = _record(snapshot, key, future.result())
+                    except timeouts.DeadlineExceeded:
+                        raise
+                    except Exception as e:
+                        snapshot.errors[key] = e
+                    else:
+                        submit(unlocked)
+                    done += 1
+                    if progress is not None:
+                        progress(done, total)
+        finally:
+            for future in running:
+                future.cancel()
+    return snapshot
+
+
+async def crawl_course_async(
+    account,
+    course_id: str,
+    question_ids: Iterable[str] = (),
+    max_concurrency: int = 10,
+    requests_per_second: float | None = None,
+    progress: ProgressCallback | None = None,
+) -> CourseSnapshot:
+    """Crawl a course with an `AsyncAccount`. See `AsyncAccount.snapshot_course`."""
+    snapshot = _new_snapshot(course_id)
+    rate_cap = get_rate_cap(requests_per_second)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(key: tuple):
+        async with semaphore:
+            if rate_cap is not None:
+                await rate_cap.acquire_async()
+            return await _fetch_async(account, course_id, key)
+
+    done = 0
+    total = 0
+    running = {}
+
+    def submit(keys: list[tuple]):
+        nonlocal total
+        for key in keys:
+            running[asyncio.ensure_future(call(key))] = key
+        total += len(keys)
+
+    try:
+        submit(_root_keys(question_ids))
+        while running:
+            finished, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                key = running.pop(task)
+                try:
+                    unlocked = _record(snapshot, key, task.result())
+                except timeouts.DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    snapshot.errors[key] = e
+                else:
+                    submit(unlocked)
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+    finally:
+        for task in running:
+            task.cancel()
+    return snapshot
+
+
+def _new_snapshot(course_id: str) -> CourseSnapshot:
+    if not course_id:
+        raise Exception("Invalid Course ID")
+    return CourseSnapshot(course_id, datetime.datetime.now(datetime.timezone.utc))
+
+
+def _root_keys(question_ids: Iterable[str]) -> list[tuple]:
+    """Requests that depend on no other"""
+    return [
+        ("members",),
+        ("assignments",),
+        *(("graders", question_id) for question_id in question_ids),
+    ]
+
+
+def _record(snapshot: CourseSnapshot, key: tuple, result) -> list[tuple]:
+    """Store the result of a request in the snapshot, returning the requests it unlocks"""
+    match key:
+        case ("members",):
+            snapshot.members = result
+        case ("assignments",):
+            snapshot.assignments = result
+            return [
+                (kind, assignment.assignment_id)
+                for assignment in result
+                for kind in ("extensions", "submissions")
+            ]
+        case ("extensions", assignment_id):
+            snapshot.extensions[assignment_id] = result
+        case ("submissions", assignment_id):
+            snapshot.submission_students[assignment_id] = result
+            snapshot.submissions[assignment_id] = {}
+            return [
+                ("submission_files", assignment_id, submission_id)
+                for submission_id in result
+            ]
+        case ("submission_files", assignment_id, submission_id):
+            snapshot.submissions[assignment_id][submission_id] = result
+        case ("graders", question_id):
+            snapshot.graders[question_id] = result
+    return []
+
+
+def _fetch(account, course_id: str, key: tuple):
+    match key:
+        case ("members",):
+            return account._get_course_members(course_id)
+        case ("assignments",):
+            return account.get_assignments(course_id)
+        case ("extensions", assignment_id):
+            return get_extensions(
+                account.session,
+                course_id,
+                assignment_id,
+                account.gradescope_base_url,
+            )
+        case ("submissions", assignment_id):
+            return account.get_submission_students(course_id, assignment_id)
+        case ("submission_files", assignment_id, submission_id):
+            return get_submission_files(
+                account.session,
+                course_id,
+                assignment_id,
+                submission_id,
+                account.gradescope_base_url,
+            )
+        case ("graders", question_id):
+            return account.get_assignment_graders(course_id, question_id)
+
+
+async def _fetch_async(account, course_id: str, key: tuple):
+    match key:
+        case ("members",):
+            return await account._get_course_members(course_id)
+        case ("assignments",):
+            return await account.get_assignments(course_id)
+        case ("extensions", assignment_id):
+            return await account.get_extensions(course_id, assignment_id)
+        case ("submissions", assignment_id):
+            return await account.get_submission_students(course_id, assignment_id)
+        case ("submission_files", assignment_id, submission_id):
+            return await account.get_submission_files(
+                course_id, assignment_id, submission_id
+            )
+        case ("graders", question_id):
+            return await account.get_assignment_graders(course_id, question_id)
@@ -0,0 +1,585 @@
+"""Export of all submissions to an assignment as a single ZIP archive.
+
+`get_assignment_submissions` makes a request per submission. Instead, the "Export
+Submissions" button of an assignment's review page has Gradescope build one archive of
+every submission, which `export_assignment_submissions` requests, waits for, and
+extracts to a directory as it downloads it: the archive is read from the network one
+chunk at a time, without being kept in memory or on disk as a whole.
+
+ZIP archives are normally read from their end, where their table of contents is.
+Archives read as they are downloaded are instead read from the start, through the header
+preceding each file (see `iter_zip_members`), which also works for the data descriptors
+and ZIP64 sizes of large archives.
+
+Example:
+    paths = export_assignment_submissions(
+        connection.session, course_id, assignment_id, "export",
+        gradescope_base_url=connection.gradescope_base_url,
+    )
+"""
+
+import dataclasses
+import os
+import pathlib
+import struct
+import zlib
+from collections.abc import AsyncIterable, Iterable, Iterator
+
+import httpx
+import requests
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes._helpers._file_helpers import get_part_path
+
+# seconds between two checks of whether an export is ready
+DEFAULT_POLL_INTERVAL = 2.0
+
+# bytes read from the network at once
+CHUNK_SIZE = 64 * 1024
+
+# signature, version, flags, compression method, time, date, CRC-32, compressed size,
+# size, name length, extra field length
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+# records following the last file: central directory, end of central directory (ZIP64)
+_CENTRAL_DIRECTORY_SIGNATURES = {b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06"}
+_ZIP64_EXTRA_ID = 0x0001
+_FLAG_ENCRYPTED = 0x1
+_FLAG_DATA_DESCRIPTOR = 0x8
+_FLAG_UTF8 = 0x800
+_STORED = 0
+_DEFLATED = 8
+
+
+@dataclasses.dataclass(slots=True)
+class ZipMember:
+    """A file or directory of a ZIP archive.
+
+    Attributes:
+        name (str): Path of the member in the archive, "/"-separated. Directories end with "/".
+        size (int | None): Size of the file, None if the archive only gives it after the
+            file's content.
+    """
+
+    name: str
+    size: int | None
+
+    @property
+    def is_dir(self) -> bool:
+        return self.name.endswith("/")
+
+
+def request_export(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+) -> str:
+    """
+    Ask Gradescope to build the archive of all submissions to an assignment
+
+    Returns:
+        str: The ID of the archive, to pass to `wait_for_export`.
+
+    Raises:
+        RuntimeError: If Gradescope refuses, e.g. because the user is not staff of the course.
+    """
+    response = session.post(
+        _export_endpoint(course_id, assignment_id, gradescope_base_url)
+    )
+    return _get_generated_file_id(response, assignment_id)
+
+
+def wait_for_export(
+    session: requests.Session,
+    course_id: str,
+    generated_file_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> str:
+    """
+    Wait until an archive requested by `request_export` is built
+
+    Large assignments take minutes: bound the wait with `timeouts.deadline`.
+
+    Returns:
+        str: The link to download the archive from.
+
+    Raises:
+        RuntimeError: If building the archive failed.
+    """
+    status_endpoint = _status_endpoint(
+        course_id, generated_file_id, gradescope_base_url
+    )
+    while True:
+        url = _get_archive_url(session.get(status_endpoint), status_endpoint)
+        if url is not None:
+            return url
+        timeouts.sleep(poll_interval)
+
+
+def export_assignment_submissions(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    directory: str | os.PathLike,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    deadline: float | None = None,
+) -> list[pathlib.Path]:
+    """Export all submissions to an assignment, extracting the archive to a directory.
+
+    Args:
+        session (requests.Session): The session to use, logged in as staff of the course.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+        directory (str | os.PathLike): Directory to extract the archive to, created if
+            needed. Files already there are replaced.
+        gradescope_base_url (str): Defaults to `DEFAULT_GRADESCOPE_BASE_URL`.
+        poll_interval (float): Seconds between two checks of whether the archive is ready.
+            Defaults to `DEFAULT_POLL_INTERVAL`.
+        deadline (float | None): Seconds the whole export may take, see
+            `timeouts.deadline`. Defaults to None.
+
+    Returns:
+        list[pathlib.Path]: The files extracted, in the order of the archive.
+
+    Raises:
+        RuntimeError: If the archive could not be built or downloaded.
+        ValueError: If the archive is corrupt, or has a member outside of `directory`.
+    """
+    with timeouts.deadline(deadline):
+        with _open_export(
+            session, course_id, assignment_id, gradescope_base_url, poll_interval
+        ) as response:
+            return extract_zip_stream(response.iter_content(CHUNK_SIZE), directory)
+
+
+def iter_assignment_export(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> Iterator[tuple[ZipMember, Iterator[bytes]]]:
+    """Export all submissions to an assignment, yielding the members of the archive as
+    it downloads. See `iter_zip_members` and `export_assignment_submissions`."""
+    with _open_export(
+        session, course_id, assignment_id, gradescope_base_url, poll_interval
+    ) as response:
+        yield from iter_zip_members(response.iter_content(CHUNK_SIZE))
+
+
+async def export_assignment_submissions_async(
+    client: httpx.AsyncClient,
+    course_id: str,
+    assignment_id: str,
+    directory: str | os.PathLike,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    deadline: float | None = None,
+) -> list[pathlib.Path]:
+    """Async version of `export_assignment_submissions`. Files are written from the event
+    loop's thread, one chunk at a time."""
+    with timeouts.deadline(deadline):
+        response = await client.post(
+            _export_endpoint(course_id, assignment_id, gradescope_base_url)
+        )
+        generated_file_id = _get_generated_file_id(response, assignment_id)
+        status_endpoint = _status_endpoint(
+            course_id, generated_file_id, gradescope_base_url
+        )
+        while True:
+            url = _get_archive_url(await client.get(status_endpoint), status_endpoint)
+            if url is not None:
+                break
+            await timeouts.sleep_async(poll_interval)
+
+        async with client.stream("GET", url, follow_redirects=True) as response:
+            _check_archive_response(response)
+            return await _extract_zip_stream_async(
+                response.aiter_bytes(CHUNK_SIZE), directory
+            )
+
+
+def iter_zip_members(
+    chunks: Iterable[bytes],
+) -> Iterator[tuple[ZipMember, Iterator[bytes]]]:
+    """
+    Read a ZIP archive from the start, as its bytes arrive
+
+    Yields:
+        tuple: (member, content) for each member of the archive, in order, where `content`
+        yields the decompressed content of the member in chunks. Read it before moving to
+        the next member: whatever is left unread is skipped.
+
+    Raises:
+        ValueError: If the archive is corrupt or truncated, or uses a compression method
+            other than deflate, or encryption. Raised once the corrupt part is reached.
+    """
+    events = _iter_zip_events(chunks)
+    for _, member in events:
+        content = _iter_member_content(events)
+        yield member, content
+        for _ in content:
+            pass
+
+
+def extract_zip_stream(
+    chunks: Iterable[bytes], directory: str | os.PathLike
+) -> list[pathlib.Path]:
+    """
+    Extract a ZIP archive to a directory as its bytes arrive, without keeping it whole
+
+    Each file is written to a ".part" file renamed into place once it is complete and its
+    checksum verified.
+
+    Returns:
+        list[pathlib.Path]: The files extracted, in the order of the archive.
+
+    Raises:
+        ValueError: If the archive is corrupt, or has a member outside of `directory`.
+    """
+    extractor = _ZipExtractor(directory)
+    reader = _ZipStreamReader()
+    with extractor:
+        for chunk in chunks:
+            for event in reader.feed(chunk):
+                extractor.handle(event)
+        reader.close()
+    return extractor.paths
+
+
+async def _extract_zip_stream_async(
+    chunks: AsyncIterable[bytes], directory: str | os.PathLike
+) -> list[pathlib.Path]:
+    extractor = _ZipExtractor(directory)
+    reader = _ZipStreamReader()
+    with extractor:
+        async for chunk in chunks:
+            for event in reader.feed(chunk):
+                extractor.handle(event)
+        reader.close()
+    return extractor.paths
+
+
+def _export_endpoint(course_id: str, assignment_id: str, gradescope_base_url: str):
+    return (
+        f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/export"
+    )
+
+
+def _status_endpoint(course_id: str, generated_file_id: str, gradescope_base_url: str):
+    return f"{gradescope_base_url}/courses/{course_id}/generated_files/{generated_file_id}.json"
+
+
+def _get_generated_file_id(
+    response: requests.Response | httpx.Response, assignment_id: str
+) -> str:
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Failed to export the submissions of assignment {assignment_id}. Status code: {response.status_code}"
+        )
+    return str(response.json()["generated_file_id"])
+
+
+def _get_archive_url(
+    response: requests.Response | httpx.Response, status_endpoint: str
+) -> str | None:
+    """Link to the archive if it is built, None if it is still being built"""
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Failed to check the progress of the export. Status code: {response.status_code}"
+        )
+    status = response.json()
+    match status.get("status"):
+        case "completed":
+            # the archive is served next to its status, unless a link is given
+            return status.get("url") or status_endpoint.removesuffix(".json") + ".zip"
+        case "failed" | "error":
+            raise RuntimeError(f"Gradescope failed to build the export: {status}")
+    return None
+
+
+class _open_export:
+    """Context manager requesting an export, waiting for it, and opening the archive"""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        course_id: str,
+        assignment_id: str,
+        gradescope_base_url: str,
+        poll_interval: float,
+    ):
+        generated_file_id = request_export(
+            session, course_id, assignment_id, gradescope_base_url
+        )
+        url = wait_for_export(
+            session, course_id, generated_file_id, gradescope_base_url, poll_interval
+        )
+        self.response = session.get(url, stream=True)
+
+    def __enter__(self) -> requests.Response:
+        _check_archive_response(self.response)
+        return self.response
+
+    def __exit__(self, *exc_info):
+        self.response.close()
+
+
+def _check_archive_response(response: requests.Response | httpx.Response):
+    if response.status_code != 200:
+        response.close()
+        raise RuntimeError(
+            f"Failed to download the export. Status code: {response.status_code}"
+        )
+
+
+def _iter_zip_events(chunks: Iterable[bytes]) -> Iterator[tuple[str, object]]:
+    reader = _ZipStreamReader()
+    for chunk in chunks:
+        yield from reader.feed(chunk)
+    reader.close()
+
+
+def _iter_member_content(events: Iterator[tuple[str, object]]) -> Iterator[bytes]:
+    for kind, value in events:
+        if kind == "end":
+            return
+        yield value
+
+
+class _ZipStreamReader:
+    """Incremental ZIP reader: `feed` it the bytes of an archive in any pieces, and it
+    returns what they complete, as events:
+    - ("start", ZipMember): a member begins.
+    - ("data", bytes): decompressed content of the current member.
+    - ("end", ZipMember): the current member is complete, and its CRC-32 verified.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._state = "header"
+        self._member: ZipMember | None = None
+        # compressed bytes of the current member left to read, None if unknown
+        self._remaining: int | None = None
+        self._decompressor = None
+        self._crc = 0
+        self._expected_crc = 0
+        self._has_descriptor = False
+        self._zip64 = False
+
+    def feed(self, data: bytes) -> list[tuple[str, object]]:
+        if self._state == "done":
+            return []
+        self._buffer += data
+        events = []
+        while self._step(events):
+            pass
+        return events
+
+    def close(self):
+        """Check that the archive was read to its end"""
+        if self._state != "done":
+            raise ValueError("Truncated ZIP archive")
+
+    def _step(self, events: list) -> bool:
+        """Read the next record of the archive, returning False if more bytes are needed"""
+        match self._state:
+            case "header":
+                return self._read_header(events)
+            case "data":
+                return self._read_data(events)
+            case "descriptor":
+                return self._read_descriptor(events)
+        return False
+
+    def _read_header(self, events: list) -> bool:
+        buffer = self._buffer
+        if len(buffer) < 4:
+            return False
+        signature = bytes(buffer[:4])
+        if signature in _CENTRAL_DIRECTORY_SIGNATURES:
+            # every member was read, the rest is the table of contents
+            self._state = "done"
+            buffer.clear()
+            return False
+        if signature != _LOCAL_HEADER_SIGNATURE:
+            raise ValueError("Not a ZIP archive, or a corrupt one")
+        if len(buffer) < _LOCAL_HEADER.size:
+            return False
+        (
+            _,
+            _,
+            flags,
+            method,
+            _,
+            _,
+            crc,
+            compressed_size,
+            size,
+            name_length,
+            extra_length,
+        ) = _LOCAL_HEADER.unpack_from(buffer)
+        header_length = _LOCAL_HEADER.size + name_length + extra_length
+        if len(buffer) < header_length:
+            return False
+
+        name_bytes = bytes(
+            buffer[_LOCAL_HEADER.size : _LOCAL_HEADER.size + name_length]
+        )
+        name = name_bytes.decode("utf-8" if flags & _FLAG_UTF8 else "cp437")
+        extra = bytes(buffer[_LOCAL_HEADER.size + name_length : header_length])
+        del buffer[:header_length]
+
+        self._zip64 = False
+        zip64 = _get_extra_field(extra, _ZIP64_EXTRA_ID)
+        if zip64 is not None:
+            self._zip64 = True
+            # 64-bit sizes replace the 32-bit ones set to 0xFFFFFFFF, in this order
+            offset = 0
+            if size == 0xFFFFFFFF:
+                (size,) = struct.unpack_from("<Q", zip64, offset)
+                offset += 8
+            if compressed_size == 0xFFFFFFFF:
+                (compressed_size,) = struct.unpack_from("<Q", zip64, offset)
+
+        if flags & _FLAG_ENCRYPTED:
+            raise ValueError(f"{name} is encrypted, which is not supported")
+        if method not in (_STORED, _DEFLATED):
+            raise ValueError(f"{name} uses compression method {method}, not supported")
+        self._has_descriptor = bool(flags & _FLAG_DATA_DESCRIPTOR)
+        if self._has_descriptor and method == _STORED:
+            # the end of such a member can only be found through the table of contents
+            raise ValueError(f"{name} is stored without its size, not supported")
+
+        self._member = ZipMember(name, None if self._has_descriptor else size)
+        self._remaining = None if self._has_descriptor else compressed_size
+        self._decompressor = (
+            zlib.decompressobj(-zlib.MAX_WBITS) if method == _DEFLATED else None
+        )
+        self._crc = 0
+        self._expected_crc = crc
+        self._state = "data"
+        events.append(("start", self._member))
+        return True
+
+    def _read_data(self, events: list) -> bool:
+        buffer = self._buffer
+        if self._remaining is None:
+            # deflate streams mark their own end
+            if not buffer:
+                return False
+            self._emit(events, self._decompressor.decompress(bytes(buffer)))
+            buffer.clear()
+            if not self._decompressor.eof:
+                return False
+            buffer += self._decompressor.unused_data
+            self._state = "descriptor"
+            return True
+
+        if self._remaining and not buffer:
+            return False
+        length = min(self._remaining, len(buffer))
+        piece = bytes(buffer[:length])
+        del buffer[:length]
+        self._remaining -= length
+        if self._decompressor is not None:
+            piece = self._decompressor.decompress(piece)
+            if not self._remaining:
+                piece += self._decompressor.flush()
+        self._emit(events, piece)
+        if self._remaining:
+            return False
+        if self._has_descriptor:
+            self._state = "descriptor"
+        else:
+            self._end(events, self._expected_crc)
+        return True
+
+    def _read_descriptor(self, events: list) -> bool:
+        buffer = self._buffer
+        if len(buffer) < 4:
+            return False
+        # the signature of data descriptors is optional
+        start = 4 if buffer[:4] == _DATA_DESCRIPTOR_SIGNATURE else 0
+        length = start + 4 + (16 if self._zip64 else 8)
+        if len(buffer) < length:
+            return False
+        (crc,) = struct.unpack_from("<I", buffer, start)
+        del buffer[:length]
+        self._end(events, crc)
+        return True
+
+    def _emit(self, events: list, data: bytes):
+        if data:
+            self._crc = zlib.crc32(data, self._crc)
+            events.append(("data", data))
+
+    def _end(self, events: list, expected_crc: int):
+        if self._crc != expected_crc:
+            raise ValueError(f"CRC-32 of {self._member.name} does not match")
+        events.append(("end", self._member))
+        self._state = "header"
+
+
+def _get_extra_field(extra: bytes, field_id: int) -> bytes | None:
+    offset = 0
+    while offset + 4 <= len(extra):
+        current_id, length = struct.unpack_from("<HH", extra, offset)
+        if current_id == field_id:
+            return extra[offset + 4 : offset + 4 + length]
+        offset += 4 + length
+    return None
+
+
+class _ZipExtractor:
+    """Writes the members read by a `_ZipStreamReader` under a directory"""
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = pathlib.Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.paths: list[pathlib.Path] = []
+        self._path: pathlib.Path | None = None
+        self._file = None
+
+    def handle(self, event: tuple[str, object]):
+        kind, value = event
+        match kind:
+            case "start":
+                path = self._get_path(value.name)
+                if value.is_dir:
+                    path.mkdir(parents=True, exist_ok=True)
+                    return
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._path = path
+                self._file = open(get_part_path(path), "wb")
+            case "data":
+                self._file.write(value)
+            case "end" if self._file is not None:
+                self._file.close()
+                self._file = None
+                os.replace(get_part_path(self._path), self._path)
+                self.paths.append(self._path)
+
+    def _get_path(self, name: str) -> pathlib.Path:
+        """Path to extract a member to, refusing names that would escape the directory"""
+        parts = name.replace("\\", "/").split("/")
+        if name.startswith(("/", "\\")) or ".." in parts or (parts and ":" in parts[0]):
+            raise ValueError(f"Refusing to extract {name!r} outside of the directory")
+        return self.directory.joinpath(
+            *[part for part in parts if part not in ("", ".")]
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # a file cut short by an error is not left behind
+        if self._file is not None:
+            self._file.close()
+            get_part_path(self._path).unlink(missing_ok=True)
+            self._file = None
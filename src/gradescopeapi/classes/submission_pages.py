@@ -0,0 +1,462 @@
+"""Page images of PDF/image submissions (scanned exams, uploaded PDFs).
+
+Gradescope splits these submissions into pages, and serves each page as an image.
+`Account.get_submission_pages` lists the links to a submission's page images, and
+`download_submission_pages` downloads them for many submissions concurrently, either as
+image files (see `downloads`) or assembled in page order into one PDF per submission.
+
+PDFs are written as the pages arrive: pages are fetched ahead, a few at a time, and
+written to the PDF in order, so memory use depends on the number of pages fetched at
+once, not on the number of pages. JPEG images, which Gradescope's pages are, go into the
+PDF as they are, without being decoded; other formats require Pillow (`pip install
+gradescopeapi[images]`).
+
+Example:
+    pages = {
+        submission_id: connection.account.get_submission_pages(
+            course_id, assignment_id, submission_id
+        )
+    }
+    saved = download_submission_pages(
+        connection.session, course_id, assignment_id, pages, "exams", pdf=True
+    )
+    saved[submission_id]  # [PosixPath("exams/1/2/3.pdf")]
+"""
+
+import contextlib
+import io
+import os
+import pathlib
+import struct
+import zlib
+from collections.abc import Iterable, Mapping
+from typing import BinaryIO
+
+import httpx
+import requests
+
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes._helpers._bulk_helpers import (
+    BulkResult,
+    aiter_concurrently,
+    get_rate_cap,
+    imap_concurrently,
+)
+from gradescopeapi.classes._helpers._file_helpers import get_part_path
+from gradescopeapi.classes.downloads import (
+    DEFAULT_LAYOUT,
+    download_submissions,
+    download_submissions_async,
+)
+
+try:
+    import PIL.Image
+except ImportError:
+    PIL = None
+
+# width of PDF pages, in points (US Letter); heights follow the images' proportions
+PAGE_WIDTH = 612
+
+# JPEG markers of the frames giving the size of the image, other than DHT, JPG and DAC
+_JPEG_FRAME_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_JPEG_COLOR_SPACES = {1: "/DeviceGray", 3: "/DeviceRGB", 4: "/DeviceCMYK"}
+
+
+def download_submission_pages(
+    session: requests.Session,
+    course_id: str,
+    assignment_id: str,
+    pages: Mapping[str, list[str]],
+    directory: str | os.PathLike,
+    layout: str = DEFAULT_LAYOUT,
+    pdf: bool = False,
+    max_workers: int = 4,
+    requests_per_second: float | None = None,
+    deadline: float | None = None,
+) -> BulkResult:
+    """Download the page images of submissions to an assignment.
+
+    Args:
+        session (requests.Session): The session to download pages with.
+        course_id (str): The ID of the course.
+        assignment_id (str): The ID of the assignment.
+        pages (Mapping[str, list[str]]): Page image links by submission ID, in page order,
+            as returned by `Account.get_submission_pages`.
+        directory (str | os.PathLike): Directory to save pages under.
+        layout (str): Directory of each submission's pages under `directory`, formatted with
+            `course_id`, `assignment_id` and `submission_id`. With `pdf`, path of each
+            submission's PDF instead, with ".pdf" appended. Defaults to `DEFAULT_LAYOUT`.
+        pdf (bool): Whether to assemble each submission's pages into a PDF, instead of
+            saving them as image files. Defaults to False.
+        max_workers (int): Number of pages downloaded in parallel. Defaults to 4.
+        requests_per_second (float | None): Cap on the rate at which downloads are started.
+            Defaults to None (no cap).
+        deadline (float | None): Seconds the whole operation may take, see
+            `timeouts.deadline`. Defaults to None.
+
+    Returns:
+        BulkResult: The files saved for each submission: lists of `DownloadedFile`, or with
+        `pdf`, a list holding the path of the PDF. Submissions with a page that could not be
+        downloaded are reported in its `errors` attribute instead.
+
+    Raises:
+        DeadlineExceeded: If the deadline passes, after cancelling the remaining downloads.
+    """
+    if not pdf:
+        return download_submissions(
+            session,
+            course_id,
+            assignment_id,
+            pages,
+            directory,
+            layout,
+            max_workers,
+            requests_per_second,
+            deadline,
+        )
+
+    def fetch(key: tuple[str, int, str]) -> bytes:
+        return get_page(session, key[2])
+
+    assembler = _PdfAssembler(course_id, assignment_id, pages, directory, layout)
+    with timeouts.deadline(deadline), assembler:
+        assembler.write_empty()
+        outcomes = imap_concurrently(
+            fetch,
+            assembler.keys(),
+            max_workers,
+            get_rate_cap(requests_per_second),
+        )
+        with contextlib.closing(outcomes):
+            for key, image, error in outcomes:
+                assembler.add(key, image, error)
+    return assembler.results
+
+
+async def download_submission_pages_async(
+    client: httpx.AsyncClient,
+    course_id: str,
+    assignment_id: str,
+    pages: Mapping[str, list[str]],
+    directory: str | os.PathLike,
+    layout: str = DEFAULT_LAYOUT,
+    pdf: bool = False,
+    max_concurrency: int = 10,
+    requests_per_second: float | None = None,
+    deadline: float | None = None,
+) -> BulkResult:
+    """Async version of `download_submission_pages`, with at most `max_concurrency` pages
+    downloaded at once"""
+    if not pdf:
+        return await download_submissions_async(
+            client,
+            course_id,
+            assignment_id,
+            pages,
+            directory,
+            layout,
+            max_concurrency,
+            requests_per_second,
+            deadline,
+        )
+
+    async def fetch(key: tuple[str, int, str]) -> bytes:
+        return await get_page_async(client, key[2])
+
+    assembler = _PdfAssembler(course_id, assignment_id, pages, directory, layout)
+    with timeouts.deadline(deadline), assembler:
+        assembler.write_empty()
+        outcomes = aiter_concurrently(
+            fetch,
+            assembler.keys(),
+            max_concurrency,
+            get_rate_cap(requests_per_second),
+        )
+        async with contextlib.aclosing(outcomes):
+            async for key, image, error in outcomes:
+                assembler.add(key, image, error)
+    return assembler.results
+
+
+def get_page(session: requests.Session, url: str) -> bytes:
+    """
+    Download a page image
+
+    Raises:
+        RuntimeError: If the file host answers with an error.
+    """
+    response = session.get(url)
+    _check_page_response(response)
+    return response.content
+
+
+async def get_page_async(client: httpx.AsyncClient, url: str) -> bytes:
+    """Async version of `get_page`"""
+    response = await client.get(url)
+    _check_page_response(response)
+    return response.content
+
+
+def write_pdf(images: Iterable[bytes], file: BinaryIO) -> int:
+    """
+    Write images to `file` as a PDF, one image per page, as they come
+
+    Returns:
+        int: The number of pages written.
+
+    Raises:
+        ValueError: If an image is not a JPEG, and Pillow is not installed to read it.
+    """
+    writer = _PdfWriter(file)
+    for image in images:
+        writer.add_page(image)
+    writer.close()
+    return writer.page_count
+
+
+def _check_page_response(response: requests.Response | httpx.Response):
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Failed to download page {response.url}. Status code: {response.status_code}"
+        )
+
+
+class _PdfAssembler:
+    """Writes the pages of many submissions, received in order, to one PDF each"""
+
+    def __init__(
+        self,
+        course_id: str,
+        assignment_id: str,
+        pages: Mapping[str, list[str]],
+        directory: str | os.PathLike,
+        layout: str,
+    ):
+        self.pages = pages
+        directory = pathlib.Path(directory).expanduser()
+        self.paths = {
+            submission_id: directory
+            / (
+                layout.format(
+                    course_id=course_id,
+                    assignment_id=assignment_id,
+                    submission_id=submission_id,
+                )
+                + ".pdf"
+            )
+            for submission_id in pages
+        }
+        self.results = BulkResult()
+        self._submission_id: str | None = None
+        self._file: BinaryIO | None = None
+        self._writer: _PdfWriter | None = None
+
+    def write_empty(self):
+        """Write the PDFs of the submissions without pages, which have nothing to fetch"""
+        for submission_id, urls in self.pages.items():
+            if not urls:
+                self._start(submission_id)
+                self._finish()
+
+    def keys(self) -> Iterable[tuple[str, int, str]]:
+        """(submission ID, page index, link) of every page, in the order they are written"""
+        return (
+            (submission_id, index, url)
+            for submission_id, urls in self.pages.items()
+            for index, url in enumerate(urls)
+        )
+
+    def add(
+        self, key: tuple[str, int, str], image: bytes | None, error: Exception | None
+    ):
+        submission_id, index, _ = key
+        if submission_id in self.results.errors:
+            return
+        if index == 0:
+            self._start(submission_id)
+        try:
+            if error is not None:
+                raise error
+            self._writer.add_page(image)
+        except Exception as e:
+            self._abort()
+            if isinstance(e, timeouts.DeadlineExceeded):
+                raise
+            self.results.errors[submission_id] = e
+            return
+        if index == len(self.pages[submission_id]) - 1:
+            self._finish()
+
+    def _start(self, submission_id: str):
+        path = self.paths[submission_id]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._submission_id = submission_id
+        self._file = open(get_part_path(path), "wb")
+        self._writer = _PdfWriter(self._file)
+
+    def _finish(self):
+        self._writer.close()
+        self._file.close()
+        path = self.paths[self._submission_id]
+        os.replace(get_part_path(path), path)
+        self.results[self._submission_id] = [path]
+        self._file = self._writer = self._submission_id = None
+
+    def _abort(self):
+        if self._file is not None:
+            self._file.close()
+            get_part_path(self.paths[self._submission_id]).unlink(missing_ok=True)
+        self._file = self._writer = self._submission_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._abort()
+
+
+class _PdfWriter:
+    """Minimal PDF writer, writing each page as soon as it is added. The page tree, which
+    lists every page, is written last, followed by the table of object offsets."""
+
+    # objects written by `close`
+    _CATALOG = 1
+    _PAGES = 2
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.page_count = 0
+        self._position = 0
+        self._offsets: dict[int, int] = {}
+        self._next_object = 3
+        self._page_objects: list[int] = []
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def add_page(self, image: bytes):
+        width, height, dictionary, data = _get_image(image)
+        page_height = PAGE_WIDTH * height / width
+        image_object, content_object, page_object = self._reserve(3)
+
+        self._write_object(
+            image_object,
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d %s /Length %d >>"
+            % (width, height, dictionary, len(data)),
+            data,
+        )
+        content = b"q %d 0 0 %s 0 0 cm /Im0 Do Q" % (PAGE_WIDTH, _number(page_height))
+        self._write_object(content_object, b"<< /Length %d >>" % len(content), content)
+        self._write_object(
+            page_object,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %s] "
+            b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+            % (
+                self._PAGES,
+                PAGE_WIDTH,
+                _number(page_height),
+                image_object,
+                content_object,
+            ),
+        )
+        self._page_objects.append(page_object)
+        self.page_count += 1
+
+    def close(self):
+        """Write the page tree and the end of the file. Does not close `file`."""
+        kids = b" ".join(b"%d 0 R" % page for page in self._page_objects)
+        self._write_object(
+            self._PAGES,
+            b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, self.page_count),
+        )
+        self._write_object(
+            self._CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES
+        )
+        xref_position = self._position
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % self._next_object)
+        for number in range(1, self._next_object):
+            self._write(b"%010d 00000 n \n" % self._offsets[number])
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (self._next_object, self._CATALOG, xref_position)
+        )
+
+    def _reserve(self, count: int) -> range:
+        numbers = range(self._next_object, self._next_object + count)
+        self._next_object += count
+        return numbers
+
+    def _write_object(
+        self, number: int, dictionary: bytes, stream: bytes | None = None
+    ):
+        self._offsets[number] = self._position
+        self._write(b"%d 0 obj\n%s\n" % (number, dictionary))
+        if stream is not None:
+            self._write(b"stream\n")
+            self._write(stream)
+            self._write(b"\nendstream\n")
+        self._write(b"endobj\n")
+
+    def _write(self, data: bytes):
+        self.file.write(data)
+        self._position += len(data)
+
+
+def _get_image(image: bytes) -> tuple[int, int, bytes, bytes]:
+    """Width, height, PDF image dictionary entries and data of an image"""
+    if image.startswith(b"\xff\xd8"):
+        width, height, components = _get_jpeg_frame(image)
+        color_space = _JPEG_COLOR_SPACES.get(components)
+        if color_space is None:
+            raise ValueError(
+                f"JPEG images with {components} components are not supported"
+            )
+        return (
+            width,
+            height,
+            b"/ColorSpace %s /BitsPerComponent 8 /Filter /DCTDecode"
+            % color_space.encode(),
+            image,
+        )
+    if PIL is None:
+        raise ValueError(
+            "Pages that are not JPEG images require Pillow "
+            "(`pip install gradescopeapi[images]`)"
+        )
+    with PIL.Image.open(io.BytesIO(image)) as decoded:
+        grayscale = decoded.mode in ("1", "L", "LA", "I", "I;16", "F")
+        decoded = decoded.convert("L" if grayscale else "RGB")
+        color_space = b"/DeviceGray" if grayscale else b"/DeviceRGB"
+        return (
+            decoded.width,
+            decoded.height,
+            b"/ColorSpace %s /BitsPerComponent 8 /Filter /FlateDecode" % color_space,
+            zlib.compress(decoded.tobytes()),
+        )
+
+
+def _get_jpeg_frame(image: bytes) -> tuple[int, int, int]:
+    """Width, height and number of color components of a JPEG image, read from its
+    frame header without decoding the image"""
+    offset = 2
+    while offset + 4 <= len(image):
+        if image[offset] != 0xFF:
+            break
+        marker = image[offset + 1]
+        if marker == 0xFF:
+            # padding before a marker
+            offset += 1
+            continue
+        if marker in (0x01, *range(0xD0, 0xD9)):
+            # markers without a segment
+            offset += 2
+            continue
+        (length,) = struct.unpack_from(">H", image, offset + 2)
+        if marker in _JPEG_FRAME_MARKERS and offset + 10 <= len(image):
+            height, width, components = struct.unpack_from(">HHB", image, offset + 5)
+            return width, height, components
+        offset += 2 + length
+    raise ValueError("Invalid JPEG image: no frame header")
+
+
+def _number(value: float) -> bytes:
+    """A PDF number, without the exponents Python may format floats with"""
+    return (b"%.2f" % value).rstrip(b"0").rstrip(b".")
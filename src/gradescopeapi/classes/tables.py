@@ -0,0 +1,172 @@
+"""Columnar tables of scraped rows, for keeping large rosters and assignment lists in memory.
+
+A list of `Member` objects holds one object per member, plus a copy of every repeated
+string (role, sections, course ID) per member. `Roster` and `AssignmentTable` keep one
+list per column instead: numbers and IDs are packed in `array.array`s, and equal strings
+of columns with few distinct values are stored once. Rows are rebuilt on access.
+
+Example:
+    roster = Roster(connection.account.get_course_users(course_id))
+    roster[0]  # Member(...)
+    roster.column("email")  # ["ada@example.com", ...]
+"""
+
+import array
+import dataclasses
+import math
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Generic, TypeVar
+
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.member import Member
+
+Row = TypeVar("Row")
+
+
+class Table(Sequence[Row], Generic[Row]):
+    """Base class of columnar tables of dataclass rows.
+
+    Subclasses set `row_type` and may list columns stored specially:
+    - `integer_columns`: Integers, never None, packed in an array.
+    - `id_columns`: Strings of digits (IDs), packed in an array of integers. Other values
+      are kept aside as they are.
+    - `float_columns`: Numbers or None, packed in an array of floats (None is stored as NaN).
+    - `shared_columns`: Strings with few distinct values, each stored once.
+
+    Args:
+        rows (Iterable[Row]): Initial rows. Defaults to none.
+    """
+
+    row_type: type
+    integer_columns: tuple[str, ...] = ()
+    id_columns: tuple[str, ...] = ()
+    float_columns: tuple[str, ...] = ()
+    shared_columns: tuple[str, ...] = ()
+
+    def __init__(self, rows: Iterable[Row] = ()):
+        self.columns = tuple(field.name for field in dataclasses.fields(self.row_type))
+        self._data: dict[str, list | array.array] = {}
+        for name in self.columns:
+            if name in self.integer_columns or name in self.id_columns:
+                self._data[name] = array.array("q")
+            elif name in self.float_columns:
+                self._data[name] = array.array("d")
+            else:
+                self._data[name] = []
+        self._shared: dict[str, str] = {}
+        # values of ID columns that are not digits, by column and row index
+        self._other_ids: dict[str, dict[int, str | None]] = {
+            name: {} for name in self.id_columns
+        }
+        self.extend(rows)
+
+    def append(self, row: Row):
+        index = len(self)
+        for name in self.columns:
+            value = getattr(row, name)
+            if name in self.float_columns:
+                value = math.nan if value is None else value
+            elif name in self.id_columns:
+                value = self._pack_id(name, index, value)
+            elif name in self.shared_columns and value is not None:
+                value = self._shared.setdefault(value, value)
+            self._data[name].append(value)
+
+    def _pack_id(self, name: str, index: int, value: str | None) -> int:
+        # digits with a leading zero would not survive a round trip through int
+        if value and value.isdigit() and value[0] != "0" and len(value) < 19:
+            return int(value)
+        self._other_ids[name][index] = value
+        return -1
+
+    def _unpack_id(self, name: str, index: int, value: int) -> str | None:
+        if value == -1:
+            return self._other_ids[name][index]
+        return str(value)
+
+    def extend(self, rows: Iterable[Row]):
+        for row in rows:
+            self.append(row)
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> list:
+        """
+        Return the values of a column, as the rows hold them
+
+        Args:
+            name (str): Name of the column, i.e. of a field of the rows.
+            start (int): Index of the first row. Defaults to 0.
+            stop (int | None): Index after the last row. Defaults to None (all rows).
+
+        Raises:
+            KeyError: If the rows have no such field.
+        """
+        rows = range(len(self))[start:stop]
+        values = self._data[name][rows.start : rows.stop]
+        if name in self.float_columns:
+            return [None if math.isnan(value) else value for value in values]
+        if name in self.id_columns:
+            return [
+                self._unpack_id(name, index, value)
+                for index, value in enumerate(values, rows.start)
+            ]
+        return list(values)
+
+    def to_dataframe(self):
+        """Return the table as a `pandas.DataFrame` (requires pandas and pyarrow)"""
+        # imported here, export depending on this module
+        from gradescopeapi.classes.export import to_dataframe
+
+        return to_dataframe(self)
+
+    def _row(self, index: int) -> Row:
+        values = []
+        for name in self.columns:
+            value = self._data[name][index]
+            if name in self.float_columns and math.isnan(value):
+                value = None
+            elif name in self.id_columns:
+                value = self._unpack_id(name, index, value)
+            values.append(value)
+        return self.row_type(*values)
+
+    def __len__(self) -> int:
+        return len(self._data[self.columns[0]])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self._row(i) for i in range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Row]:
+        for index in range(len(self)):
+            yield self._row(index)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Table):
+            return NotImplemented
+        return self.row_type is other.row_type and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} rows)"
+
+
+class Roster(Table[Member]):
+    """Members of one or more courses, e.g. `Roster(account.get_course_users(course_id))`"""
+
+    row_type = Member
+    integer_columns = ("num_submissions",)
+    id_columns = ("id",)
+    shared_columns = ("role", "sections", "course_id")
+
+
+class AssignmentTable(Table[Assignment]):
+    """Assignments of one or more courses, e.g. `AssignmentTable(account.get_assignments(course_id))`"""
+
+    row_type = Assignment
+    id_columns = ("assignment_id",)
+    float_columns = ("grade", "max_grade")
+    shared_columns = ("submissions_status",)
@@ -0,0 +1,94 @@
+"""Timeouts and deadlines for requests made by the library.
+
+Every request gets a timeout: `DEFAULT_TIMEOUT` unless the connection was created with
+another one. On top of that, `deadline(seconds)` bounds the total time taken by everything
+run inside it, however many requests, retries and rate limiter waits that involves:
+
+    with deadline(60):
+        submissions = connection.account.get_assignment_submissions(course_id, assignment_id)
+
+Inside a deadline, request timeouts are shortened to the time left, and `DeadlineExceeded`
+is raised as soon as it runs out, cancelling the requests of the operation not sent yet.
+Deadlines nest (the earliest one wins) and apply to asyncio code as well. Operations made
+of several requests also accept a `deadline` argument doing the same.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import time
+from collections.abc import Iterator
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (10.0, 60.0)
+
+Timeout = float | tuple[float | None, float | None] | None
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "gradescopeapi_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an operation runs past its deadline"""
+
+
+@contextlib.contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Run the enclosed requests with at most `seconds` seconds left. None means no deadline."""
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, None if there is none"""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def check_deadline():
+    """Raise `DeadlineExceeded` if the current deadline has passed"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+
+
+def cap_timeout(timeout: Timeout) -> Timeout:
+    """Shorten a requests-style timeout to the time left before the current deadline"""
+    check_deadline()
+    left = remaining()
+    if left is None:
+        return timeout
+    if isinstance(timeout, tuple):
+        return tuple(left if t is None else min(t, left) for t in timeout)
+    return left if timeout is None else min(timeout, left)
+
+
+def sleep(seconds: float):
+    """`time.sleep`, raising `DeadlineExceeded` right away if the deadline would pass first"""
+    _check_sleep(seconds)
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+async def sleep_async(seconds: float):
+    """`asyncio.sleep`, raising `DeadlineExceeded` right away if the deadline would pass first"""
+    _check_sleep(seconds)
+    if seconds > 0:
+        await asyncio.sleep(seconds)
+
+
+def _check_sleep(seconds: float):
+    left = remaining()
+    if left is not None and seconds >= left:
+        raise DeadlineExceeded("Deadline exceeded")
@@ -0,0 +1,726 @@
+"""HTTP transports used by `GSConnection` and `AsyncGSConnection`.
+
+`GSSession` is a `requests.Session` and `AsyncGSTransport` an httpx transport. Both run
+every request made to Gradescope through the connection's policies (circuit breaker, rate
+limiting and retries), so the functions that take a session or client honor them without
+changes. Requests to other hosts, such as the file host serving submissions, are only
+subject to the connection's timeout and the current deadline (see `timeouts`).
+
+`GSSession` and `AsyncGSClient` also log in again when the session expires (see
+`GSConnection.login`): the first caller to notice runs the login while the others wait
+for it, then idempotent requests that failed because of the expiry are sent again.
+
+Connection pools are configured with `PoolConfig`. A `GSTransport` (or an `AsyncGSTransport`)
+can be given to several connections, which then share its pools and policies while keeping
+their own logins.
+"""
+
+import asyncio
+import contextvars
+import copy
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes._helpers._login_helpers import is_session_expired
+from gradescopeapi.classes.cache import ResponseCache
+from gradescopeapi.classes.ratelimit import (
+    AdaptiveRateLimiter,
+    RateLimiter,
+    parse_retry_after,
+)
+from gradescopeapi.classes.result_store import ResultStore, get_scope
+from gradescopeapi.classes.retry import CircuitBreaker, RetryPolicy
+from gradescopeapi.classes.timeouts import DEFAULT_TIMEOUT, Timeout
+
+# set while logging in again, so the login's own requests are not checked for expiry
+_relogging_in: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "gradescopeapi_relogging_in", default=False
+)
+
+
+class TimeoutAdapter(HTTPAdapter):
+    """`HTTPAdapter` giving every request a timeout, shortened to fit the current deadline.
+
+    Args:
+        timeout (Timeout): Used for requests made without an explicit timeout.
+            Defaults to `DEFAULT_TIMEOUT`.
+    """
+
+    def __init__(self, timeout: Timeout = DEFAULT_TIMEOUT, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout = timeout
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        kwargs["timeout"] = timeouts.cap_timeout(kwargs["timeout"])
+        try:
+            return super().send(request, **kwargs)
+        except requests.Timeout as e:
+            # a timeout shortened by the deadline is the deadline running out
+            try:
+                timeouts.check_deadline()
+            except timeouts.DeadlineExceeded as deadline_error:
+                raise deadline_error from e
+            raise
+
+
+class GSAdapter(TimeoutAdapter):
+    """`TimeoutAdapter` also applying the connection's policies to each request it sends.
+
+    Working at the adapter level means each redirect hop is limited and retried on its own.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None else AdaptiveRateLimiter()
+        )
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        )
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        # streamed bodies (e.g. file uploads) are consumed by the first attempt
+        replayable = request.body is None or isinstance(request.body, (str, bytes))
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            self.rate_limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = super().send(request, **kwargs)
+            except timeouts.DeadlineExceeded:
+                self.circuit_breaker.abandon()
+                raise
+            except Exception as e:
+                self.rate_limiter.feedback(None, time.monotonic() - start)
+                self.circuit_breaker.record(None)
+                if not isinstance(
+                    e, requests.RequestException
+                ) or not self.retry_policy.should_retry(
+                    attempt,
+                    request.method,
+                    None,
+                    connect_error=_is_connect_error(e),
+                    replayable=replayable,
+                ):
+                    raise
+                timeouts.sleep(self.retry_policy.backoff(attempt))
+                attempt += 1
+                continue
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.rate_limiter.feedback(
+                response.status_code, time.monotonic() - start, retry_after
+            )
+            self.circuit_breaker.record(response.status_code)
+            if not self.retry_policy.should_retry(
+                attempt,
+                request.method,
+                response.status_code,
+                replayable=replayable,
+                retry_after=retry_after,
+            ):
+                return response
+            response.close()
+            timeouts.sleep(self.retry_policy.backoff(attempt, retry_after))
+            attempt += 1
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings of a connection's transport.
+
+    Attributes:
+        max_connections_per_host (int): Connections kept open to each host. Raise it to at
+            least the number of threads making requests at once, or extra connections are
+            opened and thrown away after each request. Defaults to 10.
+        max_hosts (int): Hosts a connection pool is kept for (requests only). Defaults to 10.
+        max_connections (int | None): Open connections over all hosts (httpx only).
+            Defaults to 100.
+        max_keepalive_connections (int | None): Idle connections kept alive over all hosts
+            (httpx only). Defaults to 20.
+        keepalive_expiry (float | None): Seconds an idle connection is kept alive (httpx only).
+            Defaults to 5.
+        http2 (bool): Use HTTP/2 with servers supporting it (httpx only). Requires the `h2`
+            package: `pip install gradescopeapi[http2]`. Defaults to False.
+    """
+
+    max_connections_per_host: int = 10
+    max_hosts: int = 10
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0
+    http2: bool = False
+
+    def adapter_kwargs(self) -> dict:
+        """Arguments of `requests.adapters.HTTPAdapter`"""
+        return {
+            "pool_connections": self.max_hosts,
+            "pool_maxsize": self.max_connections_per_host,
+        }
+
+    def httpx_transport(self) -> httpx.AsyncHTTPTransport:
+        """An httpx transport with these settings"""
+        return httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            http2=self.http2,
+        )
+
+
+class GSTransport:
+    """Connection pools and policies used by `GSSession`, which several sessions can share.
+
+    Sessions only keep their cookies and headers (i.e. who is logged in) to themselves, so a
+    service working for many accounts can give all of their connections one transport: they
+    then reuse the same sockets, and share the rate limiter, retry policy and circuit breaker
+    protecting Gradescope.
+
+    Args:
+        gradescope_base_url (str): Requests to URLs under this base go through the policies.
+        rate_limiter (RateLimiter | None): Defaults to an `AdaptiveRateLimiter`.
+        retry_policy (RetryPolicy | None): Defaults to a `RetryPolicy`.
+        circuit_breaker (CircuitBreaker | None): Defaults to a `CircuitBreaker`.
+        timeout (Timeout): Timeout of requests made without an explicit one, to any host.
+            Defaults to `DEFAULT_TIMEOUT`.
+        pool (PoolConfig | None): Defaults to `PoolConfig()`.
+    """
+
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool: PoolConfig | None = None,
+    ):
+        self.gradescope_base_url = gradescope_base_url
+        self.pool = pool if pool is not None else PoolConfig()
+        self.gradescope_adapter = GSAdapter(
+            rate_limiter,
+            retry_policy,
+            circuit_breaker,
+            timeout=timeout,
+            **self.pool.adapter_kwargs(),
+        )
+        # every other host, e.g. the file host serving submissions
+        self.default_adapter = TimeoutAdapter(timeout, **self.pool.adapter_kwargs())
+
+    def mount(self, session: requests.Session):
+        session.mount("https://", self.default_adapter)
+        session.mount("http://", self.default_adapter)
+        session.mount(self.gradescope_base_url, self.gradescope_adapter)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.gradescope_adapter.close()
+        self.default_adapter.close()
+
+    def stats(self) -> dict:
+        """Counters of the transport's policies, for monitoring"""
+        adapter = self.gradescope_adapter
+        return _policy_stats(
+            adapter.rate_limiter, adapter.retry_policy, adapter.circuit_breaker
+        )
+
+
+class GSSession(requests.Session):
+    """`requests.Session` that applies the connection's policies to requests made to Gradescope.
+
+    Args:
+        gradescope_base_url (str): Requests to URLs under this base go through the policies.
+        rate_limiter (RateLimiter | None): Defaults to an `AdaptiveRateLimiter`.
+        retry_policy (RetryPolicy | None): Defaults to a `RetryPolicy`.
+        circuit_breaker (CircuitBreaker | None): Defaults to a `CircuitBreaker`.
+        timeout (Timeout): Timeout of requests made without an explicit one, to any host.
+            Defaults to `DEFAULT_TIMEOUT`.
+        pool (PoolConfig | None): Defaults to `PoolConfig()`.
+        transport (GSTransport | None): Transport shared with other sessions. When given, it
+            provides the policies and pools: the other arguments must be left out, and
+            closing the session leaves the transport open. Defaults to a new transport.
+        cache (ResponseCache | None): Cache answering repeated GET requests to Gradescope,
+            see `cache`. Defaults to None (no caching).
+        result_store (ResultStore | None): Store of scraped results, see `result_store`.
+            Used once `user` is set. Defaults to None.
+
+    Raises:
+        ValueError: If a transport is given along with policies or pool settings, or for
+            another Gradescope base URL.
+    """
+
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool: PoolConfig | None = None,
+        transport: GSTransport | None = None,
+        cache: ResponseCache | None = None,
+        result_store: ResultStore | None = None,
+    ):
+        super().__init__()
+        self.gradescope_base_url = gradescope_base_url
+        self.cache = cache
+        self.result_store = result_store
+        # account the session is logged in to, set by GSConnection.login
+        self.user: str | None = None
+        self.owns_transport = transport is None
+        if transport is None:
+            transport = GSTransport(
+                gradescope_base_url,
+                rate_limiter,
+                retry_policy,
+                circuit_breaker,
+                timeout,
+                pool,
+            )
+        else:
+            _check_shared_transport(
+                transport.gradescope_base_url,
+                gradescope_base_url,
+                rate_limiter,
+                retry_policy,
+                circuit_breaker,
+                timeout,
+                pool,
+            )
+        self.transport = transport
+        self.adapter = transport.gradescope_adapter
+        transport.mount(self)
+        # called to log in again when the session expires, set by GSConnection.login
+        self.relogin: Callable[[], None] | None = None
+        self.relogins = 0
+        self._login_generation = 0
+        self._relogin_lock = threading.Lock()
+
+    def close(self):
+        if self.owns_transport:
+            super().close()
+
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        if not self.is_gradescope_url(url):
+            return self._request(method, url, *args, **kwargs)
+        if method.upper() not in _SAFE_METHODS:
+            try:
+                return self._request(method, url, *args, **kwargs)
+            finally:
+                _invalidate(self, url)
+
+        cache_key = (
+            None
+            if self.cache is None
+            else _cache_key(self.cache, method, url, args, kwargs)
+        )
+        if cache_key is None:
+            return self._request(method, url, *args, **kwargs)
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            # a copy, so callers changing their response do not change the cached one
+            return copy.copy(cached)
+        conditional_headers = self.cache.conditional_headers(cache_key)
+        if conditional_headers:
+            response = self._request(
+                method,
+                url,
+                **{
+                    **kwargs,
+                    "headers": {**(kwargs.get("headers") or {}), **conditional_headers},
+                },
+            )
+            if response.status_code == requests.codes.not_modified:
+                response.close()
+                cached = self.cache.revalidate(cache_key)
+                if cached is not None:
+                    return copy.copy(cached)
+                # dropped from the cache meanwhile: fetch the page again
+                response = self._request(method, url, *args, **kwargs)
+        else:
+            response = self._request(method, url, *args, **kwargs)
+        if response.status_code == 200 and not is_session_expired(response):
+            self.cache.put(cache_key, response, len(response.content))
+        return response
+
+    def _request(self, method, url, *args, **kwargs) -> requests.Response:
+        generation = self._login_generation
+        response = super().request(method, url, *args, **kwargs)
+        if (
+            self.relogin is None
+            or _relogging_in.get()
+            or not self.is_gradescope_url(url)
+            or not is_session_expired(response)
+        ):
+            return response
+
+        self.refresh_login(generation)
+        if method.upper() not in RetryPolicy.IDEMPOTENT_METHODS:
+            return response
+        response.close()
+        return super().request(method, url, *args, **kwargs)
+
+    def refresh_login(self, generation: int):
+        """Log in again, unless another caller already did since login `generation`"""
+        with self._relogin_lock:
+            if generation != self._login_generation:
+                return
+            token = _relogging_in.set(True)
+            try:
+                self.relogin()
+            finally:
+                _relogging_in.reset(token)
+            self._login_generation += 1
+            self.relogins += 1
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self.adapter.rate_limiter
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self.adapter.retry_policy
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self.adapter.circuit_breaker
+
+    def is_gradescope_url(self, url: str) -> bool:
+        return url.startswith(self.gradescope_base_url)
+
+    def stats(self) -> dict:
+        """Counters of the session's policies and cache, for monitoring"""
+        stats = _policy_stats(
+            self.rate_limiter, self.retry_policy, self.circuit_breaker
+        )
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+
+class AsyncGSTransport(httpx.AsyncBaseTransport):
+    """httpx transport that applies the connection's policies to requests made to Gradescope.
+
+    Like `GSTransport`, it can be shared by several `AsyncGSConnection`s, which then reuse the
+    same connection pool and policies.
+
+    Args:
+        gradescope_base_url (str): Requests to URLs under this base go through the policies.
+        rate_limiter (RateLimiter | None): Defaults to an `AdaptiveRateLimiter`.
+        transport (httpx.AsyncBaseTransport | None): Transport that actually sends the
+            requests. Defaults to a new `httpx.AsyncHTTPTransport` configured by `pool`.
+        retry_policy (RetryPolicy | None): Defaults to a `RetryPolicy`.
+        circuit_breaker (CircuitBreaker | None): Defaults to a `CircuitBreaker`.
+        pool (PoolConfig | None): Defaults to `PoolConfig()`. Unused if `transport` is given.
+
+    Requests to any host are also given the time left before the current deadline as
+    timeout, if that is shorter than their own.
+    """
+
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        rate_limiter: RateLimiter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        pool: PoolConfig | None = None,
+    ):
+        self.gradescope_base_url = gradescope_base_url
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None else AdaptiveRateLimiter()
+        )
+        if transport is None:
+            transport = (pool if pool is not None else PoolConfig()).httpx_transport()
+        self.transport = transport
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        )
+
+    def is_gradescope_url(self, url: str) -> bool:
+        return url.startswith(self.gradescope_base_url)
+
+    def stats(self) -> dict:
+        """Counters of the transport's policies, for monitoring"""
+        return _policy_stats(self.rate_limiter, self.retry_policy, self.circuit_breaker)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.is_gradescope_url(str(request.url)):
+            return await self._send_with_deadline(request)
+
+        replayable = isinstance(request.stream, httpx.ByteStream)
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            await self.rate_limiter.acquire_async()
+            start = time.monotonic()
+            try:
+                response = await self._send_with_deadline(request)
+            except timeouts.DeadlineExceeded:
+                self.circuit_breaker.abandon()
+                raise
+            except Exception as e:
+                self.rate_limiter.feedback(None, time.monotonic() - start)
+                self.circuit_breaker.record(None)
+                if not isinstance(
+                    e, httpx.TransportError
+                ) or not self.retry_policy.should_retry(
+                    attempt,
+                    request.method,
+                    None,
+                    connect_error=isinstance(
+                        e, (httpx.ConnectError, httpx.ConnectTimeout)
+                    ),
+                    replayable=replayable,
+                ):
+                    raise
+                await timeouts.sleep_async(self.retry_policy.backoff(attempt))
+                attempt += 1
+                continue
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.rate_limiter.feedback(
+                response.status_code, time.monotonic() - start, retry_after
+            )
+            self.circuit_breaker.record(response.status_code)
+            if not self.retry_policy.should_retry(
+                attempt,
+                request.method,
+                response.status_code,
+                replayable=replayable,
+                retry_after=retry_after,
+            ):
+                return response
+            await response.aclose()
+            await timeouts.sleep_async(self.retry_policy.backoff(attempt, retry_after))
+            attempt += 1
+
+    async def _send_with_deadline(self, request: httpx.Request) -> httpx.Response:
+        if timeouts.remaining() is not None:
+            timeout = request.extensions.get("timeout", {})
+            request.extensions["timeout"] = {
+                key: timeouts.cap_timeout(timeout.get(key))
+                for key in ("connect", "read", "write", "pool")
+            }
+        try:
+            return await self.transport.handle_async_request(request)
+        except httpx.TimeoutException as e:
+            try:
+                timeouts.check_deadline()
+            except timeouts.DeadlineExceeded as deadline_error:
+                raise deadline_error from e
+            raise
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class AsyncGSClient(httpx.AsyncClient):
+    """`httpx.AsyncClient` logging in again when the session expires, answering repeated
+    GET requests from its `cache` and keeping its `result_store` up to date (if any), like
+    `GSSession`."""
+
+    def __init__(
+        self,
+        gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+        cache: ResponseCache | None = None,
+        result_store: ResultStore | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.gradescope_base_url = gradescope_base_url
+        self.cache = cache
+        self.result_store = result_store
+        # account the client is logged in to, set by AsyncGSConnection.login
+        self.user: str | None = None
+        # called to log in again when the session expires, set by AsyncGSConnection.login
+        self.relogin: Callable[[], Awaitable[None]] | None = None
+        self.relogins = 0
+        self._login_generation = 0
+        self._relogin_lock = asyncio.Lock()
+
+    async def request(self, method: str, url, **kwargs) -> httpx.Response:
+        if not str(url).startswith(self.gradescope_base_url):
+            return await self._request(method, url, **kwargs)
+        if method.upper() not in _SAFE_METHODS:
+            try:
+                return await self._request(method, url, **kwargs)
+            finally:
+                _invalidate(self, str(url))
+
+        cache_key = (
+            None
+            if self.cache is None
+            else _cache_key(self.cache, method, url, (), kwargs)
+        )
+        if cache_key is None:
+            return await self._request(method, url, **kwargs)
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return copy.copy(cached)
+        conditional_headers = self.cache.conditional_headers(cache_key)
+        if conditional_headers:
+            response = await self._request(
+                method,
+                url,
+                **{
+                    **kwargs,
+                    "headers": {**(kwargs.get("headers") or {}), **conditional_headers},
+                },
+            )
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                cached = self.cache.revalidate(cache_key)
+                if cached is not None:
+                    return copy.copy(cached)
+                response = await self._request(method, url, **kwargs)
+        else:
+            response = await self._request(method, url, **kwargs)
+        if response.status_code == 200 and not is_session_expired(response):
+            self.cache.put(cache_key, response, len(response.content))
+        return response
+
+    async def _request(self, method: str, url, **kwargs) -> httpx.Response:
+        generation = self._login_generation
+        response = await super().request(method, url, **kwargs)
+        if (
+            self.relogin is None
+            or _relogging_in.get()
+            or not str(url).startswith(self.gradescope_base_url)
+            or not is_session_expired(response)
+        ):
+            return response
+
+        await self.refresh_login(generation)
+        if method.upper() not in RetryPolicy.IDEMPOTENT_METHODS:
+            return response
+        return await super().request(method, url, **kwargs)
+
+    async def refresh_login(self, generation: int):
+        """Log in again, unless another caller already did since login `generation`"""
+        async with self._relogin_lock:
+            if generation != self._login_generation:
+                return
+            token = _relogging_in.set(True)
+            try:
+                await self.relogin()
+            finally:
+                _relogging_in.reset(token)
+            self._login_generation += 1
+            self.relogins += 1
+
+
+class SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """Lets a client use a transport it does not own: closing the client leaves it open."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# options that do not change the response of a request
+_CACHE_NEUTRAL_OPTIONS = frozenset({"params", "timeout", "allow_redirects"})
+
+
+def _cache_key(
+    cache: ResponseCache, method: str, url, args: tuple, kwargs: dict
+) -> str | None:
+    """URL under which the response to a request is cached, None if it is not cacheable"""
+    if method.upper() != "GET" or args or kwargs.get("allow_redirects") is False:
+        return None
+    for name, value in kwargs.items():
+        # httpx passes every option, set to None or USE_CLIENT_DEFAULT when not given
+        if (
+            name not in _CACHE_NEUTRAL_OPTIONS
+            and value is not None
+            and value is not httpx.USE_CLIENT_DEFAULT
+        ):
+            return None
+    params = kwargs.get("params")
+    key = str(httpx.URL(str(url)).copy_merge_params(params) if params else url)
+    return key if cache.ttl(key) > 0 else None
+
+
+def _invalidate(client: "GSSession | AsyncGSClient", url: str):
+    """Drop the cached pages and stored results that a write request to `url` may change"""
+    if client.cache is not None:
+        client.cache.invalidate(url)
+    if client.result_store is not None and client.user is not None:
+        client.result_store.invalidate(
+            get_scope(client.gradescope_base_url, client.user), url
+        )
+
+
+def _check_shared_transport(
+    transport_base_url: str,
+    gradescope_base_url: str,
+    rate_limiter: RateLimiter | None,
+    retry_policy: RetryPolicy | None,
+    circuit_breaker: CircuitBreaker | None,
+    timeout: Timeout,
+    pool: PoolConfig | None,
+):
+    """Raise ValueError if settings belonging to a shared transport were also given"""
+    if transport_base_url != gradescope_base_url:
+        raise ValueError(
+            f"The transport is for {transport_base_url}, not {gradescope_base_url}."
+        )
+    if (
+        rate_limiter is not None
+        or retry_policy is not None
+        or circuit_breaker is not None
+        or timeout is not DEFAULT_TIMEOUT
+        or pool is not None
+    ):
+        raise ValueError(
+            "Policies, timeout and pool settings of a shared transport must be given to the transport."
+        )
+
+
+def _is_connect_error(error: Exception) -> bool:
+    """Whether a requests exception happened before the request could reach the server"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        reason = getattr(error.args[0], "reason", error.args[0])
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+    return False
+
+
+def _policy_stats(
+    rate_limiter: RateLimiter,
+    retry_policy: RetryPolicy,
+    circuit_breaker: CircuitBreaker,
+) -> dict:
+    return {
+        "rate_limiter": rate_limiter.stats(),
+        "retry": retry_policy.stats(),
+        "circuit_breaker": circuit_breaker.stats(),
+    }
@@ -4,11 +4,14 @@ import io
 import mimetypes
 import pathlib
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from gradescopeapi import DEFAULT_GRADESCOPE_BASE_URL
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes._helpers._login_helpers import get_csrf_token
+from gradescopeapi.classes.parsing import make_soup
 
 
 def upload_assignment(
@@ -18,6 +21,7 @@ def upload_assignment(
     *files: io.TextIOWrapper,
     leaderboard_name: str | None = None,
     gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    deadline: float | None = None,
 ) -> str | None:
     """Uploads given file objects to the specified assignment on Gradescope.
 
@@ -27,6 +31,7 @@ def upload_assignment(
         assignment_id (str): The ID of the assignment on Gradescope.
         *files (io.TextIOWrapper): Variable number of file objects to upload.
         leaderboard_name (str | None, optional): The name of the leaderboard. Defaults to None.
+        deadline (float | None, optional): Seconds both requests may take in total, see `timeouts.deadline`. Defaults to None.
 
     Returns:
         str | None: Link to submission if successful or None if unsuccessful.
@@ -34,12 +39,67 @@ def upload_assignment(
     GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
     GS_UPLOAD_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/submissions"
 
-    # Get auth token
-    # TODO: Refactor to helper function since it is needed in multiple places
-    response = session.get(GS_COURSE_ENDPOINT)
-    soup = BeautifulSoup(response.text, "html.parser")
-    auth_token = soup.find("meta", {"name": "csrf-token"})["content"]
+    with timeouts.deadline(deadline):
+        # Get auth token
+        response = session.get(GS_COURSE_ENDPOINT)
+        soup = make_soup(response.text)
+        auth_token = get_csrf_token(soup)
 
+        multipart = _get_upload_form(auth_token, files, leaderboard_name)
+
+        headers = {
+            "Content-Type": multipart.content_type,
+            "Referer": GS_COURSE_ENDPOINT,
+        }
+        response = session.post(GS_UPLOAD_ENDPOINT, data=multipart, headers=headers)
+
+        return _get_submission_link(response.url, GS_COURSE_ENDPOINT)
+
+
+async def upload_assignment_async(
+    client: httpx.AsyncClient,
+    course_id: str,
+    assignment_id: str,
+    *files: io.TextIOWrapper,
+    leaderboard_name: str | None = None,
+    gradescope_base_url: str = DEFAULT_GRADESCOPE_BASE_URL,
+    deadline: float | None = None,
+) -> str | None:
+    """Uploads given file objects to the specified assignment on Gradescope, without blocking the event loop.
+
+    Same as `upload_assignment`, but uses an `httpx.AsyncClient` for the requests.
+
+    Returns:
+        str | None: Link to submission if successful or None if unsuccessful.
+    """
+    GS_COURSE_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}"
+    GS_UPLOAD_ENDPOINT = f"{gradescope_base_url}/courses/{course_id}/assignments/{assignment_id}/submissions"
+
+    with timeouts.deadline(deadline):
+        # Get auth token
+        response = await client.get(GS_COURSE_ENDPOINT)
+        soup = make_soup(response.text)
+        auth_token = get_csrf_token(soup)
+
+        multipart = _get_upload_form(auth_token, files, leaderboard_name)
+
+        headers = {
+            "Content-Type": multipart.content_type,
+            "Referer": GS_COURSE_ENDPOINT,
+        }
+        response = await client.post(
+            GS_UPLOAD_ENDPOINT, content=multipart.to_string(), headers=headers
+        )
+
+        return _get_submission_link(str(response.url), GS_COURSE_ENDPOINT)
+
+
+def _get_upload_form(
+    auth_token: str,
+    files: tuple[io.TextIOWrapper, ...],
+    leaderboard_name: str | None,
+) -> MultipartEncoder:
+    """Build the multipart form used by the submission dialog"""
     # Format files for upload
     form_files = []
     for file in files:
@@ -64,19 +124,15 @@ def upload_assignment(
     if leaderboard_name is not None:
         fields.append(("submission[leaderboard_name]", leaderboard_name))
 
-    multipart = MultipartEncoder(fields=fields)
+    return MultipartEncoder(fields=fields)
 
-    headers = {
-        "Content-Type": multipart.content_type,
-        "Referer": GS_COURSE_ENDPOINT,
-    }
-    response = session.post(GS_UPLOAD_ENDPOINT, data=multipart, headers=headers)
 
+def _get_submission_link(response_url: str, course_endpoint: str) -> str | None:
     # Note: Response status code is always 200 even if upload was unsuccessful (e.g. past the due date,
     # missing form fields, etc.). The response from the server either redirects to the submission page (url)
     # if successful, or redirects to the Course homepage if unsuccessful.
     return (
         None
-        if response.url == GS_COURSE_ENDPOINT or response.url.endswith("submissions")
-        else response.url
+        if response_url == course_endpoint or response_url.endswith("submissions")
+        else response_url
     )
@@ -1,9 +1,14 @@
+import asyncio
 import os
 
 import pytest
 from dotenv import load_dotenv
 
+from gradescopeapi.classes.async_connection import AsyncGSConnection
 from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.retry import RetryPolicy
+from tests.gradescope_stub import StubGradescope
 
 load_dotenv()
 
@@ -36,3 +41,46 @@ def create_session():
         return connection.session
 
     return _create_session
+
+
+@pytest.fixture
+def gradescope_stub():
+    """Starts a local stand-in for Gradescope (see tests/gradescope_stub.py)"""
+    stub = StubGradescope().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def stub_connection(gradescope_stub):
+    """GSConnection logged in to the local Gradescope stand-in"""
+    # the stub is fast and never overloaded: do not slow the tests down with rate limiting
+    # or waits between retries
+    connection = GSConnection(
+        gradescope_stub.base_url,
+        rate_limiter=RateLimiter(),
+        retry_policy=RetryPolicy(backoff_factor=0),
+    )
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+    return connection
+
+
+@pytest.fixture
+def run_with_account(gradescope_stub):
+    """Runs `coroutine_fn(account)` with an AsyncAccount logged in to the local Gradescope
+    stand-in, and returns its result"""
+
+    def run(coroutine_fn, **kwargs):
+        kwargs.setdefault("rate_limiter", RateLimiter())
+        kwargs.setdefault("retry_policy", RetryPolicy(backoff_factor=0))
+
+        async def main():
+            async with AsyncGSConnection(
+                gradescope_stub.base_url, **kwargs
+            ) as connection:
+                await connection.login(gradescope_stub.email, gradescope_stub.password)
+                return await coroutine_fn(connection.account)
+
+        return asyncio.run(main())
+
+    return run
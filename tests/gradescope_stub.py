@@ -0,0 +1,540 @@
+"""A small local stand-in for the Gradescope web app, used by tests that must run offline.
+
+The pages only contain the markup that the scraping helpers look at. All data lives on
+the `StubGradescope` instance so tests can inspect or change it while the server runs.
+"""
+
+import hashlib
+import html
+import io
+import json
+import re
+import secrets
+import threading
+import time
+import urllib.parse
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_EMAIL = "instructor@example.com"
+STUB_PASSWORD = "password"
+
+COURSE_ID = "100001"
+ASSIGNMENT_ID = "200001"
+QUESTION_ID = "500001"
+
+
+class StubGradescope:
+    def __init__(self, num_submissions: int = 3):
+        self.email = STUB_EMAIL
+        self.password = STUB_PASSWORD
+        self.sessions: set[str] = set()
+        self.requests: list[tuple[str, str]] = []
+        self.lock = threading.Lock()
+
+        self.courses = {
+            COURSE_ID: ("CS 101", "Intro to Computer Science", "Fall 2024", 2),
+            "100002": ("CS 102", "Data Structures", "Spring 2025", 0),
+        }
+        self.members = [
+            ("Ada Lovelace", "ada@example.com", "600001", "0", 1),
+            ("Alan Turing", "alan@example.com", "600002", "0", 0),
+            ("Grace Hopper", STUB_EMAIL, "600003", "1", 0),
+        ]
+        self.assignments = {
+            ASSIGNMENT_ID: ("Homework 1", "2024-04-15T00:00:00.000000-04:00"),
+            "200002": ("Homework 2", "2024-04-22T00:00:00.000000-04:00"),
+        }
+        self.submissions = {
+            str(300001 + i): f"Student {i}" for i in range(num_submissions)
+        }
+        self.extensions = {
+            "600001": ("Ada Lovelace", "2024-04-18T23:59:00"),
+        }
+        self.files = {
+            f"/files/{submission_id}/main.py": f"print({submission_id})\n".encode()
+            for submission_id in self.submissions
+        }
+        # paths of the page images of PDF/image submissions, by submission ID
+        self.pages: dict[str, list[str]] = {}
+        self.uploads: list[bytes] = []
+        # Range headers of the requests for files, None for requests without one
+        self.ranges: list[str | None] = []
+        # ETags of files end with this, like those of S3 for files uploaded in parts
+        # (e.g. "-2"), which are not the MD5 of the file
+        self.etag_suffix = ""
+        # files whose transfer is cut after the given number of bytes
+        self.cut_files: dict[str, int] = {}
+        # number of conditional GET requests answered with 304 Not Modified
+        self.not_modified = 0
+        self.posts: list[tuple[str, bytes]] = []
+        # status checks of an export answered with "processing" before it completes
+        self.export_polls = 1
+        self.exports: dict[str, int] = {}
+
+        # knobs for simulating a struggling server: seconds to wait before answering
+        # each request, and status codes to answer given paths with. A list of status
+        # codes is used up one request at a time, after which the path works again.
+        self.delay = 0.0
+        self.fail_paths: dict[str, int | list[int]] = {}
+        self.fail_headers: dict[str, str] = {}
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, path_prefix: str, method: str = "GET") -> int:
+        """Number of requests received whose path starts with `path_prefix`"""
+        with self.lock:
+            return sum(
+                1 for m, p in self.requests if m == method and p.startswith(path_prefix)
+            )
+
+    # pages
+
+    def login_page(self) -> str:
+        return (
+            '<html><body><form action="/login" method="post">'
+            '<input type="hidden" name="authenticity_token" value="login-token">'
+            "</form></body></html>"
+        )
+
+    def account_page(self) -> str:
+        terms: dict[str, list[str]] = {}
+        for course_id, (name, full_name, term, num_assignments) in self.courses.items():
+            terms.setdefault(term, []).append(
+                f'<a class="courseBox" href="/courses/{course_id}">'
+                f'<h3 class="courseBox--shortname">{name}</h3>'
+                f'<div class="courseBox--name">{full_name}</div>'
+                '<div class="courseBox--noGradesPublised">0 grades published</div>'
+                '<div class="courseBox--assignments courseBox--assignments-unpublished">'
+                f"{num_assignments} assignments</div></a>"
+            )
+        course_list = "".join(
+            f'<div class="courseList--term pageSubheading">{term}</div>'
+            f'<div class="courseList--coursesForTerm">{"".join(boxes)}</div>'
+            for term, boxes in terms.items()
+        )
+        return (
+            '<html><head><meta name="csrf-token" content="csrf-token"></head><body>'
+            '<h1 class="pageHeading">Your Courses</h1>'
+            "<button> Create a new course</button>"
+            f'<div class="courseList">{course_list}</div>'
+            "</body></html>"
+        )
+
+    def memberships_page(self) -> str:
+        rows = []
+        for full_name, email, member_id, role, num_submissions in self.members:
+            first_name, last_name = full_name.split(" ", 1)
+            data_cm = html.escape(
+                json.dumps(
+                    {
+                        "full_name": full_name,
+                        "first_name": first_name,
+                        "last_name": last_name,
+                        "sid": None,
+                    }
+                )
+            )
+            rows.append(
+                '<tr class="rosterRow"><td>'
+                f'<button class="rosterCell--editIcon" data-cm="{data_cm}" '
+                f'data-email="{email}" data-id="{member_id}" data-role="{role}" '
+                'data-sections="[]"></button></td>'
+                f"<td>{email}</td><td>{role}</td><td>{num_submissions}</td></tr>"
+            )
+        return (
+            '<html><body><table class="js-rosterTable"><thead><tr>'
+            "<th>Name</th><th>Email</th><th>Role</th><th>Submissions</th>"
+            f"</tr></thead><tbody>{''.join(rows)}</tbody></table></body></html>"
+        )
+
+    def course_page(self, course_id: str) -> str:
+        table_data = [{"type": "section", "title": "Week 1"}]
+        for assignment_id, (title, release_date) in self.assignments.items():
+            table_data.append(
+                {
+                    "type": "assignment",
+                    "url": f"/courses/{course_id}/assignments/{assignment_id}",
+                    "title": title,
+                    "submission_window": {
+                        "release_date": release_date,
+                        "due_date": release_date.replace("T00:00", "T23:59"),
+                        "hard_due_date": None,
+                    },
+                    "total_points": "10.0",
+                }
+            )
+        props = html.escape(json.dumps({"table_data": table_data}))
+        return (
+            '<html><head><meta name="csrf-token" content="csrf-token"></head><body>'
+            f'<div data-react-class="AssignmentsTable" data-react-props="{props}"></div>'
+            "</body></html>"
+        )
+
+    def assignment_page(self, course_id: str, assignment_id: str) -> str:
+        rows = "".join(
+            '<tr><td class="table--primaryLink">'
+            f'<a href="/courses/{course_id}/assignments/{assignment_id}/submissions/{submission_id}">'
+            f"{student}</a></td></tr>"
+            for submission_id, student in self.submissions.items()
+        )
+        return f"<html><body><table><tbody>{rows}</tbody></table></body></html>"
+
+    def submission_json(self, submission_id: str, only_keys: list[str]) -> str:
+        if submission_id in self.pages:
+            text_files = []
+            # listed in no particular order, like Gradescope's
+            pages = [
+                {"id": 700000 + number, "number": number, "url": self.base_url + path}
+                for number, path in reversed(
+                    list(enumerate(self.pages[submission_id], start=1))
+                )
+            ]
+        else:
+            text_files = [
+                {"file": {"url": f"{self.base_url}/files/{submission_id}/main.py"}}
+            ]
+            pages = []
+        data = {
+            "text_files": text_files,
+            "file_comments": {},
+            "pages": pages,
+            "outline": {"questions": []},
+        }
+        if only_keys:
+            data = {key: value for key, value in data.items() if key in only_keys}
+        return json.dumps(data)
+
+    def export_archive(self) -> bytes:
+        """Archive of the submissions, written like an archive streamed by a server:
+        sizes and checksums follow the content of each file, in data descriptors"""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(_Unseekable(buffer), "w", zipfile.ZIP_DEFLATED) as archive:
+            for submission_id, student in self.submissions.items():
+                path = f"/files/{submission_id}/main.py"
+                archive.writestr(
+                    f"{student} - {submission_id}/main.py", self.files[path]
+                )
+        return buffer.getvalue()
+
+    def extensions_page(self) -> str:
+        rows = []
+        for user_id, (name, due_date) in self.extensions.items():
+            props = html.escape(
+                json.dumps(
+                    {
+                        "override": {
+                            "user_id": int(user_id),
+                            "settings": {
+                                "due_date": {"type": "absolute", "value": due_date}
+                            },
+                        },
+                        "timezone": {"identifier": "America/New_York"},
+                        "deletePath": f"/courses/{COURSE_ID}/extensions/{user_id}",
+                        "studentName": name,
+                    }
+                )
+            )
+            rows.append(
+                f'<tr><td><div data-react-class="EditExtension" data-react-props="{props}">'
+                "</div></td></tr>"
+            )
+        return (
+            '<html><body><table class="table js-overridesTable">'
+            f"<tbody>{''.join(rows)}</tbody></table></body></html>"
+        )
+
+    def edit_assignment_page(self) -> str:
+        return (
+            '<html><body><form><input name="authenticity_token" value="edit-token">'
+            "</form></body></html>"
+        )
+
+    def graders_page(self) -> str:
+        return (
+            "<html><body><table><tr>"
+            "<td>Ada Lovelace</td><td>1.0</td><td>Grace Hopper</td>"
+            "</tr><tr>"
+            "<td>Alan Turing</td><td>0.0</td><td></td>"
+            "</tr></table></body></html>"
+        )
+
+
+class _Unseekable:
+    """Write-only file, which `zipfile` cannot go back in to fill in sizes"""
+
+    def __init__(self, file: io.BytesIO):
+        self.file = file
+
+    def write(self, data: bytes) -> int:
+        return self.file.write(data)
+
+    def flush(self):
+        pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def stub(self) -> StubGradescope:
+        return self.server.stub
+
+    def _session(self) -> str | None:
+        for cookie in self.headers.get_all("Cookie", []):
+            for part in cookie.split(";"):
+                name, _, value = part.strip().partition("=")
+                if name == "_gradescope_session":
+                    return value
+        return None
+
+    def _logged_in(self) -> bool:
+        return self._session() in self.stub.sessions
+
+    def _send(
+        self,
+        status: int,
+        body: str | bytes = b"",
+        content_type: str = "text/html; charset=utf-8",
+        headers: dict | None = None,
+    ):
+        if isinstance(body, str):
+            body = body.encode()
+        if self.command == "GET" and status == 200:
+            # validators of the page, like the ETags of Rails
+            etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+            headers = {"ETag": etag, **(headers or {})}
+            if self.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+                with self.stub.lock:
+                    self.stub.not_modified += 1
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_file(self, body: bytes):
+        """Answer like S3: with the MD5 of the file as ETag, and Range requests"""
+        etag = f'"{hashlib.md5(body).hexdigest()}{self.stub.etag_suffix}"'
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+        content_type = "application/octet-stream"
+        range_header = self.headers.get("Range")
+        with self.stub.lock:
+            self.stub.ranges.append(range_header)
+            cut = self.stub.cut_files.get(urllib.parse.urlsplit(self.path).path)
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", range_header or "")
+        if_range = self.headers.get("If-Range")
+        if match is None or (if_range is not None and if_range != etag):
+            # the whole file, also when it changed since the If-Range validator
+            status = 200
+        else:
+            start = int(match[1])
+            end = min(int(match[2] or len(body) - 1), len(body) - 1)
+            if start >= len(body):
+                headers["Content-Range"] = f"bytes */{len(body)}"
+                return self._send(416, b"", content_type, headers)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            status, body = 206, body[start : end + 1]
+        if cut is None:
+            return self._send(status, body, content_type, headers)
+        # announce the whole body, send part of it and hang up
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body[:cut])
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _send_export(self, name: str):
+        generated_file_id, extension = name.rsplit(".", 1)
+        with self.stub.lock:
+            polls = self.stub.exports.get(generated_file_id)
+            if polls is None:
+                return self._send(404, "Not Found")
+            if extension == "json":
+                self.stub.exports[generated_file_id] = polls - 1
+        if extension == "json":
+            status = "processing" if polls > 0 else "completed"
+            return self._send_json(200, {"id": generated_file_id, "status": status})
+        if polls > 0:
+            return self._send(404, "Not Found")
+        return self._send(200, self.stub.export_archive(), "application/zip")
+
+    def _send_json(self, status: int, data):
+        self._send(status, json.dumps(data), "application/json; charset=utf-8")
+
+    def _redirect(self, location: str, headers: dict | None = None):
+        self._send(302, b"", headers={"Location": location, **(headers or {})})
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _injected_failure(self, path: str) -> int | None:
+        with self.stub.lock:
+            status = self.stub.fail_paths.get(path)
+            if isinstance(status, list):
+                if not status:
+                    return None
+                return status.pop(0)
+            return status
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        path = url.path
+        with self.stub.lock:
+            self.stub.requests.append(("GET", path))
+        parts = path.strip("/").split("/")
+
+        if self.stub.delay:
+            time.sleep(self.stub.delay)
+        status = self._injected_failure(path)
+        if status is not None:
+            return self._send(status, "Server Error", headers=self.stub.fail_headers)
+
+        if path == "/":
+            token = secrets.token_hex(8)
+            return self._send(
+                200,
+                self.stub.login_page(),
+                headers={"Set-Cookie": f"_gradescope_session={token}; Path=/"},
+            )
+        if parts[0] == "files" and path in self.stub.files:
+            return self._send_file(self.stub.files[path])
+
+        if not self._logged_in():
+            return self._send_json(
+                401, {"error": "You must be logged in to access this page."}
+            )
+
+        if path == "/account":
+            return self._send(200, self.stub.account_page())
+        if parts[0] != "courses" or parts[1] not in self.stub.courses:
+            return self._send(404, "Not Found")
+
+        course_id = parts[1]
+        match parts[2:]:
+            case []:
+                return self._send(200, self.stub.course_page(course_id))
+            case ["memberships"]:
+                return self._send(200, self.stub.memberships_page())
+            case ["questions", _, "submissions"]:
+                return self._send(200, self.stub.graders_page())
+            case ["generated_files", name]:
+                return self._send_export(name)
+            case ["assignments", assignment_id, *rest] if (
+                assignment_id in self.stub.assignments
+            ):
+                match rest:
+                    case []:
+                        return self._send(
+                            200, self.stub.assignment_page(course_id, assignment_id)
+                        )
+                    case ["edit"]:
+                        return self._send(200, self.stub.edit_assignment_page())
+                    case ["extensions"]:
+                        return self._send(200, self.stub.extensions_page())
+                    case ["submissions", name] if name.endswith(".json"):
+                        submission_id = name.removesuffix(".json")
+                        if submission_id in self.stub.submissions:
+                            return self._send(
+                                200,
+                                self.stub.submission_json(
+                                    submission_id,
+                                    urllib.parse.parse_qs(url.query).get(
+                                        "only_keys[]", []
+                                    ),
+                                ),
+                                "application/json; charset=utf-8",
+                            )
+                    case ["submissions", submission_id]:
+                        return self._send(200, f"<html>{submission_id}</html>")
+        return self._send(404, "Not Found")
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        path = url.path
+        with self.stub.lock:
+            self.stub.requests.append(("POST", path))
+        body = self._read_body()
+        status = self._injected_failure(path)
+        if status is not None:
+            return self._send(status, "Server Error", headers=self.stub.fail_headers)
+
+        if path == "/login":
+            params = dict(urllib.parse.parse_qsl(url.query))
+            if (
+                params.get("session[email]") == self.stub.email
+                and params.get("session[password]") == self.stub.password
+                and params.get("authenticity_token") == "login-token"
+            ):
+                token = secrets.token_hex(16)
+                with self.stub.lock:
+                    self.stub.sessions.add(token)
+                return self._redirect(
+                    "/account",
+                    headers={"Set-Cookie": f"_gradescope_session={token}; Path=/"},
+                )
+            return self._send(200, self.stub.login_page())
+
+        if not self._logged_in():
+            return self._send_json(
+                401, {"error": "You must be logged in to access this page."}
+            )
+        if self.headers.get("X-CSRF-Token") != "csrf-token":
+            return self._send(422, "Invalid CSRF token")
+
+        with self.stub.lock:
+            self.stub.posts.append((path, body))
+        parts = path.strip("/").split("/")
+        match parts:
+            case ["courses", course_id, "assignments", assignment_id] if (
+                assignment_id in self.stub.assignments
+            ):
+                return self._send(200, self.stub.edit_assignment_page())
+            case ["courses", course_id, "assignments", assignment_id, "extensions"]:
+                override = json.loads(body)["override"]
+                if override["user_id"] not in {m[2] for m in self.stub.members}:
+                    return self._send(404, "Not Found")
+                return self._send_json(200, {"success": True})
+            case ["courses", course_id, "assignments", assignment_id, "export"] if (
+                assignment_id in self.stub.assignments
+            ):
+                with self.stub.lock:
+                    generated_file_id = str(800001 + len(self.stub.exports))
+                    self.stub.exports[generated_file_id] = self.stub.export_polls
+                return self._send_json(200, {"generated_file_id": generated_file_id})
+            case ["courses", course_id, "assignments", assignment_id, "submissions"]:
+                if (
+                    assignment_id not in self.stub.assignments
+                    or b"filename=" not in body
+                ):
+                    return self._redirect(f"/courses/{course_id}")
+                with self.stub.lock:
+                    self.stub.uploads.append(body)
+                return self._redirect(
+                    f"/courses/{course_id}/assignments/{assignment_id}/submissions/399999"
+                )
+        return self._send(404, "Not Found")
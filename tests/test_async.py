@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from gradescopeapi.classes.async_account import AsyncAccount
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID, QUESTION_ID
+
+
+def test_async_login_invalid_credentials(gradescope_stub):
+    async def main():
+        async with AsyncGSConnection(gradescope_stub.base_url) as connection:
+            await connection.login(gradescope_stub.email, "notthepassword")
+
+    with pytest.raises(ValueError, match="Invalid credentials"):
+        asyncio.run(main())
+
+
+def test_async_results_match_sync(gradescope_stub, run_with_account):
+    """The async client shares the sync client's parsers, so results must be identical"""
+    connection = GSConnection(gradescope_stub.base_url)
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+    account = connection.account
+
+    async def fetch_all(async_account):
+        return await asyncio.gather(
+            async_account.get_courses(),
+            async_account.get_course_users(COURSE_ID),
+            async_account.get_assignments(COURSE_ID),
+            async_account.get_assignment_submissions(COURSE_ID, ASSIGNMENT_ID),
+            async_account.get_assignment_graders(COURSE_ID, QUESTION_ID),
+            async_account.get_extensions(COURSE_ID, ASSIGNMENT_ID),
+        )
+
+    courses, members, assignments, submissions, graders, extensions = run_with_account(
+        fetch_all
+    )
+
+    assert courses == account.get_courses()
+    assert courses["instructor"] and courses["student"] == {}
+    assert members == account.get_course_users(COURSE_ID)
+    assert len(members) == len(gradescope_stub.members)
+    assert assignments == account.get_assignments(COURSE_ID)
+    assert [a.assignment_id for a in assignments] == list(gradescope_stub.assignments)
+    assert submissions == account.get_assignment_submissions(COURSE_ID, ASSIGNMENT_ID)
+    assert graders == {"Grace Hopper"}
+    assert set(extensions) == set(gradescope_stub.extensions)
+
+
+def test_async_submissions_bounded_concurrency(gradescope_stub, run_with_account):
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(25)}
+
+    submissions = run_with_account(
+        lambda account: account.get_assignment_submissions(COURSE_ID, ASSIGNMENT_ID),
+        max_concurrency=4,
+    )
+
+    assert list(submissions) == list(gradescope_stub.submissions)
+    assert all(len(links) == 1 for links in submissions.values())
+
+
+def test_async_iter_assignment_submissions(gradescope_stub, run_with_account):
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(12)}
+    submission_ids = list(gradescope_stub.submissions)
+
+    async def collect(account):
+        return [
+            submission_id
+            async for submission_id, _ in account.iter_assignment_submissions(
+                COURSE_ID, ASSIGNMENT_ID, start_after=submission_ids[3]
+            )
+        ]
+
+    assert run_with_account(collect) == submission_ids[4:]
+
+
+def test_async_not_logged_in(gradescope_stub):
+    async def main():
+        async with AsyncGSConnection(gradescope_stub.base_url) as connection:
+            account = AsyncAccount(connection.client, gradescope_stub.base_url)
+            await account.get_assignments(COURSE_ID)
+
+    with pytest.raises(Exception, match="You must be logged in"):
+        asyncio.run(main())
+
+
+def test_async_writes(gradescope_stub, tmp_path, run_with_account):
+    upload_file = tmp_path / "main.py"
+    upload_file.write_text("print('hello')\n")
+    release_date = datetime(2024, 4, 15)
+
+    async def write_all(account):
+        with open(upload_file, "rb") as file:
+            link = await account.upload_assignment(COURSE_ID, ASSIGNMENT_ID, file)
+        extension_ok = await account.update_student_extension(
+            COURSE_ID,
+            ASSIGNMENT_ID,
+            "600001",
+            release_date,
+            release_date + timedelta(days=1),
+        )
+        with pytest.raises(ValueError, match="Dates must be in order"):
+            await account.update_student_extension(
+                COURSE_ID,
+                ASSIGNMENT_ID,
+                "600001",
+                release_date,
+                release_date - timedelta(days=1),
+            )
+        dates_ok = await account.update_assignment_date(
+            COURSE_ID, ASSIGNMENT_ID, release_date, release_date + timedelta(days=1)
+        )
+        return link, extension_ok, dates_ok
+
+    link, extension_ok, dates_ok = run_with_account(write_all)
+
+    assert link.endswith(f"/assignments/{ASSIGNMENT_ID}/submissions/399999")
+    assert gradescope_stub.uploads and b"print('hello')" in gradescope_stub.uploads[0]
+    assert extension_ok
+    assert dates_ok
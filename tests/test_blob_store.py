@@ -0,0 +1,82 @@
+import os
+
+from gradescopeapi.classes.blob_store import BlobStore, StoredFile
+from gradescopeapi.classes.downloads import download_submissions
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+
+def test_identical_files_are_stored_and_downloaded_once(
+    gradescope_stub, stub_connection, tmp_path
+):
+    # every submission is the starter code
+    for path in gradescope_stub.files:
+        gradescope_stub.files[path] = b"def main():\n    pass\n"
+    store = BlobStore(tmp_path / "store")
+    account = stub_connection.account
+
+    downloaded = account.download_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, tmp_path / "out", max_workers=1, store=store
+    )
+    assert downloaded.errors == {}
+    paths = [file.path for files in downloaded.values() for file in files]
+    assert len(paths) == len(gradescope_stub.submissions)
+    assert all(os.path.samefile(path, paths[0]) for path in paths)
+    assert len(list((tmp_path / "store" / "blobs").rglob("*"))) == 2  # directory, blob
+    # a single file was downloaded in full, the others were only checked
+    assert gradescope_stub.ranges.count(None) == 1
+    assert [file.skipped for files in downloaded.values() for file in files] == [
+        False,
+        True,
+        True,
+    ]
+
+    # the same files under another assignment are not downloaded either
+    gradescope_stub.ranges.clear()
+    submissions = {
+        submission_id: [f"{gradescope_stub.base_url}/files/{submission_id}/main.py"]
+        for submission_id in gradescope_stub.submissions
+    }
+    download_submissions(
+        stub_connection.session,
+        COURSE_ID,
+        "200002",
+        submissions,
+        tmp_path / "out",
+        store=store,
+    )
+    assert None not in gradescope_stub.ranges
+    assert len(store) == 2 * len(gradescope_stub.submissions)
+    entry = store.lookup(f"{COURSE_ID}/200002/300001/main.py")
+    assert entry.size == len(b"def main():\n    pass\n")
+    assert store.blob_path(entry.md5).read_bytes() == b"def main():\n    pass\n"
+
+
+def test_index_lookups(tmp_path):
+    store = BlobStore(tmp_path)
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"content")
+    md5 = store.add("1/2/3/a.txt", blob).md5
+    assert not blob.exists()
+
+    keys = [f"1/2/{i}/main.py" for i in range(1000)]
+    for key in keys:
+        store.link(key, md5, 7)
+    store.compact()
+    assert not (tmp_path / "journal.jsonl").read_text()
+    store.link("1/2/new/main.py", md5, 7)
+    store.close()
+
+    # a line cut short by a crash is ignored
+    with open(tmp_path / "journal.jsonl", "a") as journal:
+        journal.write('{"key": "1/2/cut')
+    store = BlobStore(tmp_path)
+    assert store.lookup("1/2/500/main.py") == StoredFile("1/2/500/main.py", md5, 7)
+    assert store.lookup("1/2/new/main.py") is not None
+    assert store.lookup("1/2/missing/main.py") is None
+    assert len(store) == len(keys) + 2
+    assert [entry.key for entry in store.entries()] == sorted(
+        [*keys, "1/2/3/a.txt", "1/2/new/main.py"]
+    )
+    # entries written after the cut line are kept, even if the store is not closed
+    store.link("1/2/after/main.py", md5, 7)
+    assert BlobStore(tmp_path).lookup("1/2/after/main.py") is not None
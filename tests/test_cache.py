@@ -0,0 +1,246 @@
+import asyncio
+import datetime
+import types
+
+import pytest
+
+from gradescopeapi.classes.assignments import update_assignment_date
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.cache import ResponseCache
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.extensions import get_extensions, update_student_extension
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.upload import upload_assignment
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+COURSE_PATH = f"/courses/{COURSE_ID}"
+EXTENSIONS_PATH = f"{COURSE_PATH}/assignments/{ASSIGNMENT_ID}/extensions"
+
+
+def fetches(stub, path: str) -> int:
+    """Number of GET requests the stub received for exactly `path`"""
+    return stub.requests.count(("GET", path))
+
+
+def page(content: str, headers: dict | None = None):
+    """Stand-in for a response to cache"""
+    return types.SimpleNamespace(text=content, headers=headers or {})
+
+
+@pytest.fixture
+def cached_connection(gradescope_stub):
+    connection = GSConnection(
+        gradescope_stub.base_url, rate_limiter=RateLimiter(), cache=ResponseCache()
+    )
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+    return connection
+
+
+def test_repeated_requests_hit_cache(gradescope_stub, cached_connection):
+    account = cached_connection.account
+    courses = account.get_courses()
+    assignments = account.get_assignments(COURSE_ID)
+    # logging in fetched the account page before the cache was filled
+    account_fetches = fetches(gradescope_stub, "/account")
+
+    assert account.get_courses() == courses
+    assert account.get_assignments(COURSE_ID) == assignments
+    assert fetches(gradescope_stub, "/account") == account_fetches
+    assert fetches(gradescope_stub, COURSE_PATH) == 1
+    stats = cached_connection.stats()["cache"]
+    assert stats["hits"] == 2 and stats["misses"] == 2
+    assert stats["entries"] == 2 and stats["bytes"] > 0
+
+
+def test_upload_reuses_course_page(gradescope_stub, cached_connection):
+    cached_connection.account.get_assignments(COURSE_ID)
+    with open("tests/upload_files/text_file.txt", "rb") as file:
+        link = upload_assignment(
+            cached_connection.session,
+            COURSE_ID,
+            ASSIGNMENT_ID,
+            file,
+            gradescope_base_url=gradescope_stub.base_url,
+        )
+    assert link is not None
+    assert fetches(gradescope_stub, COURSE_PATH) == 1
+
+    # the upload changed the course page, which is fetched again
+    cached_connection.account.get_assignments(COURSE_ID)
+    assert fetches(gradescope_stub, COURSE_PATH) == 2
+
+
+def test_writes_invalidate_affected_pages(gradescope_stub, cached_connection):
+    session = cached_connection.session
+    base_url = gradescope_stub.base_url
+    account = cached_connection.account
+
+    def fetch_all():
+        account.get_courses()
+        account.get_course_users(COURSE_ID)
+        account.get_assignments(COURSE_ID)
+        get_extensions(session, COURSE_ID, ASSIGNMENT_ID, gradescope_base_url=base_url)
+
+    fetch_all()
+    gradescope_stub.requests.clear()
+    fetch_all()
+    assert gradescope_stub.requests == []
+
+    assert update_student_extension(
+        session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        "600001",
+        due_date=datetime.datetime(2024, 4, 20),
+        gradescope_base_url=base_url,
+    )
+    assert update_assignment_date(
+        session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        due_date=datetime.datetime(2024, 4, 21),
+        gradescope_base_url=base_url,
+    )
+    gradescope_stub.requests.clear()
+    fetch_all()
+    # the pages of the assignment and the course page are fetched again, the others
+    # (account page, roster) are not
+    assert sorted(gradescope_stub.requests) == [
+        ("GET", COURSE_PATH),
+        ("GET", EXTENSIONS_PATH),
+    ]
+    assert cached_connection.cache.invalidations >= 2
+
+
+def test_ttl_and_lru_bounds():
+    cache = ResponseCache(
+        ttls={"/courses/*": 60, "/courses/*/memberships": 0}, max_entries=2
+    )
+    assert cache.ttl("https://x/courses/1") == 60
+    assert cache.ttl("https://x/courses/1/") == 60
+    assert cache.ttl("https://x/courses/1/memberships") == 0
+    assert cache.ttl("https://x/account") == 0
+
+    for course_id in "123":
+        cache.put(f"https://x/courses/{course_id}", page(course_id), 10)
+    assert cache.get("https://x/courses/1") is None
+    assert cache.get("https://x/courses/3").text == "3"
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "revalidations": 0,
+        "parse_hits": 0,
+        "parse_misses": 0,
+        "evictions": 1,
+        "invalidations": 0,
+        "entries": 2,
+        "bytes": 20,
+    }
+
+    # a page larger than the cache is not cached
+    small_cache = ResponseCache(max_bytes=100)
+    small_cache.put("https://x/account", page("account"), 101)
+    assert len(small_cache) == 0
+
+    expiring_cache = ResponseCache(ttls={"/account": 1e-9})
+    expiring_cache.put("https://x/account", page("account"), 7)
+    assert expiring_cache.get("https://x/account") is None
+    assert expiring_cache.stats()["bytes"] == 0
+
+    # unless it can be revalidated
+    expiring_cache.put("https://x/account", page("account", {"ETag": '"1"'}), 7)
+    assert expiring_cache.get("https://x/account") is None
+    assert expiring_cache.conditional_headers("https://x/account") == {
+        "If-None-Match": '"1"'
+    }
+    assert expiring_cache.revalidate("https://x/account").text == "account"
+
+
+def test_invalidate_scopes():
+    urls = [
+        "https://x/account",
+        "https://x/courses/1",
+        "https://x/courses/1/memberships",
+        "https://x/courses/1/assignments/2/extensions",
+        "https://x/courses/1/assignments/3/extensions",
+        "https://x/courses/10",
+    ]
+    cache = ResponseCache()
+    for url in urls:
+        cache.put(url, page(url), 1)
+
+    cache.invalidate("https://x/courses/1/assignments/2/extensions")
+    assert sorted(cache._entries) == [
+        "https://x/account",
+        "https://x/courses/1/assignments/3/extensions",
+        "https://x/courses/1/memberships",
+        "https://x/courses/10",
+    ]
+    cache.invalidate("https://x/courses/1/memberships/4")
+    assert sorted(cache._entries) == ["https://x/account", "https://x/courses/10"]
+    cache.invalidate("https://x/login")
+    assert len(cache) == 0
+
+
+def test_expired_pages_are_revalidated(gradescope_stub):
+    cache = ResponseCache(ttls={"/courses/*": 1e-9})
+    connection = GSConnection(
+        gradescope_stub.base_url, rate_limiter=RateLimiter(), cache=cache
+    )
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+    account = connection.account
+
+    assignments = account.get_assignments(COURSE_ID)
+    assert account.get_assignments(COURSE_ID) == assignments
+    # the page was requested again, and not sent again since it did not change
+    assert fetches(gradescope_stub, COURSE_PATH) == 2
+    assert gradescope_stub.not_modified == 1
+    stats = cache.stats()
+    assert stats["revalidations"] == 1
+    assert stats["parse_hits"] == 1 and stats["parse_misses"] == 1
+
+    gradescope_stub.assignments["200003"] = (
+        "Homework 3",
+        "2024-04-29T00:00:00.000000-04:00",
+    )
+    assert len(account.get_assignments(COURSE_ID)) == len(assignments) + 1
+    assert gradescope_stub.not_modified == 1
+    assert cache.stats()["parse_misses"] == 2
+
+
+def test_unchanged_pages_are_not_parsed_again(gradescope_stub):
+    # nothing is cached: every call downloads the page, and only parses it if it changed
+    cache = ResponseCache(ttls={})
+    connection = GSConnection(
+        gradescope_stub.base_url, rate_limiter=RateLimiter(), cache=cache
+    )
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+    account = connection.account
+
+    members = account.get_course_users(COURSE_ID)
+    # results are copies, which callers may change
+    members[0].full_name = "Changed"
+    members.pop()
+    assert len(account.get_course_users(COURSE_ID)) == len(gradescope_stub.members)
+    assert account.get_course_users(COURSE_ID)[0].full_name != "Changed"
+    assert fetches(gradescope_stub, f"{COURSE_PATH}/memberships") == 3
+    assert cache.stats()["parse_misses"] == 1 and cache.stats()["parse_hits"] == 2
+    assert len(cache) == 0
+
+
+def test_async_cache(gradescope_stub):
+    cache = ResponseCache()
+
+    async def main():
+        async with AsyncGSConnection(
+            gradescope_stub.base_url, rate_limiter=RateLimiter(), cache=cache
+        ) as connection:
+            await connection.login(gradescope_stub.email, gradescope_stub.password)
+            first = await connection.account.get_assignments(COURSE_ID)
+            second = await connection.account.get_assignments(COURSE_ID)
+            return first, second, connection.stats()
+
+    first, second, stats = asyncio.run(main())
+    assert first == second
+    assert fetches(gradescope_stub, COURSE_PATH) == 1
+    assert stats["cache"]["hits"] == 1
@@ -3,6 +3,7 @@ import os
 from dotenv import load_dotenv
 
 from gradescopeapi.classes.connection import GSConnection
+from tests.gradescope_stub import COURSE_ID
 
 # load .env file
 load_dotenv()
@@ -89,3 +90,30 @@ def test_membership():
     members = account.get_course_users(course_id)
 
     assert members is not None and len(members) > 0
+
+
+def test_fan_out_over_courses(gradescope_stub, stub_connection, run_with_account):
+    account = stub_connection.account
+    course_ids = list(account.get_courses()["instructor"])
+    gradescope_stub.fail_paths["/courses/100002/memberships"] = 404
+    gradescope_stub.fail_paths["/courses/100002"] = 404
+
+    rosters = account.get_rosters(course_ids, max_workers=4)
+    assert rosters == {COURSE_ID: account.get_course_users(COURSE_ID)}
+    assert list(rosters.errors) == ["100002"]
+    # the error is the one that prevented getting the roster
+    assert str(rosters.errors["100002"]) == "Page not Found"
+
+    assignments = account.get_assignments_for_courses(course_ids, max_workers=4)
+    assert assignments == {COURSE_ID: account.get_assignments(COURSE_ID)}
+    assert list(assignments.errors) == ["100002"]
+
+    async def fan_out(async_account):
+        return (
+            await async_account.get_rosters(course_ids),
+            await async_account.get_assignments_for_courses(course_ids),
+        )
+
+    async_rosters, async_assignments = run_with_account(fan_out)
+    assert (async_rosters, async_assignments) == (rosters, assignments)
+    assert str(async_rosters.errors["100002"]) == "Page not Found"
@@ -0,0 +1,35 @@
+import datetime
+
+import dateutil.parser
+import pytest
+
+from gradescopeapi.classes._helpers._dates import get_timezone, parse_datetime
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2024-04-15T00:00:00.000000-04:00",  # course pages
+        "2024-04-15T00:00:00.000-04:00",
+        "2024-04-18T23:59:00",  # extensions
+        "2024-04-01 00:00:00 -0400",  # student course pages
+        "2024-04-01 00:00:00 +0530",
+        "2024-04-15T04:00:00Z",
+        "Apr 15 2024 11:59 PM",  # any other format goes through dateutil
+    ],
+)
+def test_parse_datetime_matches_dateutil(value):
+    expected = dateutil.parser.parse(value)
+    date = parse_datetime(value)
+    assert date == expected
+    assert date.utcoffset() == expected.utcoffset()
+
+
+def test_parse_datetime_time_zone():
+    new_york = get_timezone("America/New_York")
+    assert get_timezone("America/New_York") is new_york
+    assert parse_datetime("2024-04-18T23:59:00", new_york) == datetime.datetime(
+        2024, 4, 18, 23, 59, tzinfo=new_york
+    )
+    assert parse_datetime(None, new_york) is None
+    assert parse_datetime("") is None
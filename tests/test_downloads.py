@@ -0,0 +1,202 @@
+import hashlib
+
+import pytest
+
+from gradescopeapi.classes.downloads import download_file, download_submissions
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+
+def submission_dir(directory, submission_id):
+    return directory / COURSE_ID / ASSIGNMENT_ID / submission_id
+
+
+def test_download_assignment_submissions(gradescope_stub, stub_connection, tmp_path):
+    account = stub_connection.account
+    downloaded = account.download_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, tmp_path, max_workers=4
+    )
+    assert downloaded.errors == {}
+    assert list(downloaded) == list(gradescope_stub.submissions)
+    for submission_id, files in downloaded.items():
+        path = submission_dir(tmp_path, submission_id) / "main.py"
+        assert [file.path for file in files] == [path]
+        assert (
+            path.read_bytes()
+            == gradescope_stub.files[f"/files/{submission_id}/main.py"]
+        )
+    assert not list(tmp_path.rglob("*.part"))
+
+    # files already on disk are checked with a request for their first byte
+    gradescope_stub.ranges.clear()
+    again = account.download_assignment_submissions(COURSE_ID, ASSIGNMENT_ID, tmp_path)
+    assert all(file.skipped for files in again.values() for file in files)
+    assert gradescope_stub.ranges == ["bytes=0-0"] * len(gradescope_stub.submissions)
+
+
+def interrupt_download(stub, session, url_path, path, cut):
+    """Download a file with its transfer cut after `cut` bytes, leaving a ".part" file"""
+    stub.cut_files[url_path] = cut
+    with pytest.raises(Exception):
+        download_file(session, stub.base_url + url_path, path)
+    del stub.cut_files[url_path]
+    stub.ranges.clear()
+
+
+def test_partial_downloads_are_resumed(gradescope_stub, stub_connection, tmp_path):
+    url_path = "/files/300001/main.py"
+    content = gradescope_stub.files[url_path]
+    path = tmp_path / "main.py"
+    interrupt_download(gradescope_stub, stub_connection.session, url_path, path, 5)
+    assert (tmp_path / "main.py.part").read_bytes() == content[:5]
+
+    file = download_file(
+        stub_connection.session, gradescope_stub.base_url + url_path, path
+    )
+    assert file.resumed and not file.skipped
+    assert gradescope_stub.ranges == ["bytes=5-"]
+    assert path.read_bytes() == content
+    assert not list(tmp_path.glob("*.part*"))
+
+
+@pytest.mark.parametrize("etag_suffix", ["", "-2"])
+def test_files_changed_since_a_partial_download_are_not_spliced(
+    gradescope_stub, stub_connection, tmp_path, etag_suffix
+):
+    # with "-2", ETags are not checksums, as for files uploaded to S3 in parts
+    gradescope_stub.etag_suffix = etag_suffix
+    url_path = "/files/300001/main.py"
+    url = gradescope_stub.base_url + url_path
+    path = tmp_path / "main.py"
+    gradescope_stub.files[url_path] = b"a" * 100
+    interrupt_download(gradescope_stub, stub_connection.session, url_path, path, 40)
+
+    # same size, other content: the Range request is conditional on the old ETag
+    gradescope_stub.files[url_path] = b"b" * 100
+    file = download_file(stub_connection.session, url, path)
+    assert not file.resumed
+    assert path.read_bytes() == b"b" * 100
+
+    # a ".part" file of unknown origin is not resumed
+    (tmp_path / "main.py.part").write_bytes(b"a" * 40)
+    path.unlink()
+    gradescope_stub.ranges.clear()
+    assert not download_file(stub_connection.session, url, path).resumed
+    assert gradescope_stub.ranges == [None]
+    assert path.read_bytes() == b"b" * 100
+
+
+def test_changed_and_corrupt_files_are_downloaded_again(
+    gradescope_stub, stub_connection, tmp_path
+):
+    url_path = "/files/300001/main.py"
+    url = gradescope_stub.base_url + url_path
+    path = tmp_path / "main.py"
+    download_file(stub_connection.session, url, path)
+
+    # same size, other content: the checksum tells them apart
+    gradescope_stub.files[url_path] = b"print('changed')\n"[: len(path.read_bytes())]
+    assert not download_file(stub_connection.session, url, path).skipped
+    assert path.read_bytes() == gradescope_stub.files[url_path]
+
+    # a corrupt ".part" file is dropped, and downloaded again by the next run
+    content = gradescope_stub.files[url_path]
+    path.unlink()
+    (tmp_path / "main.py.part").write_bytes(b"x" * len(content))
+    etag = f'"{hashlib.md5(content).hexdigest()}"'
+    (tmp_path / "main.py.part.validator").write_text(etag)
+    with pytest.raises(RuntimeError, match="Checksum"):
+        download_file(stub_connection.session, url, path)
+    assert (
+        download_file(stub_connection.session, url, path).path.read_bytes() == content
+    )
+
+
+def test_layout_and_failures(gradescope_stub, stub_connection, tmp_path):
+    base_url = gradescope_stub.base_url
+    failing_id, *other_ids = gradescope_stub.submissions
+    gradescope_stub.fail_paths[f"/files/{failing_id}/main.py"] = 404
+    submissions = {
+        submission_id: [f"{base_url}/files/{submission_id}/main.py"]
+        for submission_id in gradescope_stub.submissions
+    }
+
+    downloaded = download_submissions(
+        stub_connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        submissions,
+        tmp_path,
+        layout="{assignment_id}-{submission_id}",
+    )
+    assert list(downloaded) == other_ids
+    assert list(downloaded.errors) == [failing_id]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        f"{ASSIGNMENT_ID}-{submission_id}" for submission_id in other_ids
+    ]
+
+
+def test_links_repeated_in_a_submission(gradescope_stub, stub_connection, tmp_path):
+    submission_id = next(iter(gradescope_stub.submissions))
+    url = f"{gradescope_stub.base_url}/files/{submission_id}/main.py"
+    downloaded = download_submissions(
+        stub_connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        {submission_id: [url, url]},
+        tmp_path,
+    )
+    assert downloaded.errors == {}
+    # each link is saved to its own file, in the order of the links
+    directory = submission_dir(tmp_path, submission_id)
+    assert [file.path for file in downloaded[submission_id]] == [
+        directory / "main.py",
+        directory / "main-1.py",
+    ]
+    content = gradescope_stub.files[f"/files/{submission_id}/main.py"]
+    assert [file.path.read_bytes() for file in downloaded[submission_id]] == [
+        content,
+        content,
+    ]
+
+
+def test_renamed_files_do_not_collide(gradescope_stub, stub_connection, tmp_path):
+    paths = ["/files/x/a-2.py", "/files/y/a.py", "/files/z/a.py"]
+    for path in paths:
+        gradescope_stub.files[path] = path.encode()
+    downloaded = download_submissions(
+        stub_connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        {"9": [gradescope_stub.base_url + path for path in paths]},
+        tmp_path,
+        layout="{submission_id}",
+    )
+    assert downloaded.errors == {}
+    # the second a.py is not renamed to the name of the first file
+    assert [file.path for file in downloaded["9"]] == [
+        tmp_path / "9" / "a-2.py",
+        tmp_path / "9" / "a.py",
+        tmp_path / "9" / "a-3.py",
+    ]
+    assert [file.path.read_bytes() for file in downloaded["9"]] == [
+        path.encode() for path in paths
+    ]
+
+
+def test_async_download(gradescope_stub, tmp_path, run_with_account):
+    async def download(account):
+        return await account.download_assignment_submissions(
+            COURSE_ID, ASSIGNMENT_ID, tmp_path
+        )
+
+    downloaded = run_with_account(download)
+    assert downloaded.errors == {}
+    for submission_id in gradescope_stub.submissions:
+        path = submission_dir(tmp_path, submission_id) / "main.py"
+        assert (
+            path.read_bytes()
+            == gradescope_stub.files[f"/files/{submission_id}/main.py"]
+        )
+
+    again = run_with_account(download)
+    assert all(file.skipped for files in again.values() for file in files)
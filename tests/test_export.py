@@ -0,0 +1,91 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.export import to_arrow, to_csv, to_jsonl, to_parquet
+from gradescopeapi.classes.extensions import get_extensions
+from gradescopeapi.classes.tables import AssignmentTable, Roster
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+NEW_YORK = datetime.timezone(datetime.timedelta(hours=-4))
+ASSIGNMENTS = [
+    Assignment(
+        "200001",
+        "Homework 1",
+        datetime.datetime(2024, 4, 15, tzinfo=NEW_YORK),
+        datetime.datetime(2024, 4, 22, 23, 59, tzinfo=NEW_YORK),
+        None,
+        "Submitted",
+        8.5,
+        10.0,
+    ),
+    Assignment("200002", "Quiz, part 1", None, None, None, "No Submission", None, 5.0),
+]
+
+
+@pytest.mark.parametrize("rows", [ASSIGNMENTS, AssignmentTable(ASSIGNMENTS)])
+def test_csv(rows):
+    file = io.StringIO(newline="")
+    # batches smaller than the rows
+    assert to_csv(rows, file, batch_size=1) == 2
+    lines = list(csv.reader(io.StringIO(file.getvalue())))
+    assert lines[0][:3] == ["assignment_id", "name", "release_date"]
+    assert lines[1][2] == "2024-04-15T00:00:00-04:00"
+    assert lines[2] == [
+        "200002",
+        "Quiz, part 1",
+        "",
+        "",
+        "",
+        "No Submission",
+        "",
+        "5.0",
+    ]
+
+
+def test_jsonl_with_keys(stub_connection, gradescope_stub, tmp_path):
+    extensions = get_extensions(
+        stub_connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        gradescope_base_url=gradescope_stub.base_url,
+    )
+    path = tmp_path / "extensions.jsonl"
+    assert to_jsonl(extensions, path, key_column="user_id") == 1
+    (row,) = [json.loads(line) for line in path.read_text().splitlines()]
+    assert row["user_id"] == "600001"
+    assert row["name"] == "Ada Lovelace"
+    assert row["due_date"] == "2024-04-18T23:59:00-04:00"
+    assert row["release_date"] is None
+
+
+def test_arrow_and_parquet(stub_connection, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+
+    roster = Roster(stub_connection.account.get_course_users(COURSE_ID))
+    table = to_arrow(roster)
+    assert table.column("email").to_pylist() == roster.column("email")
+    assert table.schema.field("num_submissions").type == pyarrow.int64()
+
+    path = tmp_path / "assignments.parquet"
+    assert to_parquet(ASSIGNMENTS, path, batch_size=1) == 2
+    assignments = pyarrow_parquet.read_table(path)
+    assert assignments.schema.field("due_date").type == pyarrow.timestamp("us", "UTC")
+    assert assignments.column("release_date").to_pylist()[0] == datetime.datetime(
+        2024, 4, 15, 4, tzinfo=datetime.timezone.utc
+    )
+    assert assignments.column("grade").to_pylist() == [8.5, None]
+
+
+def test_dataframe(stub_connection):
+    pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    roster = Roster(stub_connection.account.get_course_users(COURSE_ID))
+    dataframe = roster.to_dataframe()
+    assert list(dataframe["email"]) == roster.column("email")
+    assert dataframe["num_submissions"].sum() == 1
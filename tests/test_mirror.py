@@ -0,0 +1,89 @@
+import datetime
+import os
+
+import pytest
+
+from gradescopeapi.classes.mirror import CourseMirror
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID, QUESTION_ID
+
+UTC = datetime.timezone.utc
+
+
+def test_sync_course(gradescope_stub, stub_connection, tmp_path):
+    gradescope_stub.submissions = {"300001": "Ada Lovelace"}
+    path = tmp_path / "mirror.db"
+    mirror = CourseMirror(path)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    assert mirror.sync_courses(stub_connection.account)
+    changed = mirror.sync_course(stub_connection.account, COURSE_ID, [QUESTION_ID])
+    assert changed == {"members", "assignments", "extensions", "submissions", "graders"}
+
+    assert mirror.query("SELECT course_id, role FROM courses ORDER BY course_id") == [
+        {"course_id": COURSE_ID, "role": "instructor"},
+        {"course_id": "100002", "role": "instructor"},
+    ]
+    assert mirror.query(
+        "SELECT submission_id, student_name FROM submissions WHERE assignment_id = ?",
+        (ASSIGNMENT_ID,),
+    ) == [{"submission_id": "300001", "student_name": "Ada Lovelace"}]
+    assert mirror.query("SELECT grader FROM graders") == [{"grader": "Grace Hopper"}]
+    # dates are stored in UTC
+    assert mirror.query(
+        "SELECT due_date FROM extensions WHERE assignment_id = ?", (ASSIGNMENT_ID,)
+    ) == [{"due_date": "2024-04-19T03:59:00+00:00"}]
+    assert mirror.synced_at(COURSE_ID) is not None
+    assert mirror.synced_at("100002") is None
+
+    # Homework 1 is due on April 15, Homework 2 on April 22 (New York time)
+    week = (
+        datetime.datetime(2024, 4, 14, tzinfo=UTC),
+        datetime.datetime(2024, 4, 21, tzinfo=UTC),
+    )
+    assert [
+        row["full_name"]
+        for row in mirror.students_without_submissions(COURSE_ID, *week)
+    ] == ["Alan Turing"]
+
+    expiring = mirror.expiring_extensions(
+        now=datetime.datetime(2024, 4, 18, 12, tzinfo=UTC)
+    )
+    # the stub lists the same extensions on every assignment
+    assert [(row["name"], row["assignment_name"]) for row in expiring] == [
+        ("Ada Lovelace", "Homework 1"),
+        ("Ada Lovelace", "Homework 2"),
+    ]
+    assert mirror.expiring_extensions(now=datetime.datetime(2024, 4, 20)) == []
+    mirror.close()
+
+
+def test_unchanged_tables_are_not_rewritten(gradescope_stub, stub_connection):
+    mirror = CourseMirror(":memory:")
+    account = stub_connection.account
+    mirror.sync_course(account, COURSE_ID)
+    assert mirror.sync_course(account, COURSE_ID) == set()
+    assert mirror.sync_courses(account)
+    assert not mirror.sync_courses(account)
+
+    gradescope_stub.extensions["600002"] = ("Alan Turing", "2024-04-19T23:59:00")
+    assert mirror.sync_course(account, COURSE_ID) == {"extensions"}
+    # the stub lists the same extensions on every assignment
+    assert mirror.query(
+        "SELECT COUNT(*) AS n FROM extensions WHERE assignment_id = ?", (ASSIGNMENT_ID,)
+    ) == [{"n": 2}]
+    # another course's rows are left alone
+    assert mirror.query("SELECT * FROM members WHERE course_id = '100002'") == []
+
+
+def test_failed_sync_changes_nothing(gradescope_stub, stub_connection):
+    mirror = CourseMirror(":memory:")
+    account = stub_connection.account
+    mirror.sync_course(account, COURSE_ID)
+    members = mirror.query("SELECT * FROM members")
+
+    gradescope_stub.members = gradescope_stub.members[:1]
+    gradescope_stub.fail_paths[f"/courses/{COURSE_ID}/memberships"] = 404
+    # the error is the one that prevented fetching the roster
+    with pytest.raises(Exception, match="Page not Found"):
+        mirror.sync_course(account, COURSE_ID)
+    assert mirror.query("SELECT * FROM members") == members
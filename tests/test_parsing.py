@@ -0,0 +1,204 @@
+import json
+import re
+
+import pytest
+
+from gradescopeapi.classes import parsing
+from gradescopeapi.classes._helpers._assignment_helpers import (
+    get_assignments_student_view,
+)
+from gradescopeapi.classes._helpers._course_helpers import get_all_courses_info
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.courses import Course
+from gradescopeapi.classes.extensions import (
+    get_extensions,
+    parse_extensions_page,
+)
+from gradescopeapi.classes.ratelimit import RateLimiter
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID, QUESTION_ID
+
+# course page of a student, with the three kinds of assignment rows
+STUDENT_COURSE_PAGE = """
+<html><body><table id="assignments-student-table">
+<thead><tr role="row"><th>Name</th><th>Status</th><th>Released</th></tr></thead>
+<tbody>
+<tr role="row">
+  <th><a href="/courses/100001/assignments/200001/submissions/300001">Homework 1</a></th>
+  <td><div class="submissionStatus--score">8.0 / 10.0</div></td>
+  <td><div class="submissionTimeChart">
+    <time class="submissionTimeChart--releaseDate" datetime="2024-04-01 00:00:00 -0400">Apr 01</time>
+    <time class="submissionTimeChart--dueDate" datetime="2024-04-08 23:59:00 -0400">Apr 08</time>
+    <time class="submissionTimeChart--dueDate" datetime="2024-04-10 23:59:00 -0400">Late Due Date: Apr 10</time>
+  </div></td>
+</tr>
+<tr role="row">
+  <th><button class="js-submitAssignment" data-assignment-id="200002">Homework 2</button></th>
+  <td><div class="submissionStatus--text">No Submission</div></td>
+  <td><div class="submissionTimeChart">
+    <time class="submissionTimeChart--releaseDate" datetime="2024-04-08 00:00:00 -0400">Apr 08</time>
+    <time class="submissionTimeChart--dueDate" datetime="2024-04-15 23:59:00 -0400">Apr 15</time>
+  </div></td>
+</tr>
+<tr role="row"><th>Quiz 1</th><td>No Submission</td><td></td></tr>
+<tr role="row"><td class="dropzonePreview--fileNameHeader"></td></tr>
+</tbody></table></body></html>
+"""
+
+# account page of a user both teaching and taking courses
+MIXED_ACCOUNT_PAGE = """
+<html><body><nav><button>Account</button></nav>
+<h1 class="pageHeading">Instructor Courses</h1>
+<button> Create a new course</button>
+<div class="courseList">
+  <div class="courseList--term pageSubheading">Fall 2024</div>
+  <div class="courseList--coursesForTerm">
+    <a class="courseBox" href="/courses/1"><h3 class="courseBox--shortname">CS 1</h3>
+      <div class="courseBox--name">Course 1</div>
+      <div class="courseBox--noGradesPublised">2 grades published</div>
+      <div class="courseBox--assignments courseBox--assignments-unpublished">3 assignments</div>
+    </a>
+    <button class="courseBox courseBox--add">Create a new course</button>
+  </div>
+</div>
+<h1 class="pageHeading">Student Courses</h1>
+<button>Enroll in Course</button>
+<div class="courseList">
+  <div class="courseList--term pageSubheading">Spring 2025</div>
+  <div class="courseList--coursesForTerm">
+    <a class="courseBox" href="/courses/2"><h3 class="courseBox--shortname">CS 2</h3>
+      <div class="courseBox--name">Course 2</div>
+      <div class="courseBox--assignments">4 assignments</div>
+    </a>
+    <a class="courseBox" href="/courses/3"><h3 class="courseBox--shortname">CS 3</h3>
+      <div class="courseBox--name">Course 3</div>
+      <div class="courseBox--assignments">5 assignments</div>
+    </a>
+  </div>
+</div>
+</body></html>
+"""
+
+
+def scrape(gradescope_stub) -> dict:
+    """Scrape every page of the stub with the current parser"""
+    connection = GSConnection(gradescope_stub.base_url, rate_limiter=RateLimiter())
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+    account = connection.account
+    return {
+        "courses": account.get_courses(),
+        "members": account.get_course_users(COURSE_ID),
+        "assignments": account.get_assignments(COURSE_ID),
+        "submissions": account.get_assignment_submissions(COURSE_ID, ASSIGNMENT_ID),
+        "graders": account.get_assignment_graders(COURSE_ID, QUESTION_ID),
+        "extensions": get_extensions(
+            connection.session,
+            COURSE_ID,
+            ASSIGNMENT_ID,
+            gradescope_base_url=gradescope_stub.base_url,
+        ),
+        "student_assignments": get_assignments_student_view(
+            parsing.make_soup(STUDENT_COURSE_PAGE)
+        ),
+    }
+
+
+@pytest.fixture
+def use_parser(request):
+    def _use_parser(parser):
+        if parser not in parsing.available_parsers():
+            pytest.skip(f"{parser} is not installed")
+        parsing.set_parser(parser)
+
+    yield _use_parser
+    parsing.set_parser(None)
+
+
+@pytest.mark.parametrize("parser", parsing.PARSERS)
+def test_parsers_return_same_objects(gradescope_stub, use_parser, parser):
+    use_parser("html.parser")
+    expected = scrape(gradescope_stub)
+    # every helper found something, so the comparison is not vacuous
+    assert all(expected.values())
+    assert len(expected["student_assignments"]) == 3
+
+    use_parser(parser)
+    assert parsing.get_parser() == parser
+    assert scrape(gradescope_stub) == expected
+
+
+def test_set_parser():
+    assert parsing.get_parser() == parsing.available_parsers()[0]
+    with pytest.raises(ValueError, match="Unavailable HTML parser"):
+        parsing.set_parser("html5")
+
+
+def test_find_react_props():
+    page = (
+        "<p>data-react-class is mentioned in text</p>"
+        # quoted attribute values may contain ">"
+        """<div title='a > b' data-react-class="Table" """
+        'data-react-props="{&quot;rows&quot;: [1, 2]}"></div>'
+        '<div data-react-class="Other" data-react-props="{}"></div>'
+        "<span DATA-REACT-CLASS=Table data-react-props='{\"rows\": []}' />"
+    )
+    assert parsing.find_react_props(page, "Table") == [{"rows": [1, 2]}, {"rows": []}]
+    assert parsing.find_react_props(page, "Table", limit=1) == [{"rows": [1, 2]}]
+    assert parsing.find_react_props(page, "Missing") == []
+
+
+@pytest.mark.parametrize("parser", parsing.PARSERS)
+def test_find_react_props_skips_comments_and_scripts(use_parser, parser):
+    use_parser(parser)
+    page = (
+        "<html><head><style>p::after { content: '<p data-react-class=\"Edit\">'; }</style>"
+        '<!-- <div data-react-class="Edit" data-react-props=\'{"old": 1}\'></div> -->'
+        '<script>var s = \'<div data-react-class="Edit" data-react-props="{}">\';</script>'
+        "<SCRIPT type='text/x-template'><div data-react-class='Edit'></div></SCRIPT>"
+        "</head><body><!-- data-react-class=Edit -->"
+        '<div data-react-class="Edit" data-react-props=\'{"new": 2}\'></div>'
+        '<script data-react-class="Edit" data-react-props=\'{"s": 3}\'>'
+        '\'<div data-react-class="Edit" data-react-props="{}">\'</script>'
+        "</body></html>"
+    )
+    soup = parsing.make_soup(page)
+    expected = [
+        json.loads(tag["data-react-props"])
+        for tag in soup.find_all(attrs={"data-react-class": "Edit"})
+    ]
+    assert expected == [{"new": 2}, {"s": 3}]
+    assert parsing.find_react_props(page, "Edit") == expected
+
+
+def test_extensions_page_fast_path(gradescope_stub):
+    page = gradescope_stub.extensions_page()
+    extensions = parse_extensions_page(page)
+    assert set(extensions) == set(gradescope_stub.extensions)
+    assert extensions["600001"].name == gradescope_stub.extensions["600001"][0]
+
+    # only the components in the table of extensions are extensions
+    component = re.search(r"<div data-react-class.*?</div>", page)[0]
+    assert "600001" in component
+    other = component.replace("600001", "699999")
+    outside = page.replace("<body>", f"<body>{other}").replace(
+        "</body>", f"{other}</body>"
+    )
+    assert (
+        "699999" in parsing.find_react_props(outside, "EditExtension")[0]["deletePath"]
+    )
+    assert parse_extensions_page(outside) == extensions
+    assert parse_extensions_page("<html><body></body></html>") == {}
+
+
+@pytest.mark.parametrize("parser", parsing.PARSERS)
+def test_mixed_account_courses(use_parser, parser):
+    use_parser(parser)
+    courses = get_all_courses_info(parsing.make_soup(MIXED_ACCOUNT_PAGE))
+    assert courses == {
+        "instructor": {
+            "1": Course("CS 1", "Course 1", "Fall", "2024", 2, 3),
+        },
+        "student": {
+            "2": Course("CS 2", "Course 2", "Spring", "2025", None, 4),
+            "3": Course("CS 3", "Course 3", "Spring", "2025", None, 5),
+        },
+    }
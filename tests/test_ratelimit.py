@@ -0,0 +1,99 @@
+import email.utils
+import time
+
+import pytest
+
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.ratelimit import (
+    AdaptiveRateLimiter,
+    TokenBucketRateLimiter,
+    parse_retry_after,
+)
+
+
+def test_token_bucket_paces_requests():
+    """Requests beyond the burst are spaced out at the configured rate."""
+    limiter = TokenBucketRateLimiter(rate=20, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    # 2 requests go through right away, the next 4 wait 1/20s each
+    assert time.monotonic() - start >= 0.18
+
+
+def test_token_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(rate=0)
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 503, None])
+def test_adaptive_backs_off_on_errors(status_code):
+    limiter = AdaptiveRateLimiter(rate=8, cooldown=0)
+    limiter.feedback(status_code, latency=0.1)
+    assert limiter.rate == 4
+    assert limiter.backoffs == 1
+    assert limiter.throttled == (1 if status_code == 429 else 0)
+
+
+def test_adaptive_backs_off_on_slow_responses():
+    limiter = AdaptiveRateLimiter(rate=8, latency_threshold=1, cooldown=0)
+    limiter.feedback(200, latency=1.5)
+    assert limiter.rate == 4
+
+
+def test_adaptive_cooldown_and_bounds():
+    """A burst of failures backs off once per cooldown, and never below min_rate."""
+    limiter = AdaptiveRateLimiter(rate=8, min_rate=1, cooldown=60)
+    for _ in range(5):
+        limiter.feedback(503, latency=0.1)
+    assert limiter.rate == 4
+    assert limiter.backoffs == 1
+
+    limiter.cooldown = 0
+    for _ in range(5):
+        limiter.feedback(503, latency=0.1)
+    assert limiter.rate == 1
+
+
+def test_adaptive_increases_on_success():
+    limiter = AdaptiveRateLimiter(rate=2, max_rate=3)
+    limiter.feedback(200, latency=0.1)
+    assert limiter.rate == 2.5
+    for _ in range(10):
+        limiter.feedback(200, latency=0.1)
+    assert limiter.rate == 3
+
+
+def test_adaptive_pauses_on_retry_after():
+    limiter = AdaptiveRateLimiter(rate=100)
+    limiter.feedback(429, latency=0.1, retry_after=0.2)
+    assert limiter.stats()["paused_for"] > 0.1
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("not a date") is None
+    retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 < parse_retry_after(retry_at) <= 30
+
+
+def test_connection_backs_off_on_throttling(gradescope_stub):
+    """The connection's limiter sees responses to requests made by Account methods."""
+    limiter = AdaptiveRateLimiter(rate=20, cooldown=0)
+    connection = GSConnection(gradescope_stub.base_url, rate_limiter=limiter)
+    assert connection.rate_limiter is limiter
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+
+    rate = limiter.rate
+    gradescope_stub.fail_paths["/account"] = [429]
+    gradescope_stub.fail_headers["Retry-After"] = "0"
+    # the throttled request is retried after the requested delay
+    assert connection.account.get_courses()["instructor"]
+    assert limiter.throttled == 1
+    assert limiter.backoffs == 1
+    assert rate / 2 <= limiter.rate < rate
+    assert connection.retry_policy.retries == 1
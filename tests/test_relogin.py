@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.extensions import update_student_extension
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.session_store import MemorySessionStore
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+
+def expire_sessions(stub):
+    with stub.lock:
+        stub.sessions.clear()
+
+
+def test_relogin_after_expiry(gradescope_stub, stub_connection):
+    expire_sessions(gradescope_stub)
+    assert stub_connection.account.get_courses()["instructor"]
+    assert stub_connection.session.relogins == 1
+    assert gradescope_stub.count("/login", "POST") == 2
+
+
+def test_single_flight_relogin(gradescope_stub, stub_connection):
+    """Concurrent requests failing on the same expired session share a single login."""
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(16)}
+    gradescope_stub.delay = 0.02
+    expected = stub_connection.account.get_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID
+    )
+
+    expire_sessions(gradescope_stub)
+    submissions = stub_connection.account.get_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, max_workers=8
+    )
+    assert submissions == expected
+    assert submissions.errors == {}
+    assert stub_connection.session.relogins == 1
+    assert gradescope_stub.count("/login", "POST") == 2
+
+
+def test_post_not_replayed_after_relogin(gradescope_stub, stub_connection):
+    def extend():
+        return update_student_extension(
+            stub_connection.session,
+            COURSE_ID,
+            ASSIGNMENT_ID,
+            "600001",
+            datetime(2024, 4, 15),
+            gradescope_base_url=gradescope_stub.base_url,
+        )
+
+    expire_sessions(gradescope_stub)
+    extensions_path = f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/extensions"
+    assert not extend()
+    assert gradescope_stub.count(extensions_path, "POST") == 1
+    # the session was renewed for the following requests
+    assert extend()
+    assert stub_connection.session.relogins == 1
+
+
+def test_relogin_disabled(gradescope_stub):
+    connection = GSConnection(gradescope_stub.base_url, rate_limiter=RateLimiter())
+    connection.login(gradescope_stub.email, gradescope_stub.password, relogin=False)
+    expire_sessions(gradescope_stub)
+    with pytest.raises(RuntimeError, match="Status code: 401"):
+        connection.account.get_courses()
+
+
+def test_relogin_saves_new_session(gradescope_stub):
+    store = MemorySessionStore()
+    connection = GSConnection(gradescope_stub.base_url, rate_limiter=RateLimiter())
+    connection.login(gradescope_stub.email, gradescope_stub.password, store)
+    old_state = store.load(gradescope_stub.email)
+
+    expire_sessions(gradescope_stub)
+    connection.account.get_courses()
+    assert store.load(gradescope_stub.email)["cookies"] != old_state["cookies"]
+
+
+def test_async_single_flight_relogin(gradescope_stub):
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(16)}
+
+    async def main():
+        async with AsyncGSConnection(
+            gradescope_stub.base_url, max_concurrency=8, rate_limiter=RateLimiter()
+        ) as connection:
+            await connection.login(gradescope_stub.email, gradescope_stub.password)
+            expire_sessions(gradescope_stub)
+            submissions = await connection.account.get_assignment_submissions(
+                COURSE_ID, ASSIGNMENT_ID
+            )
+            return submissions, connection.client.relogins
+
+    submissions, relogins = asyncio.run(main())
+    assert len(submissions) == 16
+    assert submissions.errors == {}
+    assert relogins == 1
+    assert gradescope_stub.count("/login", "POST") == 2
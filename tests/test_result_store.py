@@ -0,0 +1,172 @@
+import asyncio
+import datetime
+import os
+import sqlite3
+
+from gradescopeapi.classes._helpers._dates import get_timezone
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.extensions import (
+    Extension,
+    get_extensions,
+    update_student_extension,
+)
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.result_store import (
+    MemoryResultStore,
+    SQLiteResultStore,
+    decode_result,
+    encode_result,
+)
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+
+def connect(stub, result_store) -> GSConnection:
+    connection = GSConnection(
+        stub.base_url, rate_limiter=RateLimiter(), result_store=result_store
+    )
+    connection.login(stub.email, stub.password)
+    return connection
+
+
+def fetch_all(connection: GSConnection) -> dict:
+    account = connection.account
+    return {
+        "courses": account.get_courses(),
+        "members": account.get_course_users(COURSE_ID),
+        "assignments": account.get_assignments(COURSE_ID),
+        "extensions": get_extensions(
+            connection.session,
+            COURSE_ID,
+            ASSIGNMENT_ID,
+            gradescope_base_url=connection.gradescope_base_url,
+        ),
+        "submissions": account.get_assignment_submissions(COURSE_ID, ASSIGNMENT_ID),
+    }
+
+
+def test_cold_start_reads_saved_results(gradescope_stub, tmp_path):
+    path = tmp_path / "results.db"
+    expected = fetch_all(connect(gradescope_stub, SQLiteResultStore(path)))
+    assert all(expected.values())
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+    # another process, logged in to the same account
+    connection = connect(gradescope_stub, SQLiteResultStore(path))
+    gradescope_stub.requests.clear()
+    assert fetch_all(connection) == expected
+    # only the list of submissions is fetched, their files are saved
+    assert gradescope_stub.requests == [
+        ("GET", f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}")
+    ]
+
+
+def test_stale_results_are_fetched_again(gradescope_stub):
+    store = MemoryResultStore(max_ages={"courses": 3600, "members": 0})
+    connection = connect(gradescope_stub, store)
+    account = connection.account
+    account.get_courses()
+    account.get_course_users(COURSE_ID)
+
+    gradescope_stub.members.append(
+        ("Edsger Dijkstra", "ed@example.com", "600004", "0", 0)
+    )
+    gradescope_stub.requests.clear()
+    account.get_courses()
+    assert len(account.get_course_users(COURSE_ID)) == len(gradescope_stub.members)
+    assert gradescope_stub.requests == [("GET", f"/courses/{COURSE_ID}/memberships")]
+
+
+def test_results_are_per_account(gradescope_stub):
+    store = MemoryResultStore()
+    connect(gradescope_stub, store).account.get_courses()
+
+    # another account on the same store
+    connection = connect(gradescope_stub, store)
+    connection.session.user = "someone.else@example.com"
+    gradescope_stub.requests.clear()
+    connection.account.get_courses()
+    assert gradescope_stub.requests == [("GET", "/account")]
+
+
+def test_writes_drop_changed_results(gradescope_stub):
+    store = MemoryResultStore()
+    connection = connect(gradescope_stub, store)
+    expected = fetch_all(connection)
+
+    assert update_student_extension(
+        connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        "600002",
+        due_date=datetime.datetime(2024, 4, 20),
+        gradescope_base_url=gradescope_stub.base_url,
+    )
+    gradescope_stub.requests.clear()
+    assert fetch_all(connection) == expected
+    # the extensions, the course page and the submission files of the assignment were
+    # dropped, as were the courses, which count the assignments. The roster was not
+    assert sorted(set(gradescope_stub.requests)) == sorted(
+        {
+            ("GET", "/account"),
+            ("GET", f"/courses/{COURSE_ID}"),
+            ("GET", f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}"),
+            ("GET", f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/extensions"),
+            *(
+                (
+                    "GET",
+                    f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/submissions/{submission_id}.json",
+                )
+                for submission_id in gradescope_stub.submissions
+            ),
+        }
+    )
+
+
+def test_results_of_other_versions_are_ignored(gradescope_stub, tmp_path):
+    path = tmp_path / "results.db"
+    fetch_all(connect(gradescope_stub, SQLiteResultStore(path)))
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE results SET version = version + 1 WHERE kind = 'courses'")
+
+    connection = connect(gradescope_stub, SQLiteResultStore(path))
+    gradescope_stub.requests.clear()
+    connection.account.get_courses()
+    connection.account.get_course_users(COURSE_ID)
+    assert gradescope_stub.requests == [("GET", "/account")]
+
+
+def test_encode_result():
+    new_york = get_timezone("America/New_York")
+    result = {
+        "600001": Extension(
+            name="Ada Lovelace",
+            release_date=None,
+            due_date=datetime.datetime(2024, 4, 18, 23, 59, tzinfo=new_york),
+            late_due_date=datetime.datetime(2024, 4, 19, 23, 59),
+            delete_path="/courses/1/extensions/600001",
+        ),
+        "graders": {"Ada Lovelace"},
+    }
+    decoded = decode_result(encode_result(result))
+    assert decoded == result
+    assert decoded["600001"].due_date.tzinfo is new_york
+    assert decoded["600001"].late_due_date.tzinfo is None
+
+
+def test_async_result_store(gradescope_stub):
+    store = MemoryResultStore()
+
+    async def main():
+        async with AsyncGSConnection(
+            gradescope_stub.base_url, rate_limiter=RateLimiter(), result_store=store
+        ) as connection:
+            await connection.login(gradescope_stub.email, gradescope_stub.password)
+            return await connection.account.get_assignments(COURSE_ID)
+
+    assignments = asyncio.run(main())
+    gradescope_stub.requests.clear()
+    # saved by the async client, read by the sync one
+    connection = connect(gradescope_stub, store)
+    assert connection.account.get_assignments(COURSE_ID) == assignments
+    assert ("GET", f"/courses/{COURSE_ID}") not in gradescope_stub.requests
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from gradescopeapi.classes.assignments import update_assignment_date
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.extensions import update_student_extension
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+EXTENSIONS_PATH = f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/extensions"
+RELEASE_DATE = datetime(2024, 4, 15)
+
+
+def connect(stub, **kwargs) -> GSConnection:
+    connection = GSConnection(
+        stub.base_url,
+        rate_limiter=RateLimiter(),
+        retry_policy=kwargs.pop("retry_policy", RetryPolicy(backoff_factor=0)),
+        **kwargs,
+    )
+    connection.login(stub.email, stub.password)
+    return connection
+
+
+def test_retry_policy_idempotency():
+    """GETs are retried on any transient failure, POSTs only when they were not processed."""
+    policy = RetryPolicy()
+    assert policy.should_retry(0, "GET", 502)
+    assert policy.should_retry(0, "GET", None)
+    assert not policy.should_retry(0, "GET", 404)
+    assert not policy.should_retry(0, "POST", 502)
+    assert not policy.should_retry(0, "POST", None)
+    assert policy.should_retry(0, "POST", 503)
+    assert policy.should_retry(0, "POST", None, connect_error=True)
+    assert not policy.should_retry(0, "POST", 503, replayable=False)
+    assert not policy.should_retry(0, "GET", 429, retry_after=3600)
+    assert policy.retries == 4
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(max_retries=2, backoff_factor=1, max_backoff=3)
+    assert 0 <= policy.backoff(0) <= 1
+    assert all(0 <= policy.backoff(5) <= 3 for _ in range(20))
+    assert policy.backoff(0, retry_after=2) >= 2
+
+    assert policy.should_retry(1, "GET", 502)
+    assert not policy.should_retry(2, "GET", 502)
+    assert policy.stats() == {"retries": 1, "exhausted": 1}
+
+
+def test_circuit_breaker_trips_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+    breaker.record(502)
+    breaker.record(200)
+    breaker.record(502)
+    assert breaker.state == "closed", "failures must be consecutive"
+    breaker.record(None)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    time.sleep(0.1)
+    assert breaker.state == "half-open"
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # only one trial request at a time
+    breaker.record(502)
+    assert breaker.state == "open"
+
+    time.sleep(0.1)
+    breaker.before_request()
+    breaker.record(200)
+    assert breaker.state == "closed"
+    assert breaker.stats() == {"state": "closed", "trips": 2, "rejected": 2}
+
+
+def test_get_retried_on_transient_errors(gradescope_stub):
+    connection = connect(gradescope_stub)
+    gradescope_stub.fail_paths["/account"] = [502, 503]
+    assert connection.account.get_courses()["instructor"]
+    assert connection.retry_policy.retries == 2
+    assert connection.stats()["retry"]["retries"] == 2
+
+
+def test_get_gives_up_after_max_retries(gradescope_stub):
+    connection = connect(gradescope_stub)
+    sent = gradescope_stub.count("/account")
+    gradescope_stub.fail_paths["/account"] = 502
+    with pytest.raises(RuntimeError, match="Status code: 502"):
+        connection.account.get_courses()
+    assert gradescope_stub.count("/account") - sent == 4
+    assert connection.retry_policy.exhausted == 1
+
+
+def test_post_retried_only_when_safe(gradescope_stub):
+    connection = connect(gradescope_stub)
+
+    # the server may have applied the extension before failing: never sent twice
+    gradescope_stub.fail_paths[EXTENSIONS_PATH] = [502]
+    assert not update_student_extension(
+        connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        "600001",
+        RELEASE_DATE,
+        gradescope_base_url=gradescope_stub.base_url,
+    )
+    assert gradescope_stub.count(EXTENSIONS_PATH, "POST") == 1
+
+    # the server turned the request away: safe to send again
+    gradescope_stub.fail_paths[EXTENSIONS_PATH] = [503]
+    assert update_student_extension(
+        connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        "600001",
+        RELEASE_DATE,
+        gradescope_base_url=gradescope_stub.base_url,
+    )
+    assert gradescope_stub.count(EXTENSIONS_PATH, "POST") == 3
+
+
+def test_streamed_post_not_retried(gradescope_stub):
+    """Multipart bodies are streamed and consumed by the first attempt."""
+    connection = connect(gradescope_stub)
+    path = f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}"
+    gradescope_stub.fail_paths[path] = [503]
+    assert not update_assignment_date(
+        connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        RELEASE_DATE,
+        RELEASE_DATE + timedelta(days=1),
+        gradescope_base_url=gradescope_stub.base_url,
+    )
+    assert gradescope_stub.count(path, "POST") == 1
+
+
+def test_circuit_breaker_fails_fast(gradescope_stub):
+    connection = connect(
+        gradescope_stub,
+        retry_policy=RetryPolicy(max_retries=0),
+        circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60),
+    )
+    sent = gradescope_stub.count("/account")
+    gradescope_stub.fail_paths["/account"] = 502
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="Status code: 502"):
+            connection.account.get_courses()
+    with pytest.raises(CircuitOpenError):
+        connection.account.get_courses()
+    assert gradescope_stub.count("/account") - sent == 2
+    assert connection.circuit_breaker.trips == 1
+
+
+def test_async_transport_retries(gradescope_stub):
+    async def main():
+        async with AsyncGSConnection(
+            gradescope_stub.base_url,
+            rate_limiter=RateLimiter(),
+            retry_policy=RetryPolicy(backoff_factor=0),
+        ) as connection:
+            await connection.login(gradescope_stub.email, gradescope_stub.password)
+            gradescope_stub.fail_paths["/account"] = [502, 504]
+            courses = await connection.account.get_courses()
+            return courses, connection.stats()
+
+    courses, stats = asyncio.run(main())
+    assert courses["instructor"]
+    assert stats["retry"]["retries"] == 2
+    assert stats["circuit_breaker"]["state"] == "closed"
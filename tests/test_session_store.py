@@ -0,0 +1,75 @@
+import asyncio
+import os
+import stat
+
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.session_store import FileSessionStore, MemorySessionStore
+
+
+def test_session_saved_and_reused(gradescope_stub, tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+
+    first = GSConnection(gradescope_stub.base_url)
+    first.login(gradescope_stub.email, gradescope_stub.password, session_store=store)
+    assert store.load(gradescope_stub.email)["csrf_token"] == "csrf-token"
+    assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o600
+
+    requests_before = len(gradescope_stub.requests)
+    second = GSConnection(gradescope_stub.base_url)
+    second.login(gradescope_stub.email, gradescope_stub.password, session_store=store)
+    # a single request checks the saved session, no homepage load or login
+    assert gradescope_stub.requests[requests_before:] == [("GET", "/account")]
+    assert second.logged_in
+    assert second.account.get_courses() == first.account.get_courses()
+
+
+def test_expired_session_falls_back_to_login(gradescope_stub):
+    store = MemorySessionStore()
+    GSConnection(gradescope_stub.base_url).login(
+        gradescope_stub.email, gradescope_stub.password, session_store=store
+    )
+    expired = store.load(gradescope_stub.email)
+    gradescope_stub.sessions.clear()
+
+    connection = GSConnection(gradescope_stub.base_url)
+    assert not connection.load_session(store, gradescope_stub.email)
+    assert not connection.logged_in
+    assert store.load(gradescope_stub.email) is None
+
+    store.save(gradescope_stub.email, expired)
+    logins_before = gradescope_stub.count("/login", "POST")
+    connection.login(gradescope_stub.email, gradescope_stub.password, store)
+    assert gradescope_stub.count("/login", "POST") == logins_before + 1
+    assert store.load(gradescope_stub.email) != expired
+    assert connection.account.get_courses()["instructor"]
+
+
+def test_save_session_requires_login(gradescope_stub):
+    with pytest.raises(ValueError, match="Not logged in"):
+        GSConnection(gradescope_stub.base_url).save_session(MemorySessionStore(), "key")
+
+
+def test_session_ignored_for_other_base_url(gradescope_stub):
+    store = MemorySessionStore()
+    connection = GSConnection(gradescope_stub.base_url)
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+    connection.save_session(store, "key")
+    assert not GSConnection("http://127.0.0.1:1").load_session(store, "key")
+
+
+def test_async_connection_reuses_saved_session(gradescope_stub, tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+    connection = GSConnection(gradescope_stub.base_url)
+    connection.login(gradescope_stub.email, gradescope_stub.password, store)
+
+    async def main():
+        async with AsyncGSConnection(gradescope_stub.base_url) as async_connection:
+            assert await async_connection.load_session(store, gradescope_stub.email)
+            return await async_connection.account.get_courses()
+
+    logins_before = gradescope_stub.count("/login", "POST")
+    assert asyncio.run(main()) == connection.account.get_courses()
+    assert gradescope_stub.count("/login", "POST") == logins_before
@@ -0,0 +1,81 @@
+import time
+
+from gradescopeapi.classes.extensions import get_extensions
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID, QUESTION_ID
+
+
+def test_snapshot_course(gradescope_stub, stub_connection):
+    account = stub_connection.account
+    calls = []
+    snapshot = account.snapshot_course(
+        COURSE_ID,
+        [QUESTION_ID],
+        progress=lambda done, total: calls.append((done, total)),
+    )
+
+    assert snapshot.complete
+    assert snapshot.members == account.get_course_users(COURSE_ID)
+    assert snapshot.assignments == account.get_assignments(COURSE_ID)
+    for assignment in snapshot.assignments:
+        assignment_id = assignment.assignment_id
+        assert snapshot.extensions[assignment_id] == get_extensions(
+            stub_connection.session,
+            COURSE_ID,
+            assignment_id,
+            gradescope_base_url=gradescope_stub.base_url,
+        )
+        assert snapshot.submissions[assignment_id] == (
+            account.get_assignment_submissions(COURSE_ID, assignment_id)
+        )
+        assert snapshot.submission_students[assignment_id] == (
+            gradescope_stub.submissions
+        )
+    assert snapshot.graders == {
+        QUESTION_ID: account.get_assignment_graders(COURSE_ID, QUESTION_ID)
+    }
+
+    # roster, assignments and graders, then the extensions and submission lists of both
+    # assignments, then the files of their 3 submissions
+    total = 3 + 2 * 2 + 2 * 3
+    assert calls[-1] == (total, total)
+    assert [done for done, _ in calls] == list(range(1, total + 1))
+
+
+def test_snapshot_requests_run_concurrently(gradescope_stub, stub_connection):
+    gradescope_stub.delay = 0.1
+    start = time.monotonic()
+    snapshot = stub_connection.account.snapshot_course(COURSE_ID, max_workers=8)
+    # 12 requests, but the longest chain of dependent requests is 3 long
+    assert time.monotonic() - start < 0.8
+    assert snapshot.complete
+
+
+def test_failures_skip_dependent_requests(gradescope_stub, stub_connection):
+    assignment_path = f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}"
+    gradescope_stub.fail_paths[assignment_path] = 404
+    gradescope_stub.fail_paths[f"{assignment_path}/extensions"] = 404
+    gradescope_stub.fail_paths[f"/courses/{COURSE_ID}/memberships"] = 404
+
+    snapshot = stub_connection.account.snapshot_course(COURSE_ID)
+    assert set(snapshot.errors) == {
+        ("members",),
+        ("submissions", ASSIGNMENT_ID),
+        ("extensions", ASSIGNMENT_ID),
+    }
+    # errors are the ones that prevented the requests
+    assert str(snapshot.errors[("members",)]) == "Page not Found"
+    assert ASSIGNMENT_ID not in snapshot.submissions
+    # the other assignment was crawled
+    assert len(snapshot.submissions["200002"]) == len(gradescope_stub.submissions)
+    assert "200002" in snapshot.extensions
+
+
+def test_async_snapshot_course(gradescope_stub, stub_connection, run_with_account):
+    async def snapshot(account):
+        return await account.snapshot_course(COURSE_ID, [QUESTION_ID])
+
+    async_snapshot = run_with_account(snapshot)
+    sync_snapshot = stub_connection.account.snapshot_course(COURSE_ID, [QUESTION_ID])
+    assert async_snapshot.complete
+    for field in ("members", "assignments", "extensions", "submissions", "graders"):
+        assert getattr(async_snapshot, field) == getattr(sync_snapshot, field)
@@ -1,10 +1,12 @@
 import os
+import time
 
 import pytest
 from dotenv import load_dotenv
 
 from gradescopeapi.classes.account import Account
 from gradescopeapi.classes.assignments import Assignment
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
 
 # Load .env file
 load_dotenv()
@@ -75,3 +77,105 @@ def test_get_assignment_submission_no_submission_found(create_session):
 
     with pytest.raises(Exception, match="No submission found"):
         account.get_assignment_submission(student_email, course_id, assignment_id)
+
+
+def test_get_assignment_submissions_concurrent(gradescope_stub, stub_connection):
+    """Concurrent fetching returns the same submissions as the serial path, faster."""
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(20)}
+    gradescope_stub.delay = 0.05
+    account = stub_connection.account
+
+    start = time.perf_counter()
+    serial = account.get_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, requests_per_second=None
+    )
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = account.get_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, max_workers=8, requests_per_second=None
+    )
+    concurrent_time = time.perf_counter() - start
+
+    assert concurrent == serial
+    assert list(concurrent) == list(gradescope_stub.submissions)
+    assert concurrent.errors == {}
+    assert concurrent_time < serial_time / 2
+
+
+def test_get_assignment_submissions_reports_failures(gradescope_stub, stub_connection):
+    """A failing submission is reported in `errors` without aborting the others."""
+    failing_id = next(iter(gradescope_stub.submissions))
+    gradescope_stub.fail_paths[
+        f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/submissions/{failing_id}.json"
+    ] = 502
+
+    submissions = stub_connection.account.get_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, max_workers=4
+    )
+
+    assert failing_id not in submissions
+    assert set(submissions) == set(gradescope_stub.submissions) - {failing_id}
+    assert list(submissions.errors) == [failing_id]
+    assert isinstance(submissions.errors[failing_id], RuntimeError)
+
+
+def test_get_assignment_submissions_rate_cap(gradescope_stub, stub_connection):
+    """The rate cap is shared by all workers."""
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(6)}
+
+    start = time.perf_counter()
+    stub_connection.account.get_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, max_workers=6, requests_per_second=20
+    )
+
+    # 6 requests at 20/s: the last one cannot start before 5 * 0.05s
+    assert time.perf_counter() - start >= 0.25
+
+
+def test_iter_assignment_submissions_resume(gradescope_stub, stub_connection):
+    """Iteration yields submissions in order and can resume after a failure."""
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(10)}
+    submission_ids = list(gradescope_stub.submissions)
+    failing_path = f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/submissions/{submission_ids[6]}.json"
+    gradescope_stub.fail_paths[failing_path] = 502
+    account = stub_connection.account
+
+    seen = []
+    with pytest.raises(RuntimeError, match="Status code: 502"):
+        for submission_id, links in account.iter_assignment_submissions(
+            COURSE_ID, ASSIGNMENT_ID, max_workers=3, requests_per_second=None
+        ):
+            assert links == [
+                f"{gradescope_stub.base_url}/files/{submission_id}/main.py"
+            ]
+            seen.append(submission_id)
+    assert seen == submission_ids[:6]
+
+    del gradescope_stub.fail_paths[failing_path]
+    resumed = [
+        submission_id
+        for submission_id, _ in account.iter_assignment_submissions(
+            COURSE_ID, ASSIGNMENT_ID, start_after=seen[-1], requests_per_second=None
+        )
+    ]
+    assert seen + resumed == submission_ids
+
+    with pytest.raises(ValueError, match="not found"):
+        next(account.iter_assignment_submissions(COURSE_ID, ASSIGNMENT_ID, "1"))
+
+
+def test_iter_assignment_submissions_bounded(gradescope_stub, stub_connection):
+    """Only a small window of submissions is fetched ahead of the consumer."""
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(50)}
+
+    submissions = stub_connection.account.iter_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, max_workers=2, requests_per_second=None
+    )
+    next(submissions)
+    submissions.close()
+
+    fetched = gradescope_stub.count(
+        f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/submissions/"
+    )
+    assert fetched <= 2 * 2 + 2
@@ -0,0 +1,137 @@
+import io
+import zipfile
+
+import pytest
+
+from gradescopeapi.classes.submission_export import (
+    extract_zip_stream,
+    iter_zip_members,
+)
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+
+def chunked(data: bytes, size: int):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+def make_archive() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.mkdir("empty")
+        archive.writestr("stored.txt", b"stored " * 100)
+        archive.writestr("empty.txt", b"")
+        archive.writestr(
+            "nested/deflated.py", b"print('hi')\n" * 1000, zipfile.ZIP_DEFLATED
+        )
+        with archive.open("big/zip64.bin", "w", force_zip64=True) as file:
+            file.write(bytes(range(256)) * 64)
+        archive.writestr("üñí.txt", "ünïcode".encode())
+    return buffer.getvalue()
+
+
+def test_export_assignment_submissions(gradescope_stub, stub_connection, tmp_path):
+    gradescope_stub.export_polls = 2
+    paths = stub_connection.account.export_assignment_submissions(
+        COURSE_ID, ASSIGNMENT_ID, tmp_path, poll_interval=0
+    )
+    assert len(paths) == len(gradescope_stub.submissions)
+    for path, (submission_id, student) in zip(
+        paths, gradescope_stub.submissions.items()
+    ):
+        assert path == tmp_path / f"{student} - {submission_id}" / "main.py"
+        assert (
+            path.read_bytes()
+            == gradescope_stub.files[f"/files/{submission_id}/main.py"]
+        )
+    assert not list(tmp_path.rglob("*.part"))
+    # the export is requested once, and checked until it is ready
+    assert [path for path, _ in gradescope_stub.posts] == [
+        f"/courses/{COURSE_ID}/assignments/{ASSIGNMENT_ID}/export"
+    ]
+    statuses = [path for _, path in gradescope_stub.requests if path.endswith(".json")]
+    assert len(statuses) == 3
+
+    members = stub_connection.account.iter_assignment_export(
+        COURSE_ID, ASSIGNMENT_ID, poll_interval=0
+    )
+    assert [(member.name, b"".join(content)) for member, content in members] == [
+        (
+            f"{student} - {submission_id}/main.py",
+            gradescope_stub.files[f"/files/{submission_id}/main.py"],
+        )
+        for submission_id, student in gradescope_stub.submissions.items()
+    ]
+
+
+def test_export_failures(gradescope_stub, stub_connection, tmp_path):
+    account = stub_connection.account
+    with pytest.raises(RuntimeError, match="404"):
+        account.export_assignment_submissions(COURSE_ID, "299999", tmp_path)
+
+    gradescope_stub.fail_paths[f"/courses/{COURSE_ID}/generated_files/800001.zip"] = 500
+    with pytest.raises(RuntimeError, match="500"):
+        account.export_assignment_submissions(
+            COURSE_ID, ASSIGNMENT_ID, tmp_path, poll_interval=0
+        )
+
+
+def test_async_export(gradescope_stub, tmp_path, run_with_account):
+    async def export(account):
+        return await account.export_assignment_submissions(
+            COURSE_ID, ASSIGNMENT_ID, tmp_path, poll_interval=0
+        )
+
+    paths = run_with_account(export)
+    assert [path.read_bytes() for path in paths] == list(gradescope_stub.files.values())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1 << 20])
+def test_iter_zip_members(chunk_size):
+    data = make_archive()
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        expected = [(info.filename, archive.read(info)) for info in archive.infolist()]
+
+    members = [
+        (member.name, b"".join(content))
+        for member, content in iter_zip_members(chunked(data, chunk_size))
+    ]
+    assert members == expected
+
+    # members left unread are skipped
+    names = [member.name for member, _ in iter_zip_members(chunked(data, chunk_size))]
+    assert names == [name for name, _ in expected]
+
+
+def test_extract_zip_stream(tmp_path):
+    paths = extract_zip_stream(chunked(make_archive(), 100), tmp_path)
+    assert [path.relative_to(tmp_path).as_posix() for path in paths] == [
+        "stored.txt",
+        "empty.txt",
+        "nested/deflated.py",
+        "big/zip64.bin",
+        "üñí.txt",
+    ]
+    assert (tmp_path / "empty").is_dir()
+    assert (tmp_path / "nested" / "deflated.py").read_bytes() == b"print('hi')\n" * 1000
+
+
+def test_corrupt_archives(tmp_path):
+    data = make_archive()
+    with pytest.raises(ValueError, match="Truncated"):
+        list(iter_zip_members([data[:1000]]))
+    with pytest.raises(ValueError, match="Not a ZIP"):
+        list(iter_zip_members([b"<html>Not Found</html>"]))
+
+    corrupt = bytearray(data)
+    offset = data.index(b"stored stored")
+    corrupt[offset] ^= 1
+    with pytest.raises(ValueError, match="CRC-32 of stored.txt"):
+        extract_zip_stream([bytes(corrupt)], tmp_path)
+    assert not list(tmp_path.rglob("*"))
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("../outside.txt", b"")
+    with pytest.raises(ValueError, match="outside"):
+        extract_zip_stream([buffer.getvalue()], tmp_path / "out")
+    assert not (tmp_path / "outside.txt").exists()
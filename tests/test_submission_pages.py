@@ -0,0 +1,180 @@
+import io
+import re
+import struct
+
+import pytest
+
+from gradescopeapi.classes.submission_pages import download_submission_pages, write_pdf
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+
+def make_jpeg(width: int, height: int, components: int = 3, marker: int = 0xC0):
+    """Just enough of a JPEG image for its size to be read: the markers before the frame
+    header, the frame header, and some scan data"""
+    app0 = b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    frame = struct.pack(">BHHB", 8, height, width, components) + bytes(3 * components)
+    return (
+        b"\xff\xd8"
+        + b"\xff\xe0"
+        + struct.pack(">H", len(app0) + 2)
+        + app0
+        + bytes([0xFF, marker])
+        + struct.pack(">H", len(frame) + 2)
+        + frame
+        + b"\xff\xda\x00\x02"
+        + bytes(range(width % 256))
+        + b"\xff\xd9"
+    )
+
+
+def scan_submissions(stub, num_pages: int = 3):
+    """Turn the stub's submissions into scanned ones, returning their page images"""
+    images = {}
+    for submission_id in stub.submissions:
+        paths = [
+            f"/files/{submission_id}/page_{number}.jpg"
+            for number in range(1, num_pages + 1)
+        ]
+        for number, path in enumerate(paths, start=1):
+            stub.files[path] = make_jpeg(100 + number, 200 + int(submission_id) % 100)
+        stub.pages[submission_id] = paths
+        images[submission_id] = [stub.files[path] for path in paths]
+    return images
+
+
+def read_pdf(data: bytes) -> list[bytes]:
+    """Check the object offsets of a PDF, and return its images in page order"""
+    assert data.startswith(b"%PDF-1.4\n")
+    assert data.endswith(b"%%EOF\n")
+    xref = int(data.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+    lines = data[xref:].split(b"\n")
+    assert lines[0] == b"xref"
+    count = int(lines[1].split()[1])
+    for number, line in enumerate(lines[3 : 2 + count], start=1):
+        offset = int(line.split()[0])
+        assert data[offset:].startswith(b"%d 0 obj\n" % number)
+
+    pages = int(re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", data)[1])
+    images = [
+        data[match.end() : match.end() + int(match[1])]
+        for match in re.finditer(rb"/DCTDecode /Length (\d+) >>\nstream\n", data)
+    ]
+    assert len(images) == pages
+    return images
+
+
+def test_get_submission_pages(gradescope_stub, stub_connection):
+    scan_submissions(gradescope_stub)
+    account = stub_connection.account
+    submission_id = next(iter(gradescope_stub.submissions))
+    links = [
+        gradescope_stub.base_url + path for path in gradescope_stub.pages[submission_id]
+    ]
+    assert (
+        account.get_submission_pages(COURSE_ID, ASSIGNMENT_ID, submission_id) == links
+    )
+    # scanned submissions are no longer an error for the other submission methods
+    submissions = account.get_assignment_submissions(COURSE_ID, ASSIGNMENT_ID)
+    assert submissions[submission_id] == links
+
+
+def test_download_assignment_pages(gradescope_stub, stub_connection, tmp_path):
+    images = scan_submissions(gradescope_stub)
+    downloaded = stub_connection.account.download_assignment_pages(
+        COURSE_ID, ASSIGNMENT_ID, tmp_path, layout="{submission_id}"
+    )
+    assert downloaded.errors == {}
+    for submission_id, files in downloaded.items():
+        assert [file.path.name for file in files] == [
+            "page_1.jpg",
+            "page_2.jpg",
+            "page_3.jpg",
+        ]
+        assert [file.path.read_bytes() for file in files] == images[submission_id]
+
+
+def test_download_assignment_pages_as_pdf(gradescope_stub, stub_connection, tmp_path):
+    images = scan_submissions(gradescope_stub)
+    failing_id, *other_ids = gradescope_stub.submissions
+    gradescope_stub.fail_paths[gradescope_stub.pages[failing_id][1]] = 404
+
+    downloaded = stub_connection.account.download_assignment_pages(
+        COURSE_ID, ASSIGNMENT_ID, tmp_path, layout="{submission_id}", pdf=True
+    )
+    assert list(downloaded) == other_ids
+    assert list(downloaded.errors) == [failing_id]
+    for submission_id in other_ids:
+        assert downloaded[submission_id] == [tmp_path / f"{submission_id}.pdf"]
+        pdf = downloaded[submission_id][0].read_bytes()
+        assert read_pdf(pdf) == images[submission_id]
+    # nothing is left of the submission that failed
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        f"{submission_id}.pdf" for submission_id in other_ids
+    ]
+
+
+def test_submissions_without_pages(gradescope_stub, stub_connection, tmp_path):
+    images = scan_submissions(gradescope_stub)
+    empty_id, scanned_id, *_ = gradescope_stub.submissions
+    pages = {
+        empty_id: [],
+        scanned_id: [
+            gradescope_stub.base_url + path
+            for path in gradescope_stub.pages[scanned_id]
+        ],
+    }
+    downloaded = download_submission_pages(
+        stub_connection.session,
+        COURSE_ID,
+        ASSIGNMENT_ID,
+        pages,
+        tmp_path,
+        layout="{submission_id}",
+        pdf=True,
+    )
+    assert downloaded.errors == {}
+    assert read_pdf(downloaded[empty_id][0].read_bytes()) == []
+    assert read_pdf(downloaded[scanned_id][0].read_bytes()) == images[scanned_id]
+
+
+def test_async_download_pages_as_pdf(gradescope_stub, tmp_path, run_with_account):
+    images = scan_submissions(gradescope_stub, num_pages=5)
+
+    async def download(account):
+        return await account.download_assignment_pages(
+            COURSE_ID, ASSIGNMENT_ID, tmp_path, pdf=True
+        )
+
+    downloaded = run_with_account(download)
+    assert downloaded.errors == {}
+    for submission_id, (path,) in downloaded.items():
+        assert path == tmp_path / COURSE_ID / ASSIGNMENT_ID / f"{submission_id}.pdf"
+        assert read_pdf(path.read_bytes()) == images[submission_id]
+
+
+def test_write_pdf():
+    images = [
+        make_jpeg(1700, 2200),
+        make_jpeg(850, 1100, components=1, marker=0xC2),  # progressive, grayscale
+        make_jpeg(2200, 1700, components=4),
+    ]
+    file = io.BytesIO()
+    assert write_pdf(images, file) == 3
+    data = file.getvalue()
+    assert read_pdf(data) == images
+    # pages are as wide as a Letter page, as high as their image's proportions require
+    assert re.findall(rb"/MediaBox \[0 0 ([\d.]+) ([\d.]+)\]", data) == [
+        (b"612", b"792"),
+        (b"612", b"792"),
+        (b"612", b"472.91"),
+    ]
+    assert b"/DeviceGray" in data and b"/DeviceCMYK" in data
+
+    empty = io.BytesIO()
+    assert write_pdf([], empty) == 0
+    assert read_pdf(empty.getvalue()) == []
+
+    with pytest.raises((ValueError, OSError)):
+        write_pdf([b"not an image"], io.BytesIO())
+    with pytest.raises(ValueError, match="JPEG"):
+        write_pdf([b"\xff\xd8\xff\xd9"], io.BytesIO())
@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+
+from gradescopeapi.classes.assignments import Assignment
+from gradescopeapi.classes.member import Member
+from gradescopeapi.classes.tables import AssignmentTable, Roster
+from tests.gradescope_stub import COURSE_ID
+
+
+def test_roster(stub_connection):
+    members = stub_connection.account.get_course_users(COURSE_ID)
+    roster = Roster(members)
+    assert len(roster) == len(members) == 3
+    assert list(roster) == members
+    assert roster[-1] == members[-1]
+    assert roster[1:] == Roster(members[1:])
+    assert roster.column("num_submissions") == [1, 0, 0]
+    assert roster.column("email")[0] == "ada@example.com"
+    with pytest.raises(IndexError):
+        roster[3]
+
+
+def test_roster_shares_repeated_strings():
+    # built like the scraper does, with new strings for every member
+    members = [
+        Member(
+            full_name=f"Student {i}",
+            first_name="Student",
+            last_name=str(i),
+            sid=None,
+            email=f"s{i}@example.com",
+            role="Student",
+            id=str(i),
+            num_submissions=i,
+            sections=str([]),
+            course_id=str(100001),
+        )
+        for i in range(3)
+    ]
+    assert members[0].sections is not members[2].sections
+
+    roster = Roster(members)
+    assert roster[0].sections is roster[2].sections
+    assert roster[0].course_id is roster[2].course_id
+    assert roster.column("num_submissions") == [0, 1, 2]
+
+
+def test_assignment_table_missing_numbers():
+    assignments = [
+        Assignment("1", "Homework 1", None, None, None, "Submitted", 8.5, 10.0),
+        Assignment(
+            "2",
+            "Homework 2",
+            datetime.datetime(2024, 4, 15, tzinfo=datetime.timezone.utc),
+            None,
+            None,
+            "No Submission",
+            None,
+            None,
+        ),
+    ]
+    table = AssignmentTable(assignments)
+    assert list(table) == assignments
+    assert table.column("grade") == [8.5, None]
+
+
+def test_rows_are_slotted():
+    member = Member("A B", "A", "B", None, "a@b.c", "Student", "1", 0, "[]", "1")
+    assert not hasattr(member, "__dict__")
+    with pytest.raises(AttributeError):
+        member.nickname = "A"
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from gradescopeapi.classes import timeouts
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.retry import RetryPolicy
+from gradescopeapi.classes.timeouts import DeadlineExceeded, deadline
+from tests.gradescope_stub import ASSIGNMENT_ID, COURSE_ID
+
+
+def test_deadline_nesting():
+    assert timeouts.remaining() is None
+    with deadline(10):
+        with deadline(60):
+            assert timeouts.remaining() <= 10, "the earliest deadline wins"
+        with deadline(1):
+            assert timeouts.remaining() <= 1
+        assert 1 < timeouts.remaining() <= 10
+    assert timeouts.remaining() is None
+
+
+def test_deadline_caps_timeouts_and_sleeps():
+    assert timeouts.cap_timeout((10, 60)) == (10, 60)
+    with deadline(5):
+        connect, read = timeouts.cap_timeout((1, 60))
+        assert connect == 1 and read <= 5
+        assert timeouts.cap_timeout(None) <= 5
+        with pytest.raises(DeadlineExceeded):
+            timeouts.sleep(6)
+    with deadline(0.05):
+        time.sleep(0.05)
+        with pytest.raises(DeadlineExceeded):
+            timeouts.check_deadline()
+
+
+def test_default_request_timeout(gradescope_stub):
+    connection = GSConnection(
+        gradescope_stub.base_url,
+        rate_limiter=RateLimiter(),
+        retry_policy=RetryPolicy(max_retries=0),
+        timeout=0.2,
+    )
+    connection.login(gradescope_stub.email, gradescope_stub.password)
+    gradescope_stub.delay = 0.5
+    with pytest.raises(requests.Timeout):
+        connection.account.get_courses()
+
+
+def test_deadline_cancels_bulk_operation(gradescope_stub, stub_connection):
+    gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(20)}
+    gradescope_stub.delay = 0.1
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        stub_connection.account.get_assignment_submissions(
+            COURSE_ID, ASSIGNMENT_ID, max_workers=2, deadline=0.35
+        )
+    assert time.monotonic() - start < 0.6
+    # submissions not started before the deadline were never requested
+    assert gradescope_stub.count(f"/courses/{COURSE_ID}/assignments/") < 10
+
+
+def test_deadline_context_manager(gradescope_stub, stub_connection):
+    gradescope_stub.delay = 0.2
+    with pytest.raises(DeadlineExceeded):
+        with deadline(0.3):
+            stub_connection.account.get_courses()
+            stub_connection.account.get_courses()
+
+
+def test_async_deadline(gradescope_stub):
+    async def main():
+        async with AsyncGSConnection(
+            gradescope_stub.base_url, rate_limiter=RateLimiter()
+        ) as connection:
+            await connection.login(gradescope_stub.email, gradescope_stub.password)
+            gradescope_stub.submissions = {str(310000 + i): f"S{i}" for i in range(20)}
+            gradescope_stub.delay = 0.1
+            await connection.account.get_assignment_submissions(
+                COURSE_ID, ASSIGNMENT_ID, deadline=0.25
+            )
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(main())
+    assert time.monotonic() - start < 0.6
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from gradescopeapi.classes.async_connection import AsyncGSConnection
+from gradescopeapi.classes.connection import GSConnection
+from gradescopeapi.classes.ratelimit import RateLimiter
+from gradescopeapi.classes.retry import RetryPolicy
+from gradescopeapi.classes.transport import AsyncGSTransport, GSTransport, PoolConfig
+
+
+def test_pool_config_reaches_adapters(gradescope_stub):
+    connection = GSConnection(
+        gradescope_stub.base_url,
+        pool=PoolConfig(max_connections_per_host=32, max_hosts=4),
+    )
+    for adapter in (
+        connection.session.transport.gradescope_adapter,
+        connection.session.transport.default_adapter,
+    ):
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_connections == 4
+
+
+def test_shared_transport(gradescope_stub):
+    transport = GSTransport(
+        gradescope_stub.base_url,
+        rate_limiter=RateLimiter(),
+        retry_policy=RetryPolicy(backoff_factor=0),
+    )
+    first = GSConnection(gradescope_stub.base_url, transport=transport)
+    second = GSConnection(gradescope_stub.base_url, transport=transport)
+    assert first.session.adapter is second.session.adapter
+    assert first.rate_limiter is second.rate_limiter
+
+    first.login(gradescope_stub.email, gradescope_stub.password)
+    second.login(gradescope_stub.email, gradescope_stub.password)
+    # logins stay separate
+    assert first.session.cookies is not second.session.cookies
+
+    first.close()
+    assert second.account.get_courses()["instructor"]
+    transport.close()
+
+
+def test_shared_transport_rejects_own_settings(gradescope_stub):
+    transport = GSTransport(gradescope_stub.base_url)
+    with pytest.raises(ValueError, match="shared transport"):
+        GSConnection(
+            gradescope_stub.base_url, rate_limiter=RateLimiter(), transport=transport
+        )
+    with pytest.raises(ValueError, match="shared transport"):
+        GSConnection(gradescope_stub.base_url, timeout=5, transport=transport)
+    with pytest.raises(ValueError, match="not http://127.0.0.1:1"):
+        GSConnection("http://127.0.0.1:1", transport=transport)
+
+
+def test_async_shared_transport(gradescope_stub):
+    pytest.importorskip("h2")
+    transport = AsyncGSTransport(
+        gradescope_stub.base_url,
+        RateLimiter(),
+        retry_policy=RetryPolicy(backoff_factor=0),
+        pool=PoolConfig(http2=True),
+    )
+
+    async def login():
+        connection = AsyncGSConnection(gradescope_stub.base_url, transport=transport)
+        await connection.login(gradescope_stub.email, gradescope_stub.password)
+        return connection
+
+    async def main():
+        first = await login()
+        await first.aclose()
+        # closing the first connection left the shared transport open
+        second = await login()
+        courses = await second.account.get_courses()
+        await second.aclose()
+        await transport.aclose()
+        return courses
+
+    assert asyncio.run(main())["instructor"]